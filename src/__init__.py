@@ -0,0 +1,49 @@
+# src/__init__.py
+"""
+Esquema criptográfico simplificado: GEN/ENC/DEC com backends selecionáveis.
+
+Importar o pacote não importa nenhum submódulo. Os nomes de _API são
+carregados no primeiro acesso (PEP 562), e os backends e tabelas pesados
+(src/batch.py com NumPy, tabelas de 16 bits, planos lineares) só quando
+usados; processos de curta duração pagam só pelo que chamam.
+
+Uso:
+    import src
+    K, _, _ = src.GEN("segredo", 5, 2)
+    C = src.ENC(K, "mensagem")
+    src.DEC(K, C)                     # "mensagem"
+"""
+
+__version__ = "0.1.0"
+
+# nome público -> módulo que o define
+_API = {
+    "GEN": "src.gen",
+    "ENC": "src.enc",
+    "DEC": "src.dec",
+    "BitState": "src.estado",
+    "Cipher": "src.cifra",
+    "encrypt_bytes": "src.packed",
+    "decrypt_bytes": "src.packed",
+    "Encryptor": "src.fluxo",
+    "Decryptor": "src.fluxo",
+}
+
+__all__ = ["__version__", *_API]
+
+
+def __getattr__(nome):
+    try:
+        modulo = _API[nome]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}") from None
+
+    import importlib
+
+    valor = getattr(importlib.import_module(modulo), nome)
+    globals()[nome] = valor  # próximos acessos não passam por aqui
+    return valor
+
+
+def __dir__():
+    return sorted({*globals(), *_API})
@@ -0,0 +1,234 @@
+# src/avalanche.py
+"""
+Matriz de avalanche estrita (SAC) de ENC.
+
+Para cada posição i da mensagem e cada posição j da cifra, estima
+
+    P[i, j] = Pr(bit j de ENC(K, M) muda quando o bit i de M é invertido)
+
+sobre muitas mensagens M aleatórias de len(K) bits. Uma cifra com boa
+difusão tem todas as entradas perto de 0.5 (critério de avalanche estrita).
+
+tests/test_difusao.py troca um caractere por vez e mask.diffusion_test
+inverte um bit sorteado por tentativa; aqui cada mensagem gera n + 1 linhas
+(a original e as n inversões de um bit) cifradas juntas por
+batch.encrypt_packed, e as diferenças são contadas sobre as linhas
+empacotadas:
+- contagens da matriz: XOR entre cifras, desempacotado e somado por mensagem
+- distâncias de Hamming: popcount por tabela de 256 entradas nos bytes do XOR
+
+As mensagens são processadas em lotes de até LINHAS_POR_LOTE linhas cifradas,
+então a memória não cresce com o número de mensagens.
+
+Uso:
+    resultado = matriz_sac(K, mensagens=64)
+    resultado.resumo()               # médias, desvios de 0.5 e distâncias
+    resultado.exportar("sac.csv")    # ou .npy / .json
+
+    python -m src.avalanche --seed chaveMestraDifusao --champ 10 --stars 3 --exportar sac.csv
+
+Requer NumPy (dependência opcional do projeto).
+"""
+import argparse
+import json
+from dataclasses import dataclass
+
+import numpy as np
+
+from src import batch
+
+# Mensagens aleatórias por execução e semente do gerador
+MENSAGENS_PADRAO = 64
+SEMENTE_PADRAO = 321
+
+# Linhas cifradas por chamada de encrypt_packed (cada mensagem usa len(K) + 1)
+LINHAS_POR_LOTE = 32768
+
+# Desvios de 0.5 até este múltiplo do erro padrão contam como "dentro" do SAC
+TOLERANCIA_SIGMAS = 3.0
+
+# Bits 1 de cada byte
+POPCOUNT_BYTE = np.array([bin(b).count("1") for b in range(256)], dtype=np.uint8)
+
+
+def popcount(linhas: np.ndarray) -> np.ndarray:
+    """Bits 1 de cada linha empacotada (..., bytes); com o XOR de duas cifras, a distância de Hamming."""
+    return POPCOUNT_BYTE[linhas].sum(axis=-1, dtype=np.int64)
+
+
+def mascaras_unitarias(tamanho: int) -> np.ndarray:
+    """Matriz empacotada (tamanho x bytes) cuja linha i tem só o bit i ligado."""
+    return np.packbits(np.eye(tamanho, dtype=np.uint8), axis=1)
+
+
+def mensagens_aleatorias(quantidade: int, tamanho: int, semente=SEMENTE_PADRAO) -> np.ndarray:
+    """Matriz (quantidade x tamanho) de bits uniformes, reprodutível pela semente."""
+    rng = np.random.default_rng(semente)
+    return rng.integers(0, 2, size=(quantidade, tamanho), dtype=np.uint8)
+
+
+@dataclass
+class ResultadoSAC:
+    """
+    Resultado de matriz_sac.
+
+    contagens[i, j]: mensagens em que inverter o bit i mudou o bit j da cifra
+    distancias[d]: inversões (de todas as mensagens) que mudaram d bits da cifra
+    """
+
+    contagens: np.ndarray
+    distancias: np.ndarray
+    mensagens: int
+
+    @property
+    def tamanho(self) -> int:
+        return self.contagens.shape[0]
+
+    @property
+    def matriz(self) -> np.ndarray:
+        """Probabilidades P[i, j] (float64, n x n)."""
+        return self.contagens / self.mensagens
+
+    def resumo(self) -> dict:
+        """Estatísticas da matriz e das distâncias de Hamming."""
+        n = self.tamanho
+        matriz = self.matriz
+        desvio = np.abs(matriz - 0.5)
+        # Erro padrão de uma proporção com p = 0.5 estimada sobre `mensagens` amostras
+        tolerancia = TOLERANCIA_SIGMAS * 0.5 / np.sqrt(self.mensagens)
+        pesos = np.arange(n + 1)
+        inversoes = self.distancias.sum()
+        hamming_medio = float((pesos * self.distancias).sum() / inversoes)
+        ocorridas = np.nonzero(self.distancias)[0]
+
+        return {
+            "tamanho": n,
+            "mensagens": self.mensagens,
+            "probabilidade_media": float(matriz.mean()),
+            "probabilidade_min": float(matriz.min()),
+            "probabilidade_max": float(matriz.max()),
+            "desvio_medio": float(desvio.mean()),
+            "desvio_max": float(desvio.max()),
+            "tolerancia": float(tolerancia),
+            "fracao_dentro": float((desvio <= tolerancia).mean()),
+            # Pares (i, j) em que o bit j nunca mudou / sempre mudou
+            "pares_nunca": int((self.contagens == 0).sum()),
+            "pares_sempre": int((self.contagens == self.mensagens).sum()),
+            "hamming_medio": hamming_medio,
+            "hamming_min": int(ocorridas[0]),
+            "hamming_max": int(ocorridas[-1]),
+            "difusao_media": hamming_medio / n,
+        }
+
+    def exportar(self, caminho: str) -> None:
+        """
+        Grava a matriz de probabilidades: .npy (binário do NumPy), .json
+        (resumo + matriz + histograma das distâncias) ou, para qualquer outra
+        extensão, CSV com uma linha por bit de entrada.
+        """
+        if caminho.endswith(".npy"):
+            np.save(caminho, self.matriz)
+        elif caminho.endswith(".json"):
+            dados = {
+                "resumo": self.resumo(),
+                "matriz": self.matriz.tolist(),
+                "distancias": self.distancias.tolist(),
+            }
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(dados, arquivo)
+        else:
+            np.savetxt(caminho, self.matriz, fmt="%.6f", delimiter=",")
+
+
+def matriz_sac(
+    K,
+    mensagens=MENSAGENS_PADRAO,
+    semente=SEMENTE_PADRAO,
+    rodadas: int = batch.NUM_RODADAS,
+    linhas_por_lote: int = LINHAS_POR_LOTE,
+) -> ResultadoSAC:
+    """
+    Calcula a matriz de avalanche estrita de ENC com a chave K.
+
+    Args:
+        K: chave em lista de bits (não vazia)
+        mensagens: quantidade de mensagens aleatórias (geradas com `semente`)
+                   ou uma matriz (N x len(K)) de bits com as mensagens base
+        rodadas: rodadas de ENC
+
+    As mensagens têm len(K) bits, ou seja, já estão no tamanho que ENC usa
+    depois de ajustar_tamanho_msg: a matriz cobre todas as posições da cifra.
+    """
+    tamanho = len(K)
+    if tamanho == 0:
+        raise ValueError("A chave não pode ser vazia.")
+
+    if isinstance(mensagens, int):
+        if mensagens < 1:
+            raise ValueError("É preciso pelo menos uma mensagem.")
+        base = mensagens_aleatorias(mensagens, tamanho, semente)
+    else:
+        base = batch._como_matriz(mensagens, tamanho)
+
+    chave = np.asarray(K, dtype=np.uint8)
+    mascaras = mascaras_unitarias(tamanho)
+    base = np.packbits(base, axis=1)
+    num_mensagens, num_bytes = base.shape
+
+    contagens = np.zeros((tamanho, tamanho), dtype=np.int64)
+    distancias = np.zeros(tamanho + 1, dtype=np.int64)
+    por_lote = max(1, linhas_por_lote // (tamanho + 1))
+
+    for inicio in range(0, num_mensagens, por_lote):
+        lote = base[inicio : inicio + por_lote]
+        m = len(lote)
+
+        # Linha 0 de cada mensagem: a original; linhas 1..n: bit i-1 invertido
+        linhas = np.empty((m, tamanho + 1, num_bytes), dtype=np.uint8)
+        linhas[:, 0] = lote
+        np.bitwise_xor(lote[:, None, :], mascaras[None, :, :], out=linhas[:, 1:])
+
+        cifras = batch.encrypt_packed(chave, linhas.reshape(-1, num_bytes), rodadas)
+        cifras = cifras.reshape(m, tamanho + 1, num_bytes)
+        diferencas = cifras[:, 1:] ^ cifras[:, :1]
+
+        distancias += np.bincount(popcount(diferencas).ravel(), minlength=tamanho + 1)
+        for mudou in diferencas:
+            contagens += np.unpackbits(mudou, axis=1, count=tamanho)
+
+    return ResultadoSAC(contagens, distancias, num_mensagens)
+
+
+# ---------------------------------------------------------------------
+# Linha de comando
+# ---------------------------------------------------------------------
+
+def _argumentos(argv=None):
+    ap = argparse.ArgumentParser(description="Matriz de avalanche estrita (SAC) de ENC")
+    ap.add_argument("--seed", default="chaveMestraDifusao", help="Seed de GEN (texto)")
+    ap.add_argument("--champ", type=int, default=10)
+    ap.add_argument("--stars", type=int, default=3)
+    ap.add_argument("--mensagens", type=int, default=MENSAGENS_PADRAO)
+    ap.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    ap.add_argument("--exportar", nargs="+", default=[],
+                    help="Arquivos de saída (.csv, .npy ou .json, pela extensão)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    from src.gen import GEN
+
+    args = _argumentos(argv)
+    K = GEN(args.seed, args.champ, args.stars)[0]
+    resultado = matriz_sac(K, args.mensagens, args.semente)
+
+    for nome, valor in resultado.resumo().items():
+        print(f"{nome:<20} {valor:.4f}" if isinstance(valor, float) else f"{nome:<20} {valor}")
+
+    for caminho in args.exportar:
+        resultado.exportar(caminho)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+# src/batch.py
+"""
+Backend em lote (NumPy): cifra/decifra milhares de mensagens com a mesma chave
+em uma única chamada.
+
+As mensagens são as linhas de uma matriz (N x len(K)) de uint8 com valores 0/1,
+ou seja, já convertidas por texto_para_binario e ajustadas ao tamanho da chave.
+Cada etapa da rodada é aplicada a todas as linhas de uma vez, e o resultado
+é idêntico ao de ENC/DEC aplicados linha a linha.
+
+Internamente cada linha fica empacotada em bytes (np.packbits, bit 0 = bit mais
+significativo do primeiro byte, bits de padding zerados no último byte):
+- S-Box: uma busca em tabela por 2 bytes (4 nibbles) ou por byte (2 nibbles)
+- Difusão: XOR prefixo/sufixo dentro do byte por tabela, e o "vai-um" entre
+  bytes com np.bitwise_xor.accumulate sobre a paridade de cada byte
+- Transposição: desempacota, transpõe (reshape ou indexação avançada) e reempacota
+
+Também é o backend "numpy" de src/nucleo.py (gen_bits, enc_bits e dec_bits).
+
+Requer NumPy (dependência opcional do projeto).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from src import packed
+from src.estado import BitState
+from src.gen import gerar_bits_tft, obter_campeao, obter_estrelas
+from src.permutacao import TAMANHO_CACHE, indices_reversao, indices_transposicao
+from src.tabelas import INV_SBOX_BYTE, SBOX_BYTE
+from src.utils import ajustar_tamanho_msg, texto_para_binario
+
+NUM_RODADAS = 2
+NUM_COLUNAS = 4
+
+# Linhas por bloco em gen_batch (limita as matrizes intermediárias de bits)
+LINHAS_POR_BLOCO = 16384
+
+
+def _tabela_prefixo(b):
+    """XOR prefixo dentro de um byte, do bit mais significativo para o menos."""
+    b ^= b >> 1
+    b ^= b >> 2
+    return b ^ (b >> 4)
+
+
+def _tabela_sufixo(b):
+    """XOR sufixo dentro de um byte, do bit menos significativo para o mais."""
+    b ^= (b << 1) & 0xFF
+    b ^= (b << 2) & 0xFF
+    return b ^ ((b << 4) & 0xFF)
+
+
+# Tabelas indexadas por um byte (256 entradas); as de 2 bytes ficam em _tabela_sbox_16
+_SBOX_BYTE = np.frombuffer(SBOX_BYTE, dtype=np.uint8)
+_INV_SBOX_BYTE = np.frombuffer(INV_SBOX_BYTE, dtype=np.uint8)
+_PREFIXO_BYTE = np.array([_tabela_prefixo(b) for b in range(256)], dtype=np.uint8)
+_SUFIXO_BYTE = np.array([_tabela_sufixo(b) for b in range(256)], dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _tabela_sbox_16(inversa: bool = False) -> np.ndarray:
+    """
+    Tabela de 65536 entradas que substitui 4 nibbles (16 bits) em uma busca,
+    montada com NumPy no primeiro uso.
+
+    Como cada byte é substituído de forma independente, a mesma tabela vale
+    para palavras de 16 bits em qualquer ordem de bytes (little ou big-endian).
+    """
+    tabela_byte = (_INV_SBOX_BYTE if inversa else _SBOX_BYTE).astype(np.uint16)
+    v = np.arange(65536, dtype=np.uint16)
+    return (tabela_byte[v >> 8] << 8) | tabela_byte[v & 0xFF]
+
+
+class _Layout:
+    """Informações do empacotamento que dependem apenas de len(K)."""
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self.num_bytes = (tamanho + 7) // 8
+
+        # Bits válidos do último byte e quais deles pertencem a nibbles completos
+        bits_ultimo = tamanho - 8 * (self.num_bytes - 1)
+        self.mascara_ultimo = np.uint8((0xFF << (8 - bits_ultimo)) & 0xFF)
+        self.mascara_sbox_ultimo = np.uint8(
+            (0xFF << (8 - 4 * (bits_ultimo // 4))) & 0xFF
+        )
+
+        self.indices = np.asarray(indices_transposicao(tamanho, NUM_COLUNAS))
+        self.inversos = np.asarray(indices_reversao(tamanho, NUM_COLUNAS))
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _layout(tamanho: int) -> _Layout:
+    """_Layout em cache: o tamanho da chave quase nunca muda entre chamadas."""
+    return _Layout(tamanho)
+
+
+def _como_matriz(linhas, tamanho: int) -> np.ndarray:
+    """Valida e converte a entrada para uma matriz (N x tamanho) de uint8."""
+    matriz = np.array(linhas, dtype=np.uint8, ndmin=2)
+    if matriz.shape[1] != tamanho:
+        raise ValueError(
+            f"Erro de tamanho: cada linha deve ter {tamanho} bits (recebido {matriz.shape[1]})."
+        )
+    return matriz
+
+
+def _tamanho_chave(K) -> int:
+    """Bits por chave (K é uma chave, BitState incluído, ou uma matriz com uma por linha)."""
+    return len(K) if isinstance(K, BitState) else np.shape(K)[-1]
+
+
+def _chave(K):
+    """Retorna (bits por chave, chave empacotada); K é uma chave ou uma matriz com uma por linha."""
+    if isinstance(K, BitState):
+        return len(K), np.frombuffer(K.to_bytes(), dtype=np.uint8)
+    chave = np.asarray(K, dtype=np.uint8)
+    return chave.shape[-1], np.packbits(chave, axis=-1)
+
+
+def _aplicar_sbox(estado: np.ndarray, layout: _Layout, inversa: bool = False) -> np.ndarray:
+    """
+    S-Box nos nibbles completos; o nibble incompleto do final fica intacto.
+
+    Com número par de bytes por linha, cada busca substitui 4 nibbles (tabela
+    de 16 bits sobre uma visão uint16 da linha); senão, 2 nibbles por byte.
+    """
+    if layout.num_bytes % 2 == 0:
+        tabela = _tabela_sbox_16(inversa)
+        saida = np.take(tabela, estado.view(np.uint16)).view(np.uint8)
+    else:
+        tabela = _INV_SBOX_BYTE if inversa else _SBOX_BYTE
+        saida = np.take(tabela, estado)
+    mascara = layout.mascara_sbox_ultimo
+    saida[:, -1] = (saida[:, -1] & mascara) | (estado[:, -1] & ~mascara & layout.mascara_ultimo)
+    return saida
+
+
+def _difusao_ida(estado: np.ndarray, layout: _Layout) -> np.ndarray:
+    """XOR prefixo ao longo de cada linha (bit i recebe o XOR dos bits 0..i)."""
+    saida = np.take(_PREFIXO_BYTE, estado)
+    # O último bit do prefixo de um byte é a paridade do byte inteiro
+    vai_um = np.bitwise_xor.accumulate(saida & 1, axis=1)
+    saida[:, 1:] ^= vai_um[:, :-1] * np.uint8(0xFF)
+    saida[:, -1] &= layout.mascara_ultimo
+    return saida
+
+
+def _difusao_volta(estado: np.ndarray) -> np.ndarray:
+    """XOR sufixo ao longo de cada linha (bit i recebe o XOR dos bits i..n-1)."""
+    saida = np.take(_SUFIXO_BYTE, estado)
+    # O primeiro bit do sufixo de um byte é a paridade do byte inteiro
+    vai_um = np.bitwise_xor.accumulate((saida >> 7)[:, ::-1], axis=1)[:, ::-1]
+    saida[:, :-1] ^= vai_um[:, 1:] * np.uint8(0xFF)
+    return saida
+
+
+def _reverter_difusao_ida(estado: np.ndarray, layout: _Layout) -> np.ndarray:
+    """Inverso de _difusao_ida: bit i ^= bit i-1."""
+    deslocado = estado >> 1
+    deslocado[:, 1:] |= estado[:, :-1] << 7
+    saida = estado ^ deslocado
+    saida[:, -1] &= layout.mascara_ultimo
+    return saida
+
+
+def _reverter_difusao_volta(estado: np.ndarray) -> np.ndarray:
+    """Inverso de _difusao_volta: bit i ^= bit i+1."""
+    deslocado = estado << 1
+    deslocado[:, :-1] |= estado[:, 1:] >> 7
+    return estado ^ deslocado
+
+
+def _transpor(estado: np.ndarray, layout: _Layout, inversa: bool = False) -> np.ndarray:
+    """
+    Transposição colunar (ou sua inversa) em todas as linhas.
+
+    Quando len(K) é múltiplo do número de colunas, a transposição é a
+    transposta de uma matriz (linhas x colunas) e vira um reshape; caso
+    contrário usamos indexação avançada com os índices pré-calculados.
+    """
+    num_linhas = estado.shape[0]
+    tamanho = layout.tamanho
+    bits = np.unpackbits(estado, axis=1, count=tamanho)
+
+    if tamanho % NUM_COLUNAS == 0:
+        forma = (num_linhas, tamanho // NUM_COLUNAS, NUM_COLUNAS)
+        if inversa:
+            forma = (num_linhas, NUM_COLUNAS, tamanho // NUM_COLUNAS)
+        bits = bits.reshape(forma).transpose(0, 2, 1).reshape(num_linhas, tamanho)
+    else:
+        indices = layout.inversos if inversa else layout.indices
+        # np.take mantém a saída em ordem C (bits[:, indices] sairia em ordem Fortran)
+        bits = np.take(bits, indices, axis=1)
+
+    return np.packbits(bits, axis=1)
+
+
+def encrypt_packed(K: list[int], linhas: np.ndarray, rodadas: int = NUM_RODADAS) -> np.ndarray:
+    """
+    Como encrypt_batch, mas com as linhas já empacotadas (N x ceil(len(K) / 8)).
+
+    Os bits de padding do último byte de cada linha devem ser zero. K pode ser
+    uma chave (lista de bits) ou uma matriz com uma chave por linha.
+    """
+    tamanho, chave = _chave(K)
+    layout = _layout(tamanho)
+    estado = linhas ^ chave
+
+    for _ in range(rodadas):
+        estado = _aplicar_sbox(estado, layout)
+        estado = _difusao_ida(estado, layout)
+        estado = _difusao_volta(estado)
+        estado = _transpor(estado, layout)
+
+    return estado
+
+
+def decrypt_packed(K: list[int], linhas: np.ndarray, rodadas: int = NUM_RODADAS) -> np.ndarray:
+    """Como decrypt_batch, com entrada e saída empacotadas (N x ceil(len(K) / 8))."""
+    tamanho, chave = _chave(K)
+    layout = _layout(tamanho)
+    estado = linhas
+
+    for _ in range(rodadas):
+        estado = _transpor(estado, layout, inversa=True)
+        estado = _reverter_difusao_volta(estado)
+        estado = _reverter_difusao_ida(estado, layout)
+        estado = _aplicar_sbox(estado, layout, inversa=True)
+
+    return estado ^ chave
+
+
+def encrypt_batch(K: list[int], mensagens) -> np.ndarray:
+    """
+    Cifra todas as linhas de `mensagens` (N x len(K)) com a chave K.
+
+    Retorna uma matriz (N x len(K)) de uint8 em que a linha i é igual a
+    ENC(K, mensagem_i). K também pode ser uma matriz de chaves (N x n, como a
+    de gen_batch): a linha i é cifrada com a chave i, e uma única mensagem
+    (1 x n) é cifrada com todas as chaves.
+    """
+    tamanho = _tamanho_chave(K)
+    matriz = _como_matriz(mensagens, tamanho)
+
+    if tamanho == 0:
+        return matriz.copy()
+
+    estado = encrypt_packed(K, np.packbits(matriz, axis=1))
+    return np.unpackbits(estado, axis=1, count=tamanho)
+
+
+def decrypt_batch(K: list[int], cifras) -> np.ndarray:
+    """
+    Decifra todas as linhas de `cifras` (N x len(K)) com a chave K.
+
+    Retorna os bits das mensagens (ainda com o padding de zeros);
+    use matriz_para_textos para obter o mesmo texto que DEC.
+    """
+    tamanho = _tamanho_chave(K)
+    matriz = _como_matriz(cifras, tamanho)
+
+    if tamanho == 0:
+        return matriz.copy()
+
+    estado = decrypt_packed(K, np.packbits(matriz, axis=1))
+    return np.unpackbits(estado, axis=1, count=tamanho)
+
+
+# ---------------------------------------------------------------------
+# GEN em lote: uma chave por seed
+# ---------------------------------------------------------------------
+
+def gen_batch(
+    seeds,
+    input_champ=0,
+    input_stars=1,
+    rodadas: int = 4,
+    linhas_por_bloco: int = LINHAS_POR_BLOCO,
+) -> np.ndarray:
+    """
+    GEN para várias seeds do mesmo tamanho, com o mesmo campeão e estrelas.
+
+    Args:
+        seeds: matriz (N x s) de bits 0/1, uma seed por linha (como em
+               src/main.py; para seeds em texto use seeds_para_matriz)
+        rodadas: 4 como em src/gen.py, 3 como em src/main.py
+
+    Retorna a matriz (N x 4s) de uint8 em que a linha i é a chave da seed i,
+    pronta para encrypt_batch / decrypt_batch. As linhas são processadas em
+    blocos de `linhas_por_bloco` para limitar a memória intermediária.
+    """
+    champ_index = obter_campeao(input_champ)
+    stars_val = obter_estrelas(input_stars)
+    seeds = np.array(seeds, dtype=np.uint8, ndmin=2)
+    num_linhas, tamanho_seed = seeds.shape
+    tamanho = 4 * tamanho_seed
+    chaves = np.empty((num_linhas, tamanho), dtype=np.uint8)
+    if tamanho == 0:
+        return chaves
+
+    # combinar_seed: os bits do campeão/estrelas repetidos até o tamanho da seed
+    bits_tft = np.array(gerar_bits_tft(champ_index + 1, stars_val), dtype=np.uint8)
+    tft = np.resize(bits_tft, tamanho_seed)
+
+    layout = _layout(tamanho)
+    constantes = []
+    for round_num in range(rodadas):
+        # A constante de 8 bits começa no bit 0, então é o mesmo byte em todas as posições
+        constante = np.full(layout.num_bytes, (champ_index * (round_num + 1) + stars_val) % 255, np.uint8)
+        constante[-1] &= layout.mascara_ultimo
+        constantes.append((constante, stars_val * 7 + round_num * 11))
+
+    for inicio in range(0, num_linhas, linhas_por_bloco):
+        bloco = seeds[inicio : inicio + linhas_por_bloco] ^ tft
+        # Expansão: a seed combinada repetida 4 vezes
+        bits = np.tile(bloco, 4)
+        estado = np.packbits(bits, axis=1)
+
+        for constante, rotacao in constantes:
+            estado ^= constante
+            estado = _aplicar_sbox(estado, layout)
+            bits = np.unpackbits(estado, axis=1, count=tamanho)
+            # Rotação para a esquerda e feedback: bit i ^= bit i-1 (o bit 0 recebe o último)
+            bits = np.roll(bits, -(rotacao % tamanho), axis=1)
+            bits ^= np.roll(bits, 1, axis=1)
+            estado = np.packbits(bits, axis=1)
+
+        chaves[inicio : inicio + len(bloco)] = bits
+
+    return chaves
+
+
+def seeds_para_matriz(seeds: list[str]) -> np.ndarray:
+    """Converte seeds em texto (Latin-1, todas do mesmo tamanho) na matriz de bits de gen_batch."""
+    dados = [seed.encode("latin-1") for seed in seeds]
+    tamanhos = {len(d) for d in dados}
+    if len(tamanhos) > 1:
+        raise ValueError("Erro de tamanho: todas as seeds devem ter o mesmo número de caracteres.")
+    matriz = np.frombuffer(b"".join(dados), dtype=np.uint8).reshape(len(dados), tamanhos.pop() if dados else 0)
+    return np.unpackbits(matriz, axis=1)
+
+
+# ---------------------------------------------------------------------
+# Backend "numpy" de src/nucleo.py (uma mensagem por chamada)
+# ---------------------------------------------------------------------
+
+def gen_bits(seed_bits: list[int], champ_index: int, stars_val: int, rodadas: int = 4) -> list[int]:
+    """Uma seed por vez: o motor empacotado é mais rápido que gen_batch com uma linha."""
+    return packed.gen_bits(seed_bits, champ_index, stars_val, rodadas)
+
+
+def enc_bits(K: list[int], M: list[int], rodadas: int = NUM_RODADAS) -> list[int]:
+    """encrypt_packed de uma única linha (M é ajustada ao tamanho de K)."""
+    tamanho = len(K)
+    if tamanho == 0:
+        return []
+    linha = np.packbits(np.asarray(ajustar_tamanho_msg(M, tamanho), dtype=np.uint8))
+    return np.unpackbits(encrypt_packed(K, linha[None], rodadas)[0], count=tamanho).tolist()
+
+
+def dec_bits(K: list[int], C: list[int], rodadas: int = NUM_RODADAS) -> list[int]:
+    """decrypt_packed de uma única linha; retorna os bits da mensagem com o padding."""
+    tamanho = len(C)
+    if tamanho == 0:
+        return []
+    linha = np.packbits(np.asarray(C, dtype=np.uint8))
+    return np.unpackbits(decrypt_packed(K, linha[None], rodadas)[0], count=tamanho).tolist()
+
+
+def textos_para_matriz(textos: list[str], tamanho: int) -> np.ndarray:
+    """Converte textos em uma matriz de bits ajustada ao tamanho da chave (como ENC faz)."""
+    matriz = np.zeros((len(textos), tamanho), dtype=np.uint8)
+    for i, texto in enumerate(textos):
+        try:
+            dados = np.frombuffer(texto.encode("latin-1"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            matriz[i] = ajustar_tamanho_msg(texto_para_binario(texto), tamanho)
+            continue
+        bits = np.unpackbits(dados)[:tamanho]
+        matriz[i, : bits.shape[0]] = bits
+    return matriz
+
+
+def matriz_para_textos(matriz) -> list[str]:
+    """Converte cada linha de bits em texto, como DEC faz (inclusive o strip de '\\x00')."""
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    num_bytes = matriz.shape[1] // 8
+    linhas = np.packbits(matriz[:, : 8 * num_bytes], axis=1)
+    return [linha.tobytes().decode("latin-1").strip("\x00") for linha in linhas]
@@ -0,0 +1,422 @@
+# src/benchmark.py
+"""
+Suíte de benchmarks de GEN, ENC, DEC e das primitivas, com estatística por amostras.
+
+Para cada caso (função x tamanho):
+- Calibração: o número de chamadas por amostra (loops) cresce até a amostra
+  levar pelo menos `tempo_minimo_amostra`, para diluir a resolução do relógio
+- Aquecimento: `aquecimento` amostras descartadas (caches, tabelas, planos)
+- Medição: `amostras` amostras com o coletor de lixo desligado (gc.collect()
+  antes de cada caso), cada uma convertida em segundos por chamada
+- Relatório: mediana, p95, p99, média, desvio padrão e vazão em bits/s
+  (bits processados por chamada / mediana)
+
+Os resultados podem ser gravados em JSON e comparados com um JSON anterior
+(baseline): um caso regride quando a mediana atual passa da mediana da
+baseline por mais de `limite` (fração, ex.: 0.10 = 10%).
+
+Uso:
+    python -m src.benchmark --json resultados.json
+    python -m src.benchmark --baseline resultados.json --limite 0.10   # falha se regredir
+    python -m src.benchmark --backend referencia --casos GEN ENC DEC
+    python -m src.benchmark --casos ENC DEC --tamanhos 512 --mensagens 64 512 4096
+    python -m src.benchmark --escala-gen   # GEN de 16 kbit a 1 Mbit, falha se não for linear
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+
+from src import nucleo
+from src.dec import DEC
+from src.enc import ENC, aplicar_sbox, transposicao_colunar
+from src.gen import GEN
+from src.utils import texto_para_binario, xor_listas
+
+try:
+    from src.batch import encrypt_batch, gen_batch, seeds_para_matriz, textos_para_matriz
+except ImportError:  # NumPy é opcional
+    encrypt_batch = None
+
+# Tamanhos de chave (bits) da varredura; a seed tem tamanho / 32 caracteres,
+# então só múltiplos de 32 produzem exatamente a chave pedida
+TAMANHOS_PADRAO = (128, 512, 2048)
+
+# Mensagens (ou seeds) por chamada nos casos do backend em lote
+MENSAGENS_POR_LOTE = 1000
+
+# Varredura de escala de GEN: chaves de 16 kbit a 1 Mbit
+TAMANHOS_ESCALA_GEN = (1 << 14, 1 << 16, 1 << 18, 1 << 20)
+# Razão máxima entre o maior e o menor tempo por bit para considerar o crescimento linear
+LIMITE_ESCALA = 3.0
+
+AMOSTRAS = 30
+AQUECIMENTO = 3
+TEMPO_MINIMO_AMOSTRA = 0.005
+LIMITE_REGRESSAO = 0.10
+
+
+class Caso:
+    """
+    Uma função a medir: `preparar(tamanho)` devolve (chamada sem argumentos, bits por chamada).
+
+    Casos com `mensagem=True` (ENC/DEC) também aceitam `preparar(tamanho, mensagem)`,
+    com o tamanho da mensagem em bits (padrão: o da chave).
+    """
+
+    def __init__(self, nome: str, preparar, mensagem: bool = False):
+        self.nome = nome
+        self.preparar = preparar
+        self.mensagem = mensagem
+
+
+def validar_tamanho(tamanho: int) -> int:
+    """Tamanho de chave válido para a varredura: múltiplo positivo de 32 bits."""
+    if tamanho <= 0 or tamanho % 32:
+        raise ValueError(
+            f"Tamanho de chave inválido: {tamanho} (a seed tem tamanho / 32 caracteres, "
+            "então deve ser um múltiplo positivo de 32)."
+        )
+    return tamanho
+
+
+def validar_mensagem(mensagem: int) -> int:
+    """Tamanho de mensagem válido: múltiplo não negativo de 8 bits (caracteres inteiros)."""
+    if mensagem < 0 or mensagem % 8:
+        raise ValueError(f"Tamanho de mensagem inválido: {mensagem} (deve ser múltiplo não negativo de 8).")
+    return mensagem
+
+
+def _texto(rng: random.Random, caracteres: int) -> str:
+    return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(caracteres))
+
+
+def _chave(rng: random.Random, tamanho: int) -> list[int]:
+    return GEN(_texto(rng, tamanho // 32), 1, 2)[0]
+
+
+def _preparar_gen(tamanho):
+    seed = _texto(random.Random(tamanho), tamanho // 32)
+    return (lambda: GEN(seed, 1, 2)), len(GEN(seed, 1, 2)[0])
+
+
+# ENC/DEC processam sempre len(K) bits: a mensagem é completada com zeros ou
+# truncada no tamanho da chave, então a vazão é contada pelo tamanho da chave
+
+def _preparar_enc(tamanho, mensagem=None):
+    rng = random.Random(tamanho)
+    K = _chave(rng, tamanho)
+    M = _texto(rng, (tamanho if mensagem is None else mensagem) // 8)
+    return (lambda: ENC(K, M)), len(K)
+
+
+def _preparar_dec(tamanho, mensagem=None):
+    rng = random.Random(tamanho)
+    K = _chave(rng, tamanho)
+    C = ENC(K, _texto(rng, (tamanho if mensagem is None else mensagem) // 8))
+    return (lambda: DEC(K, C)), len(K)
+
+
+def _bits(tamanho):
+    rng = random.Random(tamanho)
+    return [rng.getrandbits(1) for _ in range(tamanho)]
+
+
+def _preparar_sbox(tamanho):
+    bits = _bits(tamanho)
+    return (lambda: aplicar_sbox(bits)), tamanho
+
+
+def _preparar_transposicao(tamanho):
+    bits = _bits(tamanho)
+    return (lambda: transposicao_colunar(bits)), tamanho
+
+
+def _preparar_texto_para_binario(tamanho):
+    texto = _texto(random.Random(tamanho), tamanho // 8)
+    return (lambda: texto_para_binario(texto)), 8 * len(texto)
+
+
+def _preparar_xor(tamanho):
+    a, b = _bits(tamanho), _bits(tamanho + 1)[1:]
+    return (lambda: xor_listas(a, b)), tamanho
+
+
+def _preparar_lote(tamanho):
+    rng = random.Random(tamanho)
+    K = _chave(rng, tamanho)
+    matriz = textos_para_matriz(
+        [_texto(rng, tamanho // 8) for _ in range(MENSAGENS_POR_LOTE)], len(K)
+    )
+    return (lambda: encrypt_batch(K, matriz)), len(K) * MENSAGENS_POR_LOTE
+
+
+def _preparar_gen_lote(tamanho):
+    rng = random.Random(tamanho)
+    seeds = seeds_para_matriz([_texto(rng, tamanho // 32) for _ in range(MENSAGENS_POR_LOTE)])
+    return (lambda: gen_batch(seeds, 1, 2)), 32 * seeds.shape[1] * MENSAGENS_POR_LOTE
+
+
+CASOS = [
+    Caso("GEN", _preparar_gen),
+    Caso("ENC", _preparar_enc, mensagem=True),
+    Caso("DEC", _preparar_dec, mensagem=True),
+    Caso("aplicar_sbox", _preparar_sbox),
+    Caso("transposicao_colunar", _preparar_transposicao),
+    Caso("texto_para_binario", _preparar_texto_para_binario),
+    Caso("xor_listas", _preparar_xor),
+]
+if encrypt_batch is not None:
+    CASOS.append(Caso("encrypt_batch", _preparar_lote))
+    CASOS.append(Caso("gen_batch", _preparar_gen_lote))
+
+
+# ---------------------------------------------------------------------
+# Medição e estatística
+# ---------------------------------------------------------------------
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil p (0-100) com interpolação linear entre as amostras ordenadas."""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    baixo = math.floor(posicao)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (posicao - baixo)
+
+
+def _cronometrar(chamada, loops: int) -> float:
+    faixa = range(loops)
+    inicio = time.perf_counter()
+    for _ in faixa:
+        chamada()
+    return time.perf_counter() - inicio
+
+
+def calibrar(chamada, tempo_minimo: float = TEMPO_MINIMO_AMOSTRA) -> int:
+    """Menor número de loops (1, 2, 5, 10, 20, ...) cuja amostra dura pelo menos tempo_minimo."""
+    loops = 1
+    while True:
+        for fator in (1, 2, 5):
+            if _cronometrar(chamada, loops * fator) >= tempo_minimo:
+                return loops * fator
+        loops *= 10
+
+
+def medir(
+    chamada,
+    bits: int,
+    amostras: int = AMOSTRAS,
+    aquecimento: int = AQUECIMENTO,
+    tempo_minimo_amostra: float = TEMPO_MINIMO_AMOSTRA,
+) -> dict:
+    """Mede `chamada` e devolve as estatísticas em segundos por chamada."""
+    loops = calibrar(chamada, tempo_minimo_amostra)
+    for _ in range(aquecimento):
+        _cronometrar(chamada, loops)
+
+    gc.collect()
+    gc_ligado = gc.isenabled()
+    gc.disable()
+    try:
+        tempos = [_cronometrar(chamada, loops) / loops for _ in range(amostras)]
+    finally:
+        if gc_ligado:
+            gc.enable()
+
+    mediana = statistics.median(tempos)
+    return {
+        "bits": bits,
+        "loops": loops,
+        "amostras": amostras,
+        "mediana_s": mediana,
+        "p95_s": percentil(tempos, 95),
+        "p99_s": percentil(tempos, 99),
+        "media_s": statistics.fmean(tempos),
+        "desvio_s": statistics.stdev(tempos) if amostras > 1 else 0.0,
+        "bits_por_s": bits / mediana if mediana > 0 else float("inf"),
+    }
+
+
+def executar(
+    casos=None,
+    tamanhos=TAMANHOS_PADRAO,
+    amostras: int = AMOSTRAS,
+    aquecimento: int = AQUECIMENTO,
+    tempo_minimo_amostra: float = TEMPO_MINIMO_AMOSTRA,
+    ao_medir=None,
+    mensagens=None,
+) -> dict:
+    """
+    Roda todos os casos em todos os tamanhos.
+
+    Com `mensagens` (tamanhos em bits), ENC e DEC são medidos em cada par
+    (chave, mensagem), com nomes "ENC/512/m64"; sem, a mensagem tem o tamanho
+    da chave e o nome é "ENC/512".
+
+    Retorna {"meta": {...}, "resultados": {"ENC/512": {...}, ...}};
+    `ao_medir(nome, estatisticas)` é chamado após cada caso (ex.: para imprimir).
+    """
+    for tamanho in tamanhos:
+        validar_tamanho(tamanho)
+    for mensagem in mensagens or ():
+        validar_mensagem(mensagem)
+
+    resultados = {}
+    for caso in casos or CASOS:
+        for tamanho in tamanhos:
+            if caso.mensagem and mensagens:
+                variantes = [(f"{caso.nome}/{tamanho}/m{m}", (tamanho, m)) for m in mensagens]
+            else:
+                variantes = [(f"{caso.nome}/{tamanho}", (tamanho,))]
+            for nome, argumentos in variantes:
+                chamada, bits = caso.preparar(*argumentos)
+                resultados[nome] = medir(chamada, bits, amostras, aquecimento, tempo_minimo_amostra)
+                if ao_medir is not None:
+                    ao_medir(nome, resultados[nome])
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementacao": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "amostras": amostras,
+            "aquecimento": aquecimento,
+            "tempo_minimo_amostra": tempo_minimo_amostra,
+            "mensagens": list(mensagens) if mensagens else None,
+            "backend": nucleo.backend_atual(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: dict, baseline: dict, limite: float = LIMITE_REGRESSAO) -> list[tuple]:
+    """
+    Compara as medianas com a baseline.
+
+    Retorna [(caso, mediana da baseline, mediana atual, razão)] dos casos que
+    ficaram mais de `limite` mais lentos; casos que só existem de um lado são ignorados.
+    """
+    regressoes = []
+    for nome, dados in atual["resultados"].items():
+        base = baseline["resultados"].get(nome)
+        if base is None:
+            continue
+        razao = dados["mediana_s"] / base["mediana_s"]
+        if razao > 1 + limite:
+            regressoes.append((nome, base["mediana_s"], dados["mediana_s"], razao))
+    return regressoes
+
+
+def escala_gen(tamanhos=TAMANHOS_ESCALA_GEN, amostras: int = 5) -> list[dict]:
+    """
+    Mede GEN com chaves cada vez maiores (uma chamada por amostra).
+
+    Retorna [{"bits", "mediana_s", "ns_por_bit"}] na ordem de `tamanhos`;
+    com custo linear, ns_por_bit fica aproximadamente constante.
+    """
+    escala = []
+    for tamanho in tamanhos:
+        chamada, bits = _preparar_gen(tamanho)
+        chamada()
+        mediana = statistics.median(_cronometrar(chamada, 1) for _ in range(amostras))
+        escala.append({"bits": bits, "mediana_s": mediana, "ns_por_bit": mediana / bits * 1e9})
+    return escala
+
+
+def crescimento_linear(escala: list[dict], limite: float = LIMITE_ESCALA) -> bool:
+    """Verdadeiro se o tempo por bit varia no máximo `limite` vezes entre os tamanhos."""
+    por_bit = [r["ns_por_bit"] for r in escala]
+    return max(por_bit) <= limite * min(por_bit)
+
+
+def formatar_linha(nome: str, r: dict) -> str:
+    return (
+        f"   {nome:<32} mediana {r['mediana_s'] * 1e6:>10.2f} µs  "
+        f"p95 {r['p95_s'] * 1e6:>10.2f} µs  p99 {r['p99_s'] * 1e6:>10.2f} µs  "
+        f"{r['bits_por_s'] / 1e6:>9.2f} Mbit/s"
+    )
+
+
+# ---------------------------------------------------------------------
+# Linha de comando
+# ---------------------------------------------------------------------
+
+def _tipo(validar):
+    """Converte o argumento em int e valida (erro de uso do argparse se inválido)."""
+    def converter(texto):
+        try:
+            return validar(int(texto))
+        except ValueError as erro:
+            raise argparse.ArgumentTypeError(str(erro)) from None
+    return converter
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks de GEN/ENC/DEC e primitivas")
+    ap.add_argument("--tamanhos", type=_tipo(validar_tamanho), nargs="+", default=list(TAMANHOS_PADRAO),
+                    help="Tamanhos de chave em bits (múltiplos de 32)")
+    ap.add_argument("--mensagens", type=_tipo(validar_mensagem), nargs="+",
+                    help="Tamanhos de mensagem em bits (múltiplos de 8) para ENC/DEC, "
+                         "menores ou maiores que a chave (default: o tamanho da chave)")
+    ap.add_argument("--casos", nargs="+", choices=[c.nome for c in CASOS],
+                    help="Subconjunto de casos (default: todos)")
+    ap.add_argument("--backend", choices=nucleo.disponiveis(),
+                    help="Backend de GEN/ENC/DEC (default: $TFT_BACKEND ou packed)")
+    ap.add_argument("--amostras", type=int, default=AMOSTRAS)
+    ap.add_argument("--aquecimento", type=int, default=AQUECIMENTO)
+    ap.add_argument("--tempo-amostra", type=float, default=TEMPO_MINIMO_AMOSTRA,
+                    help="Duração mínima de cada amostra em segundos")
+    ap.add_argument("--escala-gen", action="store_true",
+                    help="Mede só o crescimento de GEN de 16 kbit a 1 Mbit")
+    ap.add_argument("--json", help="Grava os resultados neste arquivo")
+    ap.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    ap.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                    help="Regressão tolerada da mediana (fração, default 0.10)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    casos = [c for c in CASOS if not args.casos or c.nome in args.casos]
+    if args.backend:
+        nucleo.selecionar(args.backend)
+
+    if args.escala_gen:
+        escala = escala_gen()
+        for r in escala:
+            print(f"   GEN {r['bits']:>9} bits  {r['mediana_s'] * 1e3:>9.2f} ms  {r['ns_por_bit']:>7.2f} ns/bit")
+        return 0 if crescimento_linear(escala) else 1
+
+    resultado = executar(
+        casos, args.tamanhos, args.amostras, args.aquecimento, args.tempo_amostra,
+        ao_medir=lambda nome, r: print(formatar_linha(nome, r)),
+        mensagens=args.mensagens,
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2)
+        print(f"\n   Resultados gravados em {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo)
+        regressoes = comparar(resultado, baseline, args.limite)
+        for nome, antes, depois, razao in regressoes:
+            print(f"   [REGRESSÃO] {nome}: {antes * 1e6:.2f} µs → {depois * 1e6:.2f} µs ({razao:.2f}x)")
+        if regressoes:
+            print(f"   → Resultado: REPROVADO ({len(regressoes)} regressões acima de {args.limite:.0%})")
+            return 1
+        print(f"   → Resultado: APROVADO (nenhuma regressão acima de {args.limite:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
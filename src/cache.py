@@ -0,0 +1,153 @@
+# src/cache.py
+"""
+Memoização opcional da agenda de chaves (GEN) com política LRU.
+
+GEN executa todas as rodadas de expansão a cada chamada, mesmo quando a
+mesma chave é derivada repetidas vezes. CacheLRU guarda os resultados mais
+recentes, com limite de tamanho, descarte do menos usado, limpeza explícita
+e contadores de acertos (hits), faltas (misses) e descartes (evictions).
+
+Uso:
+    from src.cache import cache_gen
+    GEN = cache_gen(tamanho_maximo=4096)
+    K, nome, estrelas = GEN("segredoTFT", 5, 2)
+    GEN.estatisticas()  # {'hits': 0, 'misses': 1, 'evictions': 0, ...}
+"""
+import threading
+from collections import OrderedDict
+
+from src import gen, main
+from src.estado import BitState
+
+TAMANHO_PADRAO = 1024
+
+
+class CacheLRU:
+    """Envolve uma função pura com um cache LRU limitado e contadores."""
+
+    def __init__(self, funcao, tamanho_maximo=TAMANHO_PADRAO, chave=None, copiar=None):
+        """
+        Args:
+            funcao: função a ser memoizada
+            tamanho_maximo: quantidade máxima de resultados guardados
+            chave: monta a chave do cache a partir dos argumentos da chamada
+                   (padrão: a tupla dos argumentos posicionais, que devem ser hasheáveis)
+            copiar: converte o valor guardado no valor devolvido, para que o chamador
+                    não altere o conteúdo do cache (padrão: devolve o próprio valor)
+        """
+        if tamanho_maximo < 1:
+            raise ValueError("O tamanho máximo do cache deve ser pelo menos 1.")
+
+        self.funcao = funcao
+        self.tamanho_maximo = tamanho_maximo
+        self._chave = chave or (lambda *args: args)
+        self._copiar = copiar or (lambda valor: valor)
+        self._dados = OrderedDict()
+        self._trava = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, *args, **kwargs):
+        chave = self._chave(*args, **kwargs)
+
+        with self._trava:
+            if chave in self._dados:
+                self._dados.move_to_end(chave)
+                self.hits += 1
+                return self._copiar(self._dados[chave])
+            self.misses += 1
+
+        # Calcula fora da trava para não serializar chamadas com chaves diferentes
+        valor = self.funcao(*args, **kwargs)
+
+        with self._trava:
+            self._dados[chave] = valor
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+                self.evictions += 1
+
+        return self._copiar(valor)
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._trava:
+            self._dados.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna os contadores e a ocupação atual do cache."""
+        with self._trava:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "tamanho": len(self._dados),
+                "tamanho_maximo": self.tamanho_maximo,
+            }
+
+    def __len__(self):
+        return len(self._dados)
+
+
+# ---------------------------------------------------------------------
+# GEN de src/gen.py: seed em texto, retorna (K, nome do campeão, estrelas)
+# ---------------------------------------------------------------------
+
+def _chave_gen_texto(seed_frase, input_champ=0, input_stars=1):
+    """Entradas equivalentes (ex.: campeão 1 e 41) compartilham a mesma entrada."""
+    return (seed_frase, gen.obter_campeao(input_champ), gen.obter_estrelas(input_stars))
+
+
+def _valor_gen_texto(K, nome_champ, stars_val):
+    return tuple(K), nome_champ, stars_val
+
+
+def cache_gen(tamanho_maximo=TAMANHO_PADRAO, funcao=None) -> CacheLRU:
+    """Cache LRU para GEN(seed_frase, input_champ, input_stars) de src/gen.py."""
+    funcao = funcao or gen.GEN
+    return CacheLRU(
+        lambda *args, **kwargs: _valor_gen_texto(*funcao(*args, **kwargs)),
+        tamanho_maximo,
+        chave=_chave_gen_texto,
+        copiar=lambda valor: (list(valor[0]), valor[1], valor[2]),
+    )
+
+
+# ---------------------------------------------------------------------
+# GEN de src/main.py: seed em lista de bits (não hasheável), retorna K
+# ---------------------------------------------------------------------
+
+def _chave_gen_bits(seed_frase, input_champ=0, input_stars=1):
+    # BitState já é hasheável (e nunca é igual a uma tupla): listas e BitState
+    # ficam em entradas separadas e cada um recebe de volta o próprio tipo
+    if not isinstance(seed_frase, BitState):
+        seed_frase = tuple(seed_frase)
+    return (seed_frase, main.obter_campeao(input_champ), main.obter_estrelas(input_stars))
+
+
+def _valor_gen_bits(K):
+    """BitState é imutável e fica como veio; listas são guardadas como tuplas."""
+    return K if isinstance(K, BitState) else tuple(K)
+
+
+def _copiar_gen_bits(K):
+    return K if isinstance(K, BitState) else list(K)
+
+
+def cache_gen_bits(tamanho_maximo=TAMANHO_PADRAO, funcao=None) -> CacheLRU:
+    """
+    Cache LRU para GEN(seed_bits, input_champ, input_stars) de src/main.py.
+
+    Como main.GEN, devolve BitState para seed BitState e lista para seed em lista.
+    """
+    funcao = funcao or main.GEN
+    return CacheLRU(
+        lambda *args, **kwargs: _valor_gen_bits(funcao(*args, **kwargs)),
+        tamanho_maximo,
+        chave=_chave_gen_bits,
+        copiar=_copiar_gen_bits,
+    )
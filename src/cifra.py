@@ -0,0 +1,182 @@
+# src/cifra.py
+"""
+Contexto de cifra pré-compilado para uma chave.
+
+ENC/DEC e encrypt_bytes/decrypt_bytes recebem a chave em lista de bits a cada
+chamada, então nada que dependa só da chave é reaproveitado. Cipher(K) faz
+esse trabalho uma vez:
+
+- chave empacotada (int e bytes alinhados à esquerda, como as mensagens)
+- planos lineares de ENC/DEC para len(K) (src/linear.py), que já incluem a
+  transposição colunar
+- primeira rodada por byte: para o byte j da mensagem, a tabela
+  v -> plano(S(v ⊕ k_j)) junta whitening, S-Box e camada linear em uma busca
+  (cada byte tem dois nibbles, então é o S(v ⊕ k) por nibble, dois de cada vez)
+- região de padding: ajustar_tamanho_msg completa a mensagem com zeros, e
+  zeros ⊕ k = k, então a saída da primeira rodada da região que começa no
+  byte b é uma constante, guardada para cada b
+
+Assim uma mensagem de b bytes sob uma chave longa paga b buscas na primeira
+rodada, em vez de S-Box e plano sobre todos os len(K) bits. As tabelas por
+byte são montadas na primeira vez que uma posição é usada.
+
+Acima de linear.TAMANHO_MAXIMO_PLANO bits não há planos: as etapas lineares
+são aplicadas em separado e só a S-Box da região de padding é reaproveitada.
+
+O estado de um Cipher não muda depois da construção (a montagem preguiçosa
+das tabelas só grava uma tabela pronta, idêntica em qualquer thread), então
+a mesma instância pode ser usada por várias threads ao mesmo tempo.
+
+Uso:
+    cifra = Cipher(K)
+    c = cifra.encrypt(b"mensagem")   # == encrypt_bytes(K, b"mensagem")
+    cifra.decrypt(c)                 # b"mensagem"
+"""
+from src import linear, packed
+from src.packed import ajustar_tamanho_int, bits_para_int, como_bytes, escrever_saida
+from src.tabelas import SBOX_BYTE, substituir_int
+
+
+class Cipher:
+    """ENC/DEC em bytes com tudo que depende só da chave calculado uma vez."""
+
+    __slots__ = (
+        "tamanho",
+        "rodadas",
+        "bytes_claro",
+        "bytes_cifra",
+        "_sobra",
+        "_k",
+        "_k_bytes",
+        "_sk",
+        "_plano_enc",
+        "_plano_dec",
+        "_rodada1",
+        "_padding",
+    )
+
+    def __init__(self, K: list[int], rodadas: int = 2):
+        """
+        Args:
+            K: chave em lista de bits (não vazia)
+            rodadas: rodadas de ENC/DEC
+        """
+        tamanho = len(K)
+        if tamanho == 0:
+            raise ValueError("A chave não pode ser vazia.")
+        if rodadas < 1:
+            raise ValueError("O número de rodadas deve ser pelo menos 1.")
+
+        self.tamanho = tamanho
+        self.rodadas = rodadas
+        self.bytes_claro = tamanho // 8
+        self.bytes_cifra = (tamanho + 7) // 8
+        self._sobra = -tamanho % 8
+        self._k = bits_para_int(K)
+        self._k_bytes = (self._k << self._sobra).to_bytes(self.bytes_cifra, "big")
+        # Primeira S-Box da região de padding: zeros ⊕ k = k
+        self._sk = substituir_int(self._k, tamanho)
+
+        if tamanho > linear.TAMANHO_MAXIMO_PLANO:
+            self._plano_enc = self._plano_dec = self._rodada1 = self._padding = None
+            return
+
+        self._plano_enc = linear.plano_enc(tamanho)
+        self._plano_dec = linear.plano_dec(tamanho)
+        self._rodada1 = [None] * self.bytes_claro
+
+        # _padding[b]: plano aplicado aos bytes b.. de S(k), ou seja, a parte da
+        # primeira rodada que vem do padding de uma mensagem de b bytes
+        sk_bytes = (self._sk << self._sobra).to_bytes(self.bytes_cifra, "big")
+        padding = [0] * (self.bytes_claro + 1)
+        acumulado = 0
+        for j in range(self.bytes_cifra - 1, -1, -1):
+            acumulado ^= self._plano_enc.tabela(j)[sk_bytes[j]]
+            if j <= self.bytes_claro:
+                padding[j] = acumulado
+        self._padding = padding
+
+    def _tabela_rodada1(self, j: int) -> list[int]:
+        """Tabela v -> plano(S(v ⊕ k_j)) do byte j (montada no primeiro uso)."""
+        tabela = self._rodada1[j]
+        if tabela is None:
+            plano = self._plano_enc.tabela(j)
+            k_j = self._k_bytes[j]
+            tabela = [plano[SBOX_BYTE[v ^ k_j]] for v in range(256)]
+            self._rodada1[j] = tabela
+        return tabela
+
+    # -----------------------------------------------------------------
+    # Núcleo empacotado
+    # -----------------------------------------------------------------
+
+    def enc_int(self, dados) -> int:
+        """ENC de uma mensagem em bytes; retorna a cifra empacotada (len(K) bits)."""
+        tamanho = self.tamanho
+        num_bytes = len(dados)
+
+        if num_bytes > self.bytes_claro:
+            # Mensagem truncada (pode cortar um byte no meio): caminho completo
+            m = int.from_bytes(dados[: self.bytes_cifra], "big")
+            m = ajustar_tamanho_int(m, 8 * min(num_bytes, self.bytes_cifra), tamanho)
+            return packed.enc_int(self._k, m, tamanho, self.rodadas)
+
+        if self._plano_enc is not None:
+            estado = self._padding[num_bytes]
+            for j, byte in enumerate(dados):
+                estado ^= self._tabela_rodada1(j)[byte]
+            for _ in range(self.rodadas - 1):
+                estado = self._plano_enc.aplicar(substituir_int(estado, tamanho))
+            return estado
+
+        # Sem plano: S-Box só nos bytes da mensagem, o padding já vem substituído
+        resto = tamanho - 8 * num_bytes
+        topo = int.from_bytes(dados, "big") ^ (self._k >> resto)
+        estado = (substituir_int(topo, 8 * num_bytes) << resto) | (self._sk & ((1 << resto) - 1))
+        estado = self._etapas_lineares(estado)
+        for _ in range(self.rodadas - 1):
+            estado = self._etapas_lineares(substituir_int(estado, tamanho))
+        return estado
+
+    def _etapas_lineares(self, estado: int) -> int:
+        tamanho = self.tamanho
+        estado = packed.difusao_ida_int(estado, tamanho)
+        estado = packed.difusao_volta_int(estado, tamanho)
+        return packed.transposicao_int(estado, tamanho)
+
+    def dec_int(self, c: int) -> int:
+        """DEC de uma cifra empacotada; retorna os bits da mensagem (ainda com padding)."""
+        tamanho = self.tamanho
+        if self._plano_dec is None:
+            return packed.dec_int(self._k, c, tamanho, self.rodadas)
+
+        estado = c
+        for _ in range(self.rodadas):
+            estado = substituir_int(self._plano_dec.aplicar(estado), tamanho, inversa=True)
+        return estado ^ self._k
+
+    # -----------------------------------------------------------------
+    # API em bytes (mesma saída de encrypt_bytes / decrypt_bytes)
+    # -----------------------------------------------------------------
+
+    def encrypt(self, dados, saida=None):
+        """
+        Cifra `dados` (bytes, bytearray ou memoryview) como encrypt_bytes(K, dados).
+
+        Retorna bytes_cifra bytes ou, com `saida`, a quantidade de bytes escritos nela.
+        """
+        with memoryview(dados) as visao:
+            c = self.enc_int(como_bytes(visao))
+        return escrever_saida((c << self._sobra).to_bytes(self.bytes_cifra, "big"), saida)
+
+    def decrypt(self, dados, saida=None):
+        """Decifra uma cifra de bytes_cifra bytes como decrypt_bytes(K, dados)."""
+        with memoryview(dados) as visao:
+            if visao.nbytes != self.bytes_cifra:
+                raise ValueError(
+                    f"Erro de tamanho: a cifra deve ter {self.bytes_cifra} bytes (recebido {visao.nbytes})."
+                )
+            c = int.from_bytes(como_bytes(visao), "big") >> self._sobra
+        m = self.dec_int(c)
+        texto = (m >> (self.tamanho % 8)).to_bytes(self.bytes_claro, "big").rstrip(b"\x00")
+        return escrever_saida(texto, saida)
@@ -0,0 +1,188 @@
+# src/cli.py
+"""
+Linha de comando para cifrar/decifrar arquivos e pipes com GEN/ENC/DEC.
+
+Uso:
+  python -m src.cli cifrar --seed segredoTFT --champ 5 --stars 2 -i foto.png -o foto.tft
+  python -m src.cli decifrar --seed segredoTFT --champ 5 --stars 2 -i foto.tft -o foto.png
+  cat dados.bin | python -m src.cli cifrar --seed segredoTFT > dados.tft
+  python -m src.cli cifrar --seed segredoTFT --processos 8 -i grande.bin -o grande.tft
+
+A chave é derivada com GEN (src/gen.py) e o conteúdo é processado em blocos
+do tamanho da chave pelo Encryptor/Decryptor de src/fluxo.py.
+
+Arquivos são lidos por janelas de mmap (cada janela é desmapeada antes da
+próxima) e a saída é escrita em pedaços grandes, então a memória de pico é a
+mesma para um arquivo de 1 MB ou de 10 GB. A vazão em MB/s é informada no
+stderr ao final.
+
+Com --processos N (N > 1) os blocos de cada pedaço são distribuídos entre N
+processos por src/paralelo.py; a saída é idêntica à do modo serial.
+
+Com -o, a saída é escrita em um arquivo temporário no mesmo diretório e só
+substitui o destino (os.replace) se tudo der certo; em caso de erro o
+temporário é apagado e o destino fica como estava.
+"""
+import argparse
+import itertools
+import mmap
+import os
+import sys
+import time
+
+from src.fluxo import Decryptor, Encryptor
+from src.gen import GEN
+
+# Janela de mmap: 8 MB, múltiplo da granularidade de alocação exigida pelo offset
+TAMANHO_JANELA = 8 << 20
+# Quantidade aproximada de bytes entregue ao Encryptor/Decryptor por chamada
+TAMANHO_PEDACO = 1 << 20
+# A saída acumula pelo menos isto antes de cada escrita
+TAMANHO_BUFFER_SAIDA = 4 << 20
+# Pedaço entregue ao fluxo no modo paralelo (cada um vira um lote do pool)
+TAMANHO_PEDACO_PARALELO = 16 << 20
+
+
+def ler_pedacos(caminho, tamanho_pedaco=TAMANHO_PEDACO):
+    """
+    Gera o conteúdo de `caminho` em pedaços de até `tamanho_pedaco` bytes.
+
+    Com caminho None ou "-" lê do stdin; senão percorre o arquivo por janelas de mmap.
+    """
+    if caminho in (None, "-"):
+        entrada = sys.stdin.buffer
+        while True:
+            pedaco = entrada.read(tamanho_pedaco)
+            if not pedaco:
+                return
+            yield pedaco
+
+    with open(caminho, "rb") as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        for inicio in range(0, tamanho, TAMANHO_JANELA):
+            comprimento = min(TAMANHO_JANELA, tamanho - inicio)
+            with mmap.mmap(
+                arquivo.fileno(), comprimento, access=mmap.ACCESS_READ, offset=inicio
+            ) as janela:
+                for i in range(0, comprimento, tamanho_pedaco):
+                    yield janela[i : i + tamanho_pedaco]
+
+
+def processar(fluxo, pedacos, saida) -> tuple[int, int]:
+    """
+    Passa cada pedaço pelo Encryptor/Decryptor e escreve a saída em lotes grandes.
+
+    Retorna (bytes lidos, bytes escritos).
+    """
+    lidos = escritos = 0
+    buffer = bytearray()
+
+    for pedaco in pedacos:
+        lidos += len(pedaco)
+        buffer += fluxo.update(pedaco)
+        if len(buffer) >= TAMANHO_BUFFER_SAIDA:
+            saida.write(buffer)
+            escritos += len(buffer)
+            buffer.clear()
+
+    buffer += fluxo.finalize()
+    saida.write(buffer)
+    escritos += len(buffer)
+    saida.flush()
+    return lidos, escritos
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Cifra/decifra arquivos ou pipes com GEN/ENC/DEC")
+    ap.add_argument("operacao", choices=["cifrar", "decifrar"], help="Operação a executar")
+    ap.add_argument("--seed", required=True, help="Senha usada por GEN para derivar a chave")
+    ap.add_argument("--champ", type=int, default=0, help="Campeão usado por GEN (default 0)")
+    ap.add_argument("--stars", type=int, default=1, help="Estrelas usadas por GEN (default 1)")
+    ap.add_argument("-i", "--entrada", default="-", help="Arquivo de entrada (default: stdin)")
+    ap.add_argument("-o", "--saida", default="-", help="Arquivo de saída (default: stdout)")
+    ap.add_argument(
+        "--processos", type=int, default=1, help="Processos para cifrar em paralelo (default 1)"
+    )
+    return ap.parse_args(argv)
+
+
+def abrir_saida_temporaria(caminho):
+    """
+    Abre um arquivo temporário no diretório de `caminho` (mesmo sistema de
+    arquivos, para o os.replace final ser atômico). Retorna (arquivo, nome).
+
+    As permissões são as que open() daria a um arquivo novo (0o666 sem a umask).
+    Usa os.open com O_EXCL em vez do módulo tempfile, que sozinho custaria
+    mais que o orçamento de importação da CLI.
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for tentativa in itertools.count():
+        temporario = os.path.join(
+            diretorio, f".{os.path.basename(caminho)}.{os.getpid()}.{tentativa}.parcial"
+        )
+        try:
+            descritor = os.open(temporario, flags, 0o666)
+        except FileExistsError:
+            continue
+        return os.fdopen(descritor, "wb", buffering=TAMANHO_BUFFER_SAIDA), temporario
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    K = GEN(args.seed, args.champ, args.stars)[0]
+
+    # Em arquivo, a saída vai para um temporário que só substitui o destino
+    # no fim: um erro no meio (ex.: padding inválido) não deixa arquivo parcial
+    if args.saida == "-":
+        saida, temporario = sys.stdout.buffer, None
+    else:
+        saida, temporario = abrir_saida_temporaria(args.saida)
+
+    executor = None
+    concluido = False
+    try:
+        try:
+            if args.processos > 1:
+                # multiprocessing e memória compartilhada só quando pedidos
+                from src.paralelo import ExecutorParalelo
+
+                executor = ExecutorParalelo(K, args.processos)
+            classe = Encryptor if args.operacao == "cifrar" else Decryptor
+            fluxo = classe(K, executor=executor)
+        except ValueError as erro:
+            raise SystemExit(f"Erro: {erro}")
+
+        # Pedaços múltiplos do bloco de entrada evitam sobras no buffer do fluxo
+        bloco = fluxo.bytes_claro if args.operacao == "cifrar" else fluxo.bytes_cifra
+        pedaco = TAMANHO_PEDACO_PARALELO if executor else TAMANHO_PEDACO
+        tamanho_pedaco = bloco * max(1, pedaco // bloco)
+
+        inicio = time.perf_counter()
+        try:
+            lidos, escritos = processar(fluxo, ler_pedacos(args.entrada, tamanho_pedaco), saida)
+        except ValueError as erro:
+            raise SystemExit(f"Erro: {erro}")
+        concluido = True
+    finally:
+        if executor is not None:
+            executor.fechar()
+        if temporario is not None:
+            saida.close()
+            if concluido:
+                os.replace(temporario, args.saida)
+            else:
+                os.unlink(temporario)
+    duracao = time.perf_counter() - inicio
+
+    vazao = lidos / 1e6 / duracao if duracao > 0 else float("inf")
+    print(
+        f"{args.operacao}: {lidos} bytes lidos, {escritos} bytes escritos "
+        f"em {duracao:.3f} s ({vazao:.2f} MB/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# src/colisoes.py
+"""
+Varredura paralela de colisões (chaves equivalentes) para tests/test_Colis.py.
+
+O teste serial guarda cada cifra inteira como tupla de bits em um único
+dicionário, o que limita a varredura a algumas dezenas de milhares de seeds.
+Aqui as seeds são particionadas entre shards (seed i vai para o shard
+i % num_shards) e cada shard roda em um processo do pool:
+
+1. calcula GEN + ENC de todas as seeds do shard com gen_batch e
+   encrypt_packed (src/batch.py) ou, sem NumPy, seed a seed com o motor
+   empacotado (src/packed.py)
+2. reduz cada cifra a uma impressão digital de 64 bits (BLAKE2b)
+3. mantém uma tabela local impressão → primeira seed do shard e anota as
+   colisões internas ao shard
+4. devolve só as impressões únicas ordenadas (em arrays compactos) e as
+   colisões locais
+
+O processo pai passa as impressões de cada shard, à medida que chegam, para
+um IndiceColisoes (src/indice.py), que respeita um orçamento de memória e
+transborda para disco com merge externo. Toda colisão candidata é
+confirmada recalculando as cifras completas, então uma coincidência da
+impressão nunca vira colisão falsa.
+
+O resultado é o mesmo do loop serial: colisões na ordem das seeds e, para
+cada uma, a primeira seed (menor índice) que produziu a mesma cifra.
+"""
+import multiprocessing
+import os
+from array import array
+from dataclasses import dataclass, field
+
+from src import nucleo
+from src.gen import obter_campeao, obter_estrelas
+from src.indice import ORCAMENTO_PADRAO, IndiceColisoes, impressao_digital
+from src.packed import ajustar_tamanho_int, enc_int, gen_int, texto_para_int
+
+# Shards por processo: shards menores equilibram a carga e limitam a tabela local
+SHARDS_POR_PROCESSO = 8
+
+# Seeds cifradas de uma vez em cada shard
+CIFRAS_POR_PEDACO = 4096
+
+
+@dataclass
+class ResultadoColisoes:
+    chaves: int
+    colisoes: int
+    # (seed que colidiu, primeira seed com a mesma cifra), na ordem das seeds
+    pares: list = field(default_factory=list)
+    # Impressões iguais cujas cifras completas eram diferentes
+    falsos_positivos: int = 0
+
+
+def formatar_seed(indice: int, tamanho_padrao: int = 16) -> str:
+    """Seed padronizada do teste de colisões (zeros à esquerda)."""
+    return str(indice).zfill(tamanho_padrao)
+
+
+class _Cifrador:
+    """GEN + ENC empacotados para uma mensagem, campeão e estrelas fixos."""
+
+    def __init__(self, msg: str, champ: int, stars: int, tamanho_padrao: int):
+        self.champ_index = obter_campeao(champ)
+        self.stars_val = obter_estrelas(stars)
+        self.tamanho_padrao = tamanho_padrao
+        self._msg = msg
+        self._m, self._tamanho_m = texto_para_int(msg)
+
+    def cifra(self, indice: int) -> tuple[int, int]:
+        """Retorna (cifra empacotada, tamanho em bits) para a seed de `indice`."""
+        seed, tamanho_seed = texto_para_int(formatar_seed(indice, self.tamanho_padrao))
+        tamanho = 4 * tamanho_seed
+        k = gen_int(seed, tamanho_seed, self.champ_index, self.stars_val)
+        m = ajustar_tamanho_int(self._m, self._tamanho_m, tamanho)
+        return enc_int(k, m, tamanho), tamanho
+
+    def empacotada(self, indice: int) -> bytes:
+        """Cifra da seed de `indice` em bytes (com o tamanho, que também distingue cifras)."""
+        cifra, tamanho = self.cifra(indice)
+        return tamanho.to_bytes(4, "big") + cifra.to_bytes((tamanho + 7) // 8, "big")
+
+    def empacotadas(self, indices) -> list[bytes]:
+        """
+        empacotada() de vários índices, na mesma ordem.
+
+        Com NumPy, as seeds de mesmo tamanho passam juntas por gen_batch e
+        encrypt_packed (uma chave por linha); as seeds são dígitos, então as
+        chaves têm 32 bits por caractere e os bytes saem iguais aos de empacotada().
+        """
+        indices = list(indices)
+        # NumPy é opcional: sem ele cada seed passa pelo motor empacotado
+        batch = nucleo.opcional("src.batch")
+        if batch is None:
+            return [self.empacotada(i) for i in indices]
+        import numpy as np
+
+        por_tamanho = {}
+        for posicao, i in enumerate(indices):
+            seed = formatar_seed(i, self.tamanho_padrao)
+            por_tamanho.setdefault(len(seed), []).append((posicao, seed))
+
+        saida = [None] * len(indices)
+        for grupo in por_tamanho.values():
+            for inicio in range(0, len(grupo), batch.LINHAS_POR_BLOCO):
+                parte = grupo[inicio : inicio + batch.LINHAS_POR_BLOCO]
+                seeds = batch.seeds_para_matriz([seed for _, seed in parte])
+                chaves = batch.gen_batch(seeds, self.champ_index + 1, self.stars_val)
+                tamanho = chaves.shape[1]
+                mensagem = np.packbits(batch.textos_para_matriz([self._msg], tamanho), axis=1)
+                cifras = batch.encrypt_packed(chaves, mensagem)
+                prefixo = tamanho.to_bytes(4, "big")
+                for (posicao, _), linha in zip(parte, cifras):
+                    saida[posicao] = prefixo + linha.tobytes()
+        return saida
+
+
+def _varrer_shard(tarefa):
+    """
+    Processa as seeds do shard e devolve (impressões, primeiras seeds, locais).
+
+    impressões são os valores de `bits` bits concatenados em bytes e primeiras
+    seeds um array 'Q', ambos na ordem das impressões; locais é a lista de
+    (seed, impressão) das colisões internas ao shard.
+    """
+    shard, num_shards, n_chaves, msg, champ, stars, tamanho_padrao, bits = tarefa
+    cifrador = _Cifrador(msg, champ, stars, tamanho_padrao)
+
+    tabela = {}
+    locais = []
+    indices = range(shard, n_chaves, num_shards)
+    # Em pedaços, para que só um bloco de cifras completas exista por vez
+    for inicio in range(0, len(indices), CIFRAS_POR_PEDACO):
+        pedaco = indices[inicio : inicio + CIFRAS_POR_PEDACO]
+        for i, cifra in zip(pedaco, cifrador.empacotadas(pedaco)):
+            fp = impressao_digital(cifra, bits)
+            if fp in tabela:
+                locais.append((i, fp))
+            else:
+                tabela[fp] = i
+
+    ordenados = sorted(tabela.items())
+    del tabela
+    impressoes = b"".join(fp.to_bytes(bits // 8, "big") for fp, _ in ordenados)
+    primeiras = array("Q", (i for _, i in ordenados))
+    return impressoes, primeiras, locais
+
+
+def varrer_colisoes(
+    n_chaves: int,
+    msg: str,
+    champ: int = 1,
+    stars: int = 2,
+    processos: int = None,
+    num_shards: int = None,
+    tamanho_padrao: int = 16,
+    orcamento_memoria: int = ORCAMENTO_PADRAO,
+    bits_impressao: int = 64,
+    indice: IndiceColisoes = None,
+) -> ResultadoColisoes:
+    """
+    Procura cifras repetidas de `msg` entre as seeds 0 .. n_chaves-1.
+
+    Args:
+        processos: tamanho do pool (padrão: os.cpu_count())
+        num_shards: partições das seeds (padrão: SHARDS_POR_PROCESSO por processo)
+        orcamento_memoria: bytes do índice de colisões do processo pai
+        bits_impressao: 64 ou 128
+        indice: opcional; índice (vazio) a usar no lugar do IndiceColisoes padrão
+    """
+    processos = processos or os.cpu_count() or 1
+    num_shards = num_shards or processos * SHARDS_POR_PROCESSO
+    tarefas = [
+        (shard, num_shards, n_chaves, msg, champ, stars, tamanho_padrao, bits_impressao)
+        for shard in range(num_shards)
+    ]
+    if indice is None:
+        indice = IndiceColisoes(orcamento_memoria, bits_impressao, capacidade_estimada=n_chaves)
+
+    def consumir(shard):
+        impressoes, primeiras, locais = shard
+        passo = bits_impressao // 8
+        for j, i in enumerate(primeiras):
+            indice.adicionar_impressao(i, int.from_bytes(impressoes[j * passo : (j + 1) * passo], "big"))
+        for i, fp in locais:
+            indice.adicionar_impressao(i, fp)
+
+    # Confirma as colisões com as cifras completas (separa coincidências da impressão)
+    cifrador = _Cifrador(msg, champ, stars, tamanho_padrao)
+
+    with indice:
+        if processos == 1:
+            for tarefa in tarefas:
+                consumir(_varrer_shard(tarefa))
+        else:
+            with multiprocessing.Pool(processos) as pool:
+                for shard in pool.imap_unordered(_varrer_shard, tarefas):
+                    consumir(shard)
+
+        resultado = indice.colisoes(recuperar=cifrador.empacotadas)
+
+    pares = [
+        (formatar_seed(i, tamanho_padrao), formatar_seed(primeira, tamanho_padrao))
+        for i, primeira in resultado.pares
+    ]
+    return ResultadoColisoes(
+        chaves=n_chaves,
+        colisoes=len(pares),
+        pares=pares,
+        falsos_positivos=resultado.falsos_positivos,
+    )
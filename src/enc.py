@@ -1,8 +1,14 @@
-from src.utils import xor_listas, texto_para_binario, ajustar_tamanho_msg
+from src.utils import texto_para_binario
+from src.tabelas import TFT_SBOX, substituir_bits
+from src.permutacao import transpor
+from src import instrumentacao, nucleo
+from src.instrumentacao import marcar
 
 # Tabela de Substituição (S-Box) para a etapa de confusão
 # Cada entrada de 4 bits (0-15) é substituída pelo valor correspondente
-TFT_SBOX = [12, 5, 6, 11, 9, 0, 10, 13, 3, 14, 15, 8, 4, 7, 1, 2]
+# As tabelas por byte derivadas dela ficam em src/tabelas.py
+
+NUM_RODADAS = 2
 
 
 def aplicar_sbox(bits):
@@ -11,33 +17,12 @@ def aplicar_sbox(bits):
     Isso garante não-linearidade e dificulta ataques criptanalíticos.
 
     Processo:
-    1. Pega 4 bits consecutivos e converte para um número (0-15)
-    2. Substitui esse número pelo valor na tabela TFT_SBOX
-    3. Converte o resultado de volta para 4 bits
+    1. Pega 8 bits consecutivos (2 nibbles) e converte para um número (0-255)
+    2. Busca os 8 bits já substituídos na tabela pré-calculada
+    3. Um nibble completo que sobrar no final usa a tabela de 4 bits
+    (os últimos len % 4 bits ficam intactos)
     """
-    novos_bits = bits[:]
-
-    # Processa a lista em grupos de 4 bits
-    for i in range(0, len(novos_bits), 4):
-        if i + 4 <= len(novos_bits):
-            # Converte 4 bits para um número decimal (0-15)
-            nibble = (
-                (novos_bits[i] << 3)
-                | (novos_bits[i + 1] << 2)
-                | (novos_bits[i + 2] << 1)
-                | novos_bits[i + 3]
-            )
-
-            # Busca o substituto na S-Box
-            substituido = TFT_SBOX[nibble]
-
-            # Converte o resultado de volta para 4 bits
-            novos_bits[i] = (substituido >> 3) & 1
-            novos_bits[i + 1] = (substituido >> 2) & 1
-            novos_bits[i + 2] = (substituido >> 1) & 1
-            novos_bits[i + 3] = substituido & 1
-
-    return novos_bits
+    return substituir_bits(bits)
 
 
 def transposicao_colunar(bits, num_colunas=4):
@@ -48,19 +33,11 @@ def transposicao_colunar(bits, num_colunas=4):
     Exemplo com 16 bits em 4 colunas:
     Entrada: [b0, b1, b2, b3, b4, b5, b6, b7, ...]
     Organiza em matriz 4x4 e lê por coluna
-    """
-    tamanho = len(bits)
-    num_linhas = (tamanho + num_colunas - 1) // num_colunas
-    saida = []
-
-    # Lê coluna por coluna da matriz
-    for coluna in range(num_colunas):
-        for linha in range(num_linhas):
-            idx = linha * num_colunas + coluna
-            if idx < tamanho:
-                saida.append(bits[idx])
 
-    return saida
+    A ordem de leitura depende só de (len(bits), num_colunas), então os índices
+    ficam em cache (src/permutacao.py) e a leitura vira uma única coleta.
+    """
+    return transpor(bits, num_colunas)
 
 
 def ENC(K: list[int], mensagem_texto: str) -> list[int]:
@@ -72,46 +49,22 @@ def ENC(K: list[int], mensagem_texto: str) -> list[int]:
     - 2 rodadas de: Confusão → Difusão Linear Bidirecional → Difusão Espacial
     - Eliminação de pontos cegos através de propagação ida e volta
 
+    As rodadas são executadas pelo backend selecionado em src/nucleo.py
+    (a versão etapa por etapa está em src/referencia.py).
+
     Parâmetros:
     - K: Chave em formato de lista de bits
     - mensagem_texto: Texto a ser encriptado
 
     Retorna: Lista de bits criptografados
     """
+    medir = instrumentacao.ativo
+    if medir:
+        t = instrumentacao.agora()
+
     # Converte o texto em bits
     M = texto_para_binario(mensagem_texto)
+    if medir:
+        marcar("ENC", "codec", t)
 
-    # Ajusta o tamanho da mensagem para corresponder à chave
-    M = ajustar_tamanho_msg(M, len(K))
-
-    if len(K) != len(M):
-        raise ValueError("Erro de tamanho: A mensagem ajustada deve igualar a chave.")
-
-    # === ETAPA INICIAL: WHITENING ===
-    # XOR entre mensagem e chave para misturar dados antes das rodadas
-    estado = xor_listas(M, K)
-
-    NUM_RODADAS = 2
-
-    for num_rodada in range(NUM_RODADAS):
-        # === ETAPA A: CONFUSÃO (S-Box) ===
-        # Substitui grupos de bits para adicionar não-linearidade
-        estado = aplicar_sbox(estado)
-
-        # === ETAPA B: DIFUSÃO LINEAR (Ida / Forward) ===
-        # Cada bit influencia o próximo (propagação para a direita)
-        # Garante que mudanças se espalhem pela estrutura
-        for i in range(1, len(estado)):
-            estado[i] ^= estado[i - 1]
-
-        # === ETAPA C: DIFUSÃO LINEAR (Volta / Backward) ===
-        # Propagação inversa para eliminar pontos cegos
-        # Bits do final influenciam o começo, melhorando a difusão
-        for i in range(len(estado) - 2, -1, -1):
-            estado[i] ^= estado[i + 1]
-
-        # === ETAPA D: DIFUSÃO ESPACIAL (Transposição) ===
-        # Reorganiza os bits para uma melhor distribuição
-        estado = transposicao_colunar(estado, num_colunas=4)
-
-    return estado
+    return nucleo.enc_bits(K, M, NUM_RODADAS)
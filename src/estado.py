@@ -0,0 +1,184 @@
+# src/estado.py
+"""
+BitState: sequência de bits imutável e compacta para chaves, mensagens e cifras.
+
+As APIs recebem e devolvem listas de bits (um int do Python por bit, ~8 bytes
+de ponteiro cada: 1024 bits de chave ocupam ~8 KB) e listas não podem ser
+chaves de dicionário. BitState guarda os mesmos bits empacotados em um único
+int, na convenção de src/packed.py (bit 0 = bit mais significativo), junto
+com o tamanho:
+
+- 1024 bits ocupam ~200 bytes
+- __eq__ e __hash__ comparam (tamanho, valor): cifras podem ir direto para
+  sets e dicionários
+- XOR, popcount e fatias contíguas são operações sobre o int, sem laço por bit
+- converte de/para list[int] (BitState(lista) / tolist()) e bytes
+
+GEN/ENC/DEC (src/gen.py, src/enc.py, src/dec.py, src/main.py), Cipher,
+encrypt_bytes e o backend em lote aceitam BitState onde aceitam lista de bits;
+quando a entrada em bits é um BitState, a saída em bits também é (listas
+continuam recebendo listas).
+
+Uso:
+    K = BitState(GEN("segredo", 5, 2)[0])
+    C = ENC(K, "mensagem")          # BitState
+    DEC(K, C)                       # "mensagem"
+    (C ^ ENC(K, "mensagen")).popcount()
+"""
+
+# Bits 0/1 <-> caracteres ASCII '0'/'1' (para int(..., 2) e format)
+_BITS_PARA_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_ASCII_PARA_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class BitState:
+    """Sequência imutável de bits empacotada em um int (bit 0 = mais significativo)."""
+
+    __slots__ = ("_valor", "_tamanho")
+
+    def __init__(self, bits=()):
+        """
+        Args:
+            bits: iterável de 0/1 (lista, tupla, bytes 0/1), texto "0101"
+                  ou outro BitState
+        """
+        if isinstance(bits, BitState):
+            self._valor, self._tamanho = bits._valor, bits._tamanho
+            return
+        if isinstance(bits, str):
+            dados = bits.encode("ascii", "replace").translate(_ASCII_PARA_BITS)
+        else:
+            dados = bytes(bits)
+        if not dados:
+            self._valor, self._tamanho = 0, 0
+            return
+        try:
+            self._valor = int(dados.translate(_BITS_PARA_ASCII), 2)
+        except ValueError:
+            raise ValueError("BitState aceita apenas bits 0 e 1.") from None
+        self._tamanho = len(dados)
+
+    @classmethod
+    def from_int(cls, valor: int, tamanho: int) -> "BitState":
+        """Os `tamanho` bits menos significativos de `valor` (bit 0 = o mais significativo deles)."""
+        if tamanho < 0:
+            raise ValueError("O tamanho não pode ser negativo.")
+        estado = cls.__new__(cls)
+        estado._valor = valor & ((1 << tamanho) - 1)
+        estado._tamanho = tamanho
+        return estado
+
+    @classmethod
+    def from_bytes(cls, dados, tamanho: int = None) -> "BitState":
+        """Os primeiros `tamanho` bits (padrão: todos) de `dados`, bit 0 = bit mais significativo do byte 0."""
+        total = 8 * len(dados)
+        if tamanho is None:
+            tamanho = total
+        elif not 0 <= tamanho <= total:
+            raise ValueError(f"Erro de tamanho: {len(dados)} bytes não têm {tamanho} bits.")
+        return cls.from_int(int.from_bytes(dados, "big") >> (total - tamanho), tamanho)
+
+    # -----------------------------------------------------------------
+    # Conversões
+    # -----------------------------------------------------------------
+
+    @property
+    def valor(self) -> int:
+        """Os bits como int (convenção de src/packed.py)."""
+        return self._valor
+
+    def __int__(self) -> int:
+        return self._valor
+
+    def tolist(self) -> list[int]:
+        if self._tamanho == 0:
+            return []
+        return list(format(self._valor, f"0{self._tamanho}b").encode().translate(_ASCII_PARA_BITS))
+
+    def to_bytes(self) -> bytes:
+        """Bits alinhados à esquerda em ceil(len / 8) bytes, com o padding do último byte zerado."""
+        sobra = -self._tamanho % 8
+        return (self._valor << sobra).to_bytes((self._tamanho + 7) // 8, "big")
+
+    def __reduce__(self):
+        return (BitState.from_int, (self._valor, self._tamanho))
+
+    # -----------------------------------------------------------------
+    # Sequência
+    # -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, indice):
+        tamanho = self._tamanho
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(tamanho)
+            if passo != 1:
+                return BitState(self.tolist()[indice])
+            largura = max(0, fim - inicio)
+            return BitState.from_int(self._valor >> (tamanho - inicio - largura), largura)
+
+        if indice < 0:
+            indice += tamanho
+        if not 0 <= indice < tamanho:
+            raise IndexError("índice de bit fora do intervalo")
+        return (self._valor >> (tamanho - 1 - indice)) & 1
+
+    def __add__(self, outro) -> "BitState":
+        """Concatenação com outro BitState ou lista de bits."""
+        if not isinstance(outro, BitState):
+            if not isinstance(outro, (list, tuple)):
+                return NotImplemented
+            outro = BitState(outro)
+        return BitState.from_int((self._valor << outro._tamanho) | outro._valor, self._tamanho + outro._tamanho)
+
+    def __radd__(self, outro) -> "BitState":
+        if not isinstance(outro, (list, tuple)):
+            return NotImplemented
+        return BitState(outro) + self
+
+    # -----------------------------------------------------------------
+    # Comparação e operações sobre bits
+    # -----------------------------------------------------------------
+
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, BitState):
+            return self._tamanho == outro._tamanho and self._valor == outro._valor
+        if isinstance(outro, list):
+            # Listas não são hasheáveis, então igualdade com elas não quebra __hash__
+            return self.tolist() == outro
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._tamanho, self._valor))
+
+    def __xor__(self, outro) -> "BitState":
+        if not isinstance(outro, BitState):
+            if not isinstance(outro, (list, tuple)):
+                return NotImplemented
+            outro = BitState(outro)
+        if outro._tamanho != self._tamanho:
+            raise ValueError(
+                f"Erro de tamanho: XOR entre {self._tamanho} e {outro._tamanho} bits."
+            )
+        return BitState.from_int(self._valor ^ outro._valor, self._tamanho)
+
+    __rxor__ = __xor__
+
+    def popcount(self) -> int:
+        """Quantidade de bits 1 (com o XOR de duas cifras, a distância de Hamming)."""
+        return self._valor.bit_count()
+
+    def __repr__(self) -> str:
+        if self._tamanho == 0:
+            return "BitState()"
+        return f"BitState('{format(self._valor, f'0{self._tamanho}b')}')"
+
+
+def como_lista(bits) -> list[int]:
+    """Lista de bits para os backends: BitState vira lista, o resto passa intacto."""
+    return bits.tolist() if isinstance(bits, BitState) else bits
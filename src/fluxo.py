@@ -0,0 +1,176 @@
+# src/fluxo.py
+"""
+Cifragem incremental (streaming) para mensagens maiores que a chave.
+
+ajustar_tamanho_msg trunca tudo que passa de len(K) bits, então ENC sozinho
+só cifra mensagens curtas. Aqui a entrada é dividida em blocos do tamanho da
+chave e cada bloco é cifrado com o mesmo núcleo de ENC:
+
+- Bloco de texto claro: len(K) // 8 bytes (os bits que sobram da chave recebem
+  zeros, exatamente como em ajustar_tamanho_msg)
+- Bloco cifrado: os len(K) bits de ENC empacotados em ceil(len(K) / 8) bytes
+  (bit 0 = bit mais significativo do primeiro byte)
+- Padding explícito (ISO/IEC 7816-4): o último bloco recebe um byte 0x80 e
+  zeros até completar o bloco (um bloco inteiro extra se a entrada já estiver
+  alinhada). Assim o tamanho original é recuperado sem o strip("\\x00") de
+  DEC, que apagaria bytes nulos legítimos do final da mensagem.
+
+Só um bloco fica em memória por vez, então a memória é constante mesmo para
+fluxos de vários GB.
+
+Uso (no estilo do hashlib):
+    enc = Encryptor(K)
+    cifra = enc.update(b"parte 1") + enc.update(b"parte 2") + enc.finalize()
+
+    dec = Decryptor(K)
+    texto = dec.update(cifra) + dec.finalize()
+"""
+from src.packed import bits_para_int, dec_int, enc_int
+
+MARCADOR_PADDING = 0x80
+
+
+def _tamanhos(K: list[int]) -> tuple[int, int, int]:
+    """Retorna (bits da chave, bytes por bloco claro, bytes por bloco cifrado)."""
+    tamanho = len(K)
+    if tamanho < 8:
+        raise ValueError("A chave precisa ter pelo menos 8 bits para cifrar em blocos.")
+    return tamanho, tamanho // 8, (tamanho + 7) // 8
+
+
+class _Fluxo:
+    """Estado comum: chave empacotada, tamanhos dos blocos e o buffer do bloco parcial."""
+
+    def __init__(self, K: list[int], executor=None):
+        """
+        Args:
+            K: chave em lista de bits (pelo menos 8 bits)
+            executor: opcional; objeto com cifrar_blocos/decifrar_blocos que processa
+                      os blocos completos em outro lugar (ex.: src.paralelo.ExecutorParalelo)
+        """
+        self.tamanho, self.bytes_claro, self.bytes_cifra = _tamanhos(K)
+        self._executor = executor or self
+        self._k = bits_para_int(K)
+        # Bits de padding: os que sobram da chave no bloco claro e no último byte da cifra
+        self._sobra_claro = self.tamanho - 8 * self.bytes_claro
+        self._sobra_cifra = 8 * self.bytes_cifra - self.tamanho
+        self._buffer = bytearray()
+        self._finalizado = False
+
+    def _verificar_aberto(self):
+        if self._finalizado:
+            raise ValueError("O fluxo já foi finalizado.")
+
+    def cifrar_bloco(self, bloco) -> bytes:
+        """Cifra um bloco de bytes_claro bytes (idêntico a ENC sobre o mesmo texto Latin-1)."""
+        m = int.from_bytes(bloco, "big") << self._sobra_claro
+        c = enc_int(self._k, m, self.tamanho)
+        return (c << self._sobra_cifra).to_bytes(self.bytes_cifra, "big")
+
+    def decifrar_bloco(self, bloco) -> bytes:
+        """Decifra um bloco de bytes_cifra bytes, devolvendo bytes_claro bytes."""
+        c = int.from_bytes(bloco, "big") >> self._sobra_cifra
+        m = dec_int(self._k, c, self.tamanho)
+        return (m >> self._sobra_claro).to_bytes(self.bytes_claro, "big")
+
+    def cifrar_blocos(self, dados) -> bytes:
+        """Cifra uma sequência de blocos completos (len(dados) múltiplo de bytes_claro)."""
+        return b"".join(
+            self.cifrar_bloco(dados[i : i + self.bytes_claro])
+            for i in range(0, len(dados), self.bytes_claro)
+        )
+
+    def decifrar_blocos(self, dados) -> bytes:
+        """Decifra uma sequência de blocos completos (len(dados) múltiplo de bytes_cifra)."""
+        return b"".join(
+            self.decifrar_bloco(dados[i : i + self.bytes_cifra])
+            for i in range(0, len(dados), self.bytes_cifra)
+        )
+
+
+class Encryptor(_Fluxo):
+    """Cifra um fluxo de bytes de forma incremental."""
+
+    def update(self, dados) -> bytes:
+        """Acrescenta dados e retorna a cifra de todos os blocos que ficaram completos."""
+        self._verificar_aberto()
+        self._buffer += dados
+        completos = len(self._buffer) - len(self._buffer) % self.bytes_claro
+
+        if completos == 0:
+            return b""
+
+        with memoryview(self._buffer) as visao:
+            saida = self._executor.cifrar_blocos(visao[:completos])
+
+        del self._buffer[:completos]
+        return saida
+
+    def finalize(self) -> bytes:
+        """Aplica o padding e retorna a cifra do(s) último(s) bloco(s)."""
+        self._verificar_aberto()
+        self._finalizado = True
+        ultimo = bytes(self._buffer) + bytes([MARCADOR_PADDING])
+        ultimo += bytes(-len(ultimo) % self.bytes_claro)
+        self._buffer.clear()
+        return self.cifrar_blocos(ultimo)
+
+
+class Decryptor(_Fluxo):
+    """Decifra um fluxo produzido por Encryptor com a mesma chave."""
+
+    def __init__(self, K: list[int], executor=None):
+        super().__init__(K, executor)
+        # Último bloco decifrado: só é liberado quando sabemos que não é o final
+        self._pendente = None
+
+    def update(self, dados) -> bytes:
+        """Acrescenta dados cifrados e retorna o texto dos blocos que já podem ser liberados."""
+        self._verificar_aberto()
+        self._buffer += dados
+        completos = len(self._buffer) - len(self._buffer) % self.bytes_cifra
+
+        if completos == 0:
+            return b""
+
+        with memoryview(self._buffer) as visao:
+            claro = self._executor.decifrar_blocos(visao[:completos])
+        del self._buffer[:completos]
+
+        # Libera o bloco pendente anterior e segura o último bloco decifrado agora
+        saida = (self._pendente or b"") + claro[: -self.bytes_claro]
+        self._pendente = claro[-self.bytes_claro :]
+        return saida
+
+    def finalize(self) -> bytes:
+        """Valida e remove o padding do último bloco."""
+        self._verificar_aberto()
+        self._finalizado = True
+        if self._buffer or self._pendente is None:
+            raise ValueError("Cifra truncada: o tamanho não é múltiplo do bloco cifrado.")
+
+        ultimo = self._pendente.rstrip(b"\x00")
+        if not ultimo or ultimo[-1] != MARCADOR_PADDING:
+            raise ValueError("Padding inválido: chave errada ou cifra corrompida.")
+        self._pendente = None
+        return ultimo[:-1]
+
+
+def cifrar_fluxo(K: list[int], pedacos):
+    """Gerador: cifra cada pedaço de `pedacos` (iterável de bytes) à medida que chega."""
+    enc = Encryptor(K)
+    for pedaco in pedacos:
+        saida = enc.update(pedaco)
+        if saida:
+            yield saida
+    yield enc.finalize()
+
+
+def decifrar_fluxo(K: list[int], pedacos):
+    """Gerador: decifra um fluxo produzido por cifrar_fluxo / Encryptor."""
+    dec = Decryptor(K)
+    for pedaco in pedacos:
+        saida = dec.update(pedaco)
+        if saida:
+            yield saida
+    yield dec.finalize()
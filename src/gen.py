@@ -1,16 +1,14 @@
-import os
-import sys
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-
 from src.utils import texto_para_binario
+from src.tabelas import TFT_SBOX, substituir_bits
+from src import instrumentacao, nucleo
+from src.instrumentacao import marcar
 
-TFT_SBOX = [12, 5, 6, 11, 9, 0, 10, 13, 3, 14, 15, 8, 4, 7, 1, 2]
-# Tabela de Substituição (S-Box): mapeia valores de 4 bits (0-15) para outros valores
+# TFT_SBOX - Tabela de Substituição (S-Box): mapeia valores de 4 bits (0-15) para outros valores
 # Propósito: Confusão - torna a relação entre chave e texto cifrado complexa
 # Exemplo: entrada 5 → saída 6 (embaralha os bits de forma não-linear)
 
+NUM_RODADAS = 4
+
 
 TFT_CHAMPIONS = [
     "Bardo",
@@ -142,36 +140,17 @@ def aplicar_sbox(bits):
     Aplica confusão usando a S-Box.
 
     Processo:
-    1. Divide os bits em grupos de 4 (chamados "nibbles")
-    2. Converte cada nibble para número (0-15)
-    3. Substitui pela tabela TFT_SBOX
-    4. Converte de volta para 4 bits
+    1. Divide os bits em grupos de 8 (dois "nibbles" de 4 bits)
+    2. Converte cada grupo para número (0-255)
+    3. Substitui pela tabela pré-calculada (os dois nibbles passam pela TFT_SBOX)
+    4. Um nibble completo que sobrar no final usa a tabela de 4 bits
 
     Propósito: Operação não-linear que embaralha os bits
     → Impossível deduzir a entrada a partir da saída sem conhecer a S-Box
 
     Exemplo: nibble 0101 (5) → TFT_SBOX[5] = 6 → 0110
     """
-    novos_bits = bits[:]
-    for i in range(0, len(novos_bits), 4):
-        if i + 4 <= len(novos_bits):
-            # Converte 4 bits para número (0-15)
-            nibble = (
-                (novos_bits[i] << 3)
-                | (novos_bits[i + 1] << 2)
-                | (novos_bits[i + 2] << 1)
-                | novos_bits[i + 3]
-            )
-
-            # Substitui pela tabela
-            substituido = TFT_SBOX[nibble]
-
-            # Converte de volta para 4 bits
-            novos_bits[i] = (substituido >> 3) & 1
-            novos_bits[i + 1] = (substituido >> 2) & 1
-            novos_bits[i + 2] = (substituido >> 1) & 1
-            novos_bits[i + 3] = substituido & 1
-    return novos_bits
+    return substituir_bits(bits)
 
 
 def rotacionar_bits(bits, n):
@@ -207,54 +186,22 @@ def GEN(seed_frase, input_champ=0, input_stars=1):
        d) Feedback com bit vizinho (difusão adicional)
 
     Resultado: chave de 128+ bits bem misturada e segura
+
+    As etapas 1 (combinação), 2 e 3 são executadas pelo backend selecionado
+    em src/nucleo.py (a versão etapa por etapa está em src/referencia.py).
     """
+    medir = instrumentacao.ativo
+    if medir:
+        t = instrumentacao.agora()
+
     champ_index = obter_campeao(input_champ)
     stars_val = obter_estrelas(input_stars)
     nome_champ = TFT_CHAMPIONS[champ_index]
 
-    # ETAPA 1: Prepara a seed inicial
+    # Converte a senha em bits
     seed_bits = texto_para_binario(seed_frase)
-    tft_bits = gerar_bits_tft(champ_index + 1, stars_val)
-    seed_final = combinar_seed(seed_bits, tft_bits)
-
-    if not seed_final:
-        return [], nome_champ, stars_val
-
-    # ETAPA 2: Expande a seed
-    # Aumenta 4x o tamanho para ter mais bits na chave final
-    tamanho_chave = 4 * len(seed_bits)
-
-    estado = []
-    while len(estado) < tamanho_chave:
-        estado.extend(seed_final)
-    estado = estado[:tamanho_chave]
-
-    # ETAPA 3: Rodadas de processamento (4 rodadas)
-    numero_rodadas = 4
-
-    for round_num in range(numero_rodadas):
-        # PASSO A: Mistura com constante que varia a cada rodada
-        # Constante depende do campeão e estrelas → campeão diferente = chave diferente
-        constante_round = (champ_index * (round_num + 1) + stars_val) % 255
-        bits_constante = [int(b) for b in format(constante_round, "08b")]
-
-        for i in range(len(estado)):
-            estado[i] ^= bits_constante[i % 8]
-
-        # PASSO B: CONFUSÃO - S-Box embaralha os bits
-        estado = aplicar_sbox(estado)
-
-        # PASSO C: DIFUSÃO - Rotação espalha a influência dos bits
-        # Rotação diferente a cada rodada para evitar padrões
-        rotacao = stars_val * 7 + round_num * 11
-        estado = rotacionar_bits(estado, rotacao)
-
-        # PASSO D: DIFUSÃO ADICIONAL - Feedback com bits vizinhos
-        # Cada bit é XORado com o anterior, criando dependência entre bits
-        novo_estado = estado[:]
-        for i in range(len(estado)):
-            novo_estado[i] ^= estado[(i - 1) % len(estado)]
-        estado = novo_estado
+    if medir:
+        marcar("GEN", "codec", t)
 
-    K = estado
+    K = nucleo.gen_bits(seed_bits, champ_index, stars_val, NUM_RODADAS)
     return K, nome_champ, stars_val
@@ -0,0 +1,317 @@
+# src/indice.py
+"""
+Índice de colisões compacto, com memória limitada e transbordo para disco.
+
+Os testes de chaves equivalentes (tests/test_Colis.py, mask.equiv_keys_test)
+guardavam cada cifra inteira como tupla de ints, centenas de bytes por
+entrada. IndiceColisoes guarda só o necessário para achar repetições:
+
+- Impressão digital de 64 ou 128 bits (BLAKE2b) de cada cifra empacotada,
+  junto com um rótulo inteiro (ex.: o índice da seed)
+- Filtro de Bloom como pré-filtro: só as cifras cuja impressão talvez já
+  tenha aparecido (candidatas) têm o valor completo guardado
+- Registros (impressão, rótulo) acumulados em memória até o orçamento;
+  quando ele estoura, o lote é ordenado e gravado em disco (run)
+- No final, os runs são intercalados (merge externo, em níveis se houver
+  muitos) e impressões iguais formam grupos candidatos
+
+Os grupos são confirmados com os valores completos: os das candidatas
+guardados pelo índice e, para os demais, os devolvidos pela função
+`recuperar` do chamador. Assim a lista de colisões é exata; grupos sem os
+valores completos são aceitos só pela impressão (contados em nao_verificados).
+
+Uso:
+    with IndiceColisoes(orcamento_memoria=64 << 20) as indice:
+        for i, cifra in enumerate(cifras):
+            indice.adicionar(i, cifra)
+        resultado = indice.colisoes(recuperar=lambda rotulos: [cifras[i] for i in rotulos])
+    resultado.pares  # [(rótulo repetido, primeiro rótulo com a mesma cifra), ...]
+"""
+import heapq
+import math
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from hashlib import blake2b
+
+ORCAMENTO_PADRAO = 64 << 20
+
+# Runs intercalados de uma vez; acima disso o merge é feito em níveis
+MAX_VIAS = 64
+
+# Bytes do rótulo em cada registro (rótulos de 0 a 2**64 - 1)
+BYTES_ROTULO = 8
+
+
+def impressao_digital(valor: bytes, bits: int = 64) -> int:
+    """Impressão digital (BLAKE2b) de `bits` bits de um valor empacotado."""
+    return int.from_bytes(blake2b(valor, digest_size=bits // 8).digest(), "big")
+
+
+@dataclass
+class ResultadoIndice:
+    # (rótulo repetido, primeiro rótulo com a mesma cifra), na ordem dos rótulos
+    pares: list = field(default_factory=list)
+    # Impressões iguais cujos valores completos eram diferentes
+    falsos_positivos: int = 0
+    # Colisões aceitas só pela impressão (sem valor completo para comparar)
+    nao_verificados: int = 0
+
+
+class FiltroBloom:
+    """Filtro de Bloom sobre impressões digitais já uniformes (não re-hasheia)."""
+
+    __slots__ = ("num_bits", "num_hashes", "_bits")
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = num_hashes
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _posicoes(self, impressao: int):
+        # Hash duplo (Kirsch-Mitzenmacher) a partir das duas metades da impressão
+        h1 = impressao & 0xFFFFFFFF
+        h2 = (impressao >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def adicionar(self, impressao: int) -> bool:
+        """Marca a impressão; retorna True se ela talvez já estivesse no filtro."""
+        presente = True
+        bits = self._bits
+        for p in self._posicoes(impressao):
+            mascara = 1 << (p & 7)
+            if not bits[p >> 3] & mascara:
+                presente = False
+                bits[p >> 3] |= mascara
+        return presente
+
+
+class IndiceColisoes:
+    """
+    Índice de colisões por impressão digital com orçamento de memória configurável.
+
+    O filtro de Bloom e os valores candidatos só existem se adicionar() for
+    usado: quem registra só impressões (adicionar_impressao, como a varredura
+    em shards de src/colisoes.py e mask.equiv_keys_test) usa o orçamento
+    inteiro para os registros em memória.
+
+    adicionar() só guarda o valor completo de uma cifra cuja impressão o
+    filtro já tinha visto, ou seja, a partir da segunda ocorrência: o
+    primeiro membro de cada grupo de colisão nunca tem o valor guardado e
+    precisa de `recuperar` em colisoes() para que o grupo seja confirmado.
+    """
+
+    def __init__(
+        self,
+        orcamento_memoria: int = ORCAMENTO_PADRAO,
+        bits_impressao: int = 64,
+        capacidade_estimada: int = None,
+        diretorio: str = None,
+    ):
+        """
+        Args:
+            orcamento_memoria: bytes para filtro de Bloom (1/4), valores candidatos (1/4)
+                               e registros em memória antes de transbordar (1/2); sem
+                               adicionar(), tudo vai para os registros
+            bits_impressao: 64 ou 128
+            capacidade_estimada: número esperado de entradas (ajusta os hashes do Bloom)
+            diretorio: onde criar a pasta temporária dos runs (padrão: a do sistema)
+        """
+        if bits_impressao not in (64, 128):
+            raise ValueError("bits_impressao deve ser 64 ou 128.")
+
+        self.bits_impressao = bits_impressao
+        self._bytes_impressao = bits_impressao // 8
+        self._tamanho_registro = self._bytes_impressao + BYTES_ROTULO
+        self._orcamento = orcamento_memoria
+
+        if capacidade_estimada:
+            num_hashes = round(8 * (orcamento_memoria // 4) / capacidade_estimada * math.log(2))
+        else:
+            num_hashes = 4
+        self._hashes_bloom = min(16, max(1, num_hashes))
+        # Criado no primeiro adicionar() (_filtro)
+        self._bloom = None
+
+        self._orcamento_candidatos = 0
+        self._memoria_candidatos = 0
+        self._candidatos = {}
+
+        self._max_registros = self._registros_cabem(orcamento_memoria)
+        self._registros = []
+
+        self._diretorio_base = diretorio
+        self._diretorio = None
+        self._runs = []
+        self.entradas = 0
+
+    # -----------------------------------------------------------------
+    # Inserção
+    # -----------------------------------------------------------------
+
+    def impressao(self, valor: bytes) -> int:
+        """Impressão digital do valor empacotado, com o tamanho do índice."""
+        return impressao_digital(valor, self.bits_impressao)
+
+    def _registros_cabem(self, orcamento: int) -> int:
+        """Registros em memória que cabem em `orcamento` bytes (cada um é um bytes numa lista)."""
+        custo_registro = sys.getsizeof(bytes(self._tamanho_registro)) + 8
+        return max(1, orcamento // custo_registro)
+
+    def _filtro(self) -> FiltroBloom:
+        """Filtro de Bloom, criado no primeiro uso com 1/4 do orçamento (e 1/4 para candidatos)."""
+        if self._bloom is None:
+            self._bloom = FiltroBloom(8 * (self._orcamento // 4), self._hashes_bloom)
+            self._orcamento_candidatos = self._orcamento // 4
+            self._max_registros = self._registros_cabem(self._orcamento // 2)
+            if len(self._registros) >= self._max_registros:
+                self._transbordar()
+        return self._bloom
+
+    def adicionar(self, rotulo: int, valor: bytes) -> None:
+        """Registra `valor` (cifra empacotada) sob `rotulo`."""
+        fp = self.impressao(valor)
+        if self._filtro().adicionar(fp):
+            custo = sys.getsizeof(valor) + 64
+            if self._memoria_candidatos + custo <= self._orcamento_candidatos:
+                self._candidatos[rotulo] = bytes(valor)
+                self._memoria_candidatos += custo
+        self.adicionar_impressao(rotulo, fp)
+
+    def adicionar_impressao(self, rotulo: int, impressao: int) -> None:
+        """Registra uma impressão já calculada (ex.: por um processo trabalhador)."""
+        self._registros.append(
+            impressao.to_bytes(self._bytes_impressao, "big")
+            + rotulo.to_bytes(BYTES_ROTULO, "big")
+        )
+        self.entradas += 1
+        if len(self._registros) >= self._max_registros:
+            self._transbordar()
+
+    # -----------------------------------------------------------------
+    # Runs em disco e merge externo
+    # -----------------------------------------------------------------
+
+    def _novo_arquivo(self):
+        if self._diretorio is None:
+            self._diretorio = tempfile.mkdtemp(prefix="indice_colisoes_", dir=self._diretorio_base)
+        return tempfile.NamedTemporaryFile(dir=self._diretorio, suffix=".run", delete=False)
+
+    def _transbordar(self) -> None:
+        """Ordena os registros em memória e grava um run."""
+        self._registros.sort()
+        with self._novo_arquivo() as arquivo:
+            arquivo.write(b"".join(self._registros))
+            self._runs.append(arquivo.name)
+        self._registros = []
+
+    def _ler_run(self, caminho: str):
+        tamanho = self._tamanho_registro
+        leitura = tamanho * max(1, (self._max_registros // MAX_VIAS))
+        with open(caminho, "rb") as arquivo:
+            while True:
+                bloco = arquivo.read(leitura)
+                if not bloco:
+                    return
+                for i in range(0, len(bloco), tamanho):
+                    yield bloco[i : i + tamanho]
+
+    def _reduzir_runs(self) -> None:
+        """Intercala runs em níveis até sobrarem no máximo MAX_VIAS."""
+        while len(self._runs) > MAX_VIAS:
+            grupo, self._runs = self._runs[:MAX_VIAS], self._runs[MAX_VIAS:]
+            with self._novo_arquivo() as arquivo:
+                for registro in heapq.merge(*(self._ler_run(c) for c in grupo)):
+                    arquivo.write(registro)
+                self._runs.append(arquivo.name)
+            for caminho in grupo:
+                os.remove(caminho)
+
+    def grupos(self):
+        """Gera as listas de rótulos (ordenadas) que compartilham uma impressão."""
+        self._registros.sort()
+        self._reduzir_runs()
+        fontes = [self._ler_run(c) for c in self._runs] + [iter(self._registros)]
+
+        n = self._bytes_impressao
+        fp_atual, membros = None, []
+        for registro in heapq.merge(*fontes):
+            fp = registro[:n]
+            if fp != fp_atual:
+                if len(membros) > 1:
+                    yield membros
+                fp_atual, membros = fp, []
+            membros.append(int.from_bytes(registro[n:], "big"))
+        if len(membros) > 1:
+            yield membros
+
+    def colisoes(self, recuperar=None) -> ResultadoIndice:
+        """
+        Confirma os grupos com os valores completos e lista as colisões exatas.
+
+        Args:
+            recuperar: opcional; recebe a lista ordenada dos rótulos que o índice não
+                       guardou e devolve os valores completos na mesma ordem
+        """
+        resultado = ResultadoIndice()
+        pares = []
+        grupos = list(self.grupos())
+
+        # Uma única chamada a `recuperar` com todos os rótulos sem valor guardado
+        faltando = sorted({r for membros in grupos for r in membros if r not in self._candidatos})
+        if recuperar is not None and faltando:
+            recuperados = dict(zip(faltando, recuperar(faltando)))
+        else:
+            recuperados = {}
+
+        for membros in grupos:
+            valores = [self._candidatos.get(r, recuperados.get(r)) for r in membros]
+            if None in valores:
+                # Algum valor completo indisponível: o grupo vale pela impressão
+                pares.extend((rotulo, membros[0]) for rotulo in membros[1:])
+                resultado.nao_verificados += len(membros) - 1
+                continue
+
+            primeiro_por_valor = {}
+            for rotulo, valor in zip(membros, valores):
+                valor = bytes(valor)
+                if valor in primeiro_por_valor:
+                    pares.append((rotulo, primeiro_por_valor[valor]))
+                else:
+                    primeiro_por_valor[valor] = rotulo
+            resultado.falsos_positivos += len(primeiro_por_valor) - 1
+
+        resultado.pares = sorted(pares)
+        return resultado
+
+    # -----------------------------------------------------------------
+    # Estado e limpeza
+    # -----------------------------------------------------------------
+
+    def estatisticas(self) -> dict:
+        return {
+            "entradas": self.entradas,
+            "runs": len(self._runs),
+            "registros_em_memoria": len(self._registros),
+            "candidatos": len(self._candidatos),
+            "hashes_bloom": self._hashes_bloom,
+            "filtro_bloom": self._bloom is not None,
+        }
+
+    def fechar(self) -> None:
+        """Remove os runs gravados em disco."""
+        if self._diretorio is not None:
+            shutil.rmtree(self._diretorio, ignore_errors=True)
+            self._diretorio = None
+        self._runs = []
+        self._registros = []
+        self._candidatos = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
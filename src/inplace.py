@@ -0,0 +1,303 @@
+# src/inplace.py
+"""
+Rodadas de GEN/ENC/DEC sem listas intermediárias: dois buffers pré-alocados.
+
+Em src/referencia.py cada etapa devolve uma lista nova do tamanho do estado
+(bits[:] na S-Box, a lista da transposição, o resultado de xor_listas,
+estado[:] no feedback e as fatias da rotação em GEN). PipelineInPlace
+aloca uma vez, por tamanho de estado, dois bytearrays com um bit (0/1) por
+byte; cada etapa lê de um buffer, escreve no outro e os papéis se invertem:
+
+- whitening / constante: laço de XOR escrevendo no outro buffer; o padding
+  da mensagem (zeros) é lido como 0 sem montar a mensagem ajustada
+- S-Box: índice de 8 bits montado dos 8 bytes e a saída copiada de uma
+  tabela de bytes pré-calculada (nada é criado por byte)
+- difusão: XOR prefixo/sufixo (e as reversões) em um laço
+- transposição: para cada coluna, uma cópia estridente entre memoryviews
+  (saida[início da coluna:] = estado[c::4] e o inverso)
+- rotação: duas cópias entre memoryviews
+
+Depois da primeira chamada de um tamanho, enc/dec/gen com `saida` não
+alocam nada proporcional ao estado: só objetos pequenos e temporários do
+interpretador (iteradores, fatias de memoryview), liberados na hora.
+tests/test_inplace.py verifica com tracemalloc que nem a memória retida
+nem o pico crescem com o número de chamadas.
+
+Também é o backend "inplace" de src/nucleo.py: gen_bits/enc_bits/dec_bits
+usam um PipelineInPlace por tamanho em cada thread e só alocam a lista
+devolvida.
+
+Uso:
+    pipeline = PipelineInPlace(len(K))
+    saida = bytearray(len(K))
+    pipeline.enc(K, M, saida=saida)     # saida recebe ENC(K, M) (um bit por byte)
+    pipeline.dec(K, saida)              # lista com os bits de M (com padding)
+"""
+import threading
+from functools import lru_cache
+
+from src.gen import gerar_bits_tft
+from src.tabelas import tabelas_bits
+
+NUM_COLUNAS = 4
+
+# Tamanhos de estado com pipeline guardado em cada thread (backend)
+TAMANHO_CACHE = 8
+
+
+@lru_cache(maxsize=None)
+def _tabelas_bytes(inversa: bool = False) -> tuple[tuple, tuple]:
+    """Tabelas de tabelas_bits com cada entrada em bytes (cópia direta para o bytearray)."""
+    tabela_byte, tabela_nibble = tabelas_bits(inversa)
+    return tuple(map(bytes, tabela_byte)), tuple(map(bytes, tabela_nibble))
+
+
+@lru_cache(maxsize=64)
+def _bits_tft(champ_index: int, stars_val: int) -> bytes:
+    """gerar_bits_tft em bytes, guardado para não refazer a lista a cada GEN."""
+    return bytes(gerar_bits_tft(champ_index + 1, stars_val))
+
+
+@lru_cache(maxsize=256)
+def _bits_constante(champ_index: int, stars_val: int, round_num: int) -> bytes:
+    """Os 8 bits da constante da rodada de GEN."""
+    constante = (champ_index * (round_num + 1) + stars_val) % 255
+    return bytes((constante >> (7 - i)) & 1 for i in range(8))
+
+
+class PipelineInPlace:
+    """Dois buffers de `tamanho` bits reaproveitados por todas as etapas e chamadas."""
+
+    __slots__ = ("tamanho", "_buffers", "_visoes", "_colunas")
+
+    def __init__(self, tamanho: int, num_colunas: int = NUM_COLUNAS):
+        self.tamanho = tamanho
+        self._buffers = (bytearray(tamanho), bytearray(tamanho))
+        self._visoes = tuple(memoryview(b) for b in self._buffers)
+        # (coluna, início e fim do trecho dela na saída da transposição)
+        colunas = []
+        inicio = 0
+        for coluna in range(num_colunas):
+            fim = inicio + max(0, (tamanho - coluna + num_colunas - 1) // num_colunas)
+            colunas.append((coluna, inicio, fim))
+            inicio = fim
+        self._colunas = tuple(colunas)
+
+    # -----------------------------------------------------------------
+    # Etapas: leem de `origem` e escrevem em `destino` (índices de _buffers)
+    # -----------------------------------------------------------------
+
+    def _sbox(self, origem: int, destino: int, inversa: bool = False) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        tabela, tabela_nibble = _tabelas_bytes(inversa)
+        tamanho = self.tamanho
+        fim_bytes = tamanho - tamanho % 8
+
+        for i in range(0, fim_bytes, 8):
+            saida[i : i + 8] = tabela[
+                (entrada[i] << 7) | (entrada[i + 1] << 6) | (entrada[i + 2] << 5) | (entrada[i + 3] << 4)
+                | (entrada[i + 4] << 3) | (entrada[i + 5] << 2) | (entrada[i + 6] << 1) | entrada[i + 7]
+            ]
+
+        i = fim_bytes
+        if i + 4 <= tamanho:
+            saida[i : i + 4] = tabela_nibble[
+                (entrada[i] << 3) | (entrada[i + 1] << 2) | (entrada[i + 2] << 1) | entrada[i + 3]
+            ]
+            i += 4
+        # Bits que não formam um nibble completo ficam intactos
+        for j in range(i, tamanho):
+            saida[j] = entrada[j]
+
+    def _difusao_ida(self, origem: int, destino: int) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        acumulado = 0
+        for i in range(self.tamanho):
+            acumulado ^= entrada[i]
+            saida[i] = acumulado
+
+    def _difusao_volta(self, origem: int, destino: int) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        acumulado = 0
+        for i in range(self.tamanho - 1, -1, -1):
+            acumulado ^= entrada[i]
+            saida[i] = acumulado
+
+    def _reverter_difusao_ida(self, origem: int, destino: int) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        anterior = 0
+        for i in range(self.tamanho):
+            atual = entrada[i]
+            saida[i] = atual ^ anterior
+            anterior = atual
+
+    def _reverter_difusao_volta(self, origem: int, destino: int) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        seguinte = 0
+        for i in range(self.tamanho - 1, -1, -1):
+            atual = entrada[i]
+            saida[i] = atual ^ seguinte
+            seguinte = atual
+
+    def _transpor(self, origem: int, destino: int, inversa: bool = False) -> None:
+        entrada, saida = self._visoes[origem], self._visoes[destino]
+        passo = len(self._colunas)
+        for coluna, inicio, fim in self._colunas:
+            if inversa:
+                saida[coluna::passo] = entrada[inicio:fim]
+            else:
+                saida[inicio:fim] = entrada[coluna::passo]
+
+    def _xor(self, origem: int, destino: int, bits) -> None:
+        """destino = origem ⊕ bits; posições além de len(bits) recebem origem (padding 0)."""
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        limite = min(len(bits), self.tamanho)
+        for i in range(limite):
+            saida[i] = entrada[i] ^ bits[i]
+        for i in range(limite, self.tamanho):
+            saida[i] = entrada[i]
+
+    def _carregar(self, destino: int, bits) -> None:
+        """Copia `bits` para o buffer, com o ajuste de tamanho de ajustar_tamanho_msg."""
+        buffer = self._buffers[destino]
+        limite = min(len(bits), self.tamanho)
+        for i in range(limite):
+            buffer[i] = bits[i]
+        for i in range(limite, self.tamanho):
+            buffer[i] = 0
+
+    def _entregar(self, atual: int, saida):
+        if saida is None:
+            return list(self._buffers[atual])
+        saida[:] = self._buffers[atual]
+        return saida
+
+    def _verificar_chave(self, K) -> None:
+        if len(K) != self.tamanho:
+            raise ValueError(
+                f"Erro de tamanho: a chave deve ter {self.tamanho} bits (recebido {len(K)})."
+            )
+
+    # -----------------------------------------------------------------
+    # GEN / ENC / DEC
+    # -----------------------------------------------------------------
+
+    def enc(self, K, M, rodadas: int = 2, saida=None):
+        """
+        ENC dos bits M (ajustados ao tamanho de K) com a chave K.
+
+        K e M: sequências de bits (lista, bytes/bytearray 0/1). Com `saida`
+        (bytearray ou lista de len(K) posições) o resultado é escrito nela e
+        ela é devolvida; sem, devolve uma lista nova.
+        """
+        self._verificar_chave(K)
+        # Whitening: a mensagem vai para o buffer 1 e o XOR com K para o 0
+        self._carregar(1, M)
+        self._xor(1, 0, K)
+        for _ in range(rodadas):
+            self._sbox(0, 1)
+            self._difusao_ida(1, 0)
+            self._difusao_volta(0, 1)
+            self._transpor(1, 0)
+        return self._entregar(0, saida)
+
+    def dec(self, K, C, rodadas: int = 2, saida=None):
+        """DEC de C (len(C) == tamanho) com a chave K; devolve os bits da mensagem (com o padding)."""
+        if len(C) != self.tamanho:
+            raise ValueError(
+                f"Erro de tamanho: a cifra deve ter {self.tamanho} bits (recebido {len(C)})."
+            )
+        self._carregar(0, C)
+        for _ in range(rodadas):
+            self._transpor(0, 1, inversa=True)
+            self._reverter_difusao_volta(1, 0)
+            self._reverter_difusao_ida(0, 1)
+            self._sbox(1, 0, inversa=True)
+        self._xor(0, 1, K)
+        return self._entregar(1, saida)
+
+    def gen(self, seed_bits, champ_index: int, stars_val: int, rodadas: int = 4, saida=None):
+        """Agenda de chave de src.gen.GEN sobre uma seed de tamanho / 4 bits."""
+        tamanho = self.tamanho
+        tamanho_seed = len(seed_bits)
+        if 4 * tamanho_seed != tamanho:
+            raise ValueError(
+                f"Erro de tamanho: a seed deve ter {tamanho // 4} bits (recebido {tamanho_seed})."
+            )
+
+        # Combinação com o campeão e expansão: estado[j] = seed[j % s] ⊕ tft[(j % s) % t]
+        tft = _bits_tft(champ_index, stars_val)
+        tamanho_tft = len(tft)
+        buffer = self._buffers[0]
+        for j in range(tamanho_seed):
+            buffer[j] = seed_bits[j] ^ tft[j % tamanho_tft]
+        visao = self._visoes[0]
+        for inicio in range(tamanho_seed, tamanho, tamanho_seed):
+            visao[inicio : inicio + tamanho_seed] = visao[:tamanho_seed]
+
+        atual = 0
+        for round_num in range(rodadas):
+            self._xor_constante(atual, 1 - atual, _bits_constante(champ_index, stars_val, round_num))
+            self._sbox(1 - atual, atual)
+            self._rotacionar(atual, 1 - atual, stars_val * 7 + round_num * 11)
+            self._feedback(1 - atual, atual)
+        return self._entregar(atual, saida)
+
+    def _xor_constante(self, origem: int, destino: int, constante: bytes) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        for i in range(self.tamanho):
+            saida[i] = entrada[i] ^ constante[i & 7]
+
+    def _rotacionar(self, origem: int, destino: int, n: int) -> None:
+        entrada, saida = self._visoes[origem], self._visoes[destino]
+        tamanho = self.tamanho
+        n %= tamanho
+        saida[: tamanho - n] = entrada[n:]
+        saida[tamanho - n :] = entrada[:n]
+
+    def _feedback(self, origem: int, destino: int) -> None:
+        entrada, saida = self._buffers[origem], self._buffers[destino]
+        anterior = entrada[self.tamanho - 1]
+        for i in range(self.tamanho):
+            atual = entrada[i]
+            saida[i] = atual ^ anterior
+            anterior = atual
+
+
+# ---------------------------------------------------------------------
+# Backend "inplace" de src/nucleo.py
+# ---------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def pipeline(tamanho: int) -> PipelineInPlace:
+    """PipelineInPlace de `tamanho` bits desta thread (criado no primeiro uso)."""
+    cache = getattr(_local, "pipelines", None)
+    if cache is None:
+        cache = _local.pipelines = {}
+    atual = cache.get(tamanho)
+    if atual is None:
+        if len(cache) >= TAMANHO_CACHE:
+            del cache[next(iter(cache))]
+        atual = cache[tamanho] = PipelineInPlace(tamanho)
+    return atual
+
+
+def gen_bits(seed_bits: list[int], champ_index: int, stars_val: int, rodadas: int = 4) -> list[int]:
+    if not seed_bits:
+        return []
+    return pipeline(4 * len(seed_bits)).gen(seed_bits, champ_index, stars_val, rodadas)
+
+
+def enc_bits(K: list[int], M: list[int], rodadas: int = 2) -> list[int]:
+    if not K:
+        return []
+    return pipeline(len(K)).enc(K, M, rodadas)
+
+
+def dec_bits(K: list[int], C: list[int], rodadas: int = 2) -> list[int]:
+    # Como no backend packed, o estado tem o tamanho do criptograma
+    if not C:
+        return []
+    return pipeline(len(C)).dec(K, C, rodadas)
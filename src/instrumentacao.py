@@ -0,0 +1,120 @@
+# src/instrumentacao.py
+"""
+Instrumentação opcional por etapa de ENC, DEC e GEN (src/enc.py, src/dec.py, src/gen.py).
+
+Desligada por padrão. Quando ligada, cada etapa registra o número de
+chamadas e os nanossegundos acumulados, separados por função, rodada e etapa:
+
+- ENC/DEC: codec (texto <-> bits), whitening e, em cada rodada, sbox,
+  difusao_ida, difusao_volta e transposicao
+- GEN: codec, expansao e, em cada rodada, constante, sbox, rotacao e feedback
+
+O codec é medido nas APIs de texto (src/gen.py, src/enc.py, src/dec.py). As
+demais etapas só existem separadas no backend "referencia"
+(src/referencia.py), já que os outros fundem as etapas; por isso, enquanto a
+instrumentação está ligada, src/nucleo.py manda GEN/ENC/DEC para ele
+qualquer que seja o backend selecionado. Os tempos por etapa são, então, os
+da implementação de referência, não os do backend selecionado, e snapshot()
+diz isso: cada etapa traz o backend que atendeu as chamadas medidas.
+
+Custo desligada: cada função lê a flag `ativo` uma vez para uma variável
+local e cada etapa testa essa variável (um teste de booleano), sem chamadas
+de função nem leitura de relógio.
+
+Uso:
+    from src import instrumentacao
+    with instrumentacao.medindo():
+        ENC(K, "mensagem")
+    instrumentacao.snapshot()
+    # {'ENC': {'codec': {'chamadas': 1, 'ns': 5120, 'backend': 'referencia'}, 'r1/sbox': {...}, ...}}
+    instrumentacao.resumo("ENC")  # ns por etapa somando as rodadas
+"""
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+# Lida pelas funções instrumentadas no início de cada chamada
+ativo = False
+
+# (função, etapa) -> [chamadas, ns acumulados]; etapa de rodada = "r<n>/<nome>"
+_contadores = {}
+# função -> nomes dos backends que atenderam as chamadas medidas (src/nucleo.py)
+_backends = {}
+
+
+def ativar() -> None:
+    global ativo
+    ativo = True
+
+
+def desativar() -> None:
+    global ativo
+    ativo = False
+
+
+def limpar() -> None:
+    """Zera todos os contadores."""
+    _contadores.clear()
+    _backends.clear()
+
+
+@contextmanager
+def medindo(zerar: bool = True):
+    """Liga a instrumentação dentro do bloco (zerando os contadores antes, por padrão)."""
+    global ativo
+    anterior = ativo
+    if zerar:
+        limpar()
+    ativo = True
+    try:
+        yield
+    finally:
+        ativo = anterior
+
+
+def agora() -> int:
+    return perf_counter_ns()
+
+
+def marcar(funcao: str, etapa: str, inicio: int, rodada: int = None) -> int:
+    """
+    Registra o tempo desde `inicio` para a etapa e retorna o instante atual,
+    que serve de início para a etapa seguinte.
+    """
+    fim = perf_counter_ns()
+    if rodada is not None:
+        etapa = f"r{rodada}/{etapa}"
+    contador = _contadores.get((funcao, etapa))
+    if contador is None:
+        contador = _contadores[(funcao, etapa)] = [0, 0]
+    contador[0] += 1
+    contador[1] += fim - inicio
+    return fim
+
+
+def registrar_backend(funcao: str, nome: str) -> None:
+    """Anota o backend que atendeu uma chamada de `funcao` durante a medição."""
+    _backends.setdefault(funcao, set()).add(nome)
+
+
+def snapshot() -> dict:
+    """
+    Cópia dos contadores: {função: {etapa: {"chamadas": n, "ns": t, "backend": nome}}}.
+
+    "backend" é o backend que executou as chamadas medidas ("referencia"
+    com src/nucleo.py; nomes separados por vírgula se houve mais de um).
+    """
+    resultado = {}
+    for (funcao, etapa), (chamadas, ns) in sorted(_contadores.items()):
+        backend = ",".join(sorted(_backends.get(funcao, ()))) or None
+        resultado.setdefault(funcao, {})[etapa] = {"chamadas": chamadas, "ns": ns, "backend": backend}
+    return resultado
+
+
+def resumo(funcao: str) -> dict:
+    """Nanossegundos por etapa de `funcao`, somando todas as rodadas."""
+    totais = {}
+    for (nome, etapa), (_, ns) in _contadores.items():
+        if nome == funcao:
+            etapa = etapa.split("/", 1)[-1]
+            totais[etapa] = totais.get(etapa, 0) + ns
+    return totais
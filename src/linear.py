@@ -0,0 +1,151 @@
+# src/linear.py
+"""
+Camada linear composta de ENC/DEC sobre GF(2), compilada uma vez por tamanho de chave.
+
+Em cada rodada de ENC, a única etapa não-linear é a S-Box. A difusão de ida
+(XOR prefixo), a de volta (XOR sufixo) e a transposição colunar são lineares
+sobre GF(2), então as três juntas formam uma única matriz n x n.
+
+O "plano linear" guarda essa matriz na forma do Método dos Quatro Russos:
+para cada byte do estado empacotado há uma tabela de 256 entradas com o XOR
+das colunas correspondentes aos bits ligados daquele byte. Aplicar a matriz
+vira uma passada com uma busca e um XOR por byte. O plano inverso faz o mesmo
+para as três etapas desfeitas em DEC.
+
+Convenção do estado empacotado: a mesma de src/packed.py
+(bit 0 da lista = bit mais significativo do inteiro).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+# src/packed.py usa os planos deste módulo, então a referência é ao módulo (import circular)
+from src import packed
+
+# Acima deste tamanho as etapas são aplicadas em separado. Um plano guarda
+# n / 8 tabelas de 256 ints de n bits: ~32 * n * (n / 8 + 28) bytes, ou seja,
+# ~0.45 MB para 256 bits, ~1.4 MB para 512, ~4.7 MB para 1024 e ~18 MB para
+# 2048 (compilado em ~0.06 s). A partir de ~768 bits a busca em tabelas com
+# ints tão grandes já não é mais rápida que as etapas separadas de
+# src/packed.py, então planos maiores só custariam memória.
+TAMANHO_MAXIMO_PLANO = 512
+
+# Memória (bytes) somada dos planos de ENC e DEC guardados em cache. O cache é
+# por processo (cada worker de paralelo/colisoes/mask --jobs tem o seu), então
+# o limite é pelo tamanho real dos planos, não pela quantidade.
+ORCAMENTO_CACHE = 8 * 1024 * 1024
+
+
+class PlanoLinear:
+    """Matriz n x n sobre GF(2) aplicada a um estado empacotado com tabelas por byte."""
+
+    __slots__ = ("tamanho", "memoria", "_deslocamento", "_num_bytes", "_tabelas")
+
+    def __init__(self, tamanho: int, colunas: list[int]):
+        """
+        Args:
+            tamanho: número de bits do estado (n)
+            colunas: colunas[i] é a imagem (empacotada) do estado que só tem o bit i da lista ligado
+        """
+        self.tamanho = tamanho
+        # O estado é alinhado à esquerda em bytes; os bits de padding têm coluna nula
+        self._deslocamento = -tamanho % 8
+        self._num_bytes = (tamanho + 7) // 8
+
+        tabelas = []
+        for j in range(self._num_bytes):
+            tabela = [0] * 256
+            for posicao in range(8):
+                indice = 8 * j + 7 - posicao
+                if indice >= tamanho:
+                    continue
+                bit = 1 << posicao
+                coluna = colunas[indice]
+                # Todas as combinações com este bit = combinações anteriores XOR a coluna
+                for v in range(bit):
+                    tabela[v | bit] = tabela[v] ^ coluna
+            tabelas.append(tabela)
+        self._tabelas = tabelas
+        # Bytes ocupados pelas tabelas e pelos ints delas (para o orçamento do cache)
+        self.memoria = sum(sys.getsizeof(tabela) + sum(map(sys.getsizeof, tabela)) for tabela in tabelas)
+
+    def tabela(self, j: int) -> list[int]:
+        """Tabela do byte j do estado: imagem de cada valor (0-255) desse byte."""
+        return self._tabelas[j]
+
+    def aplicar(self, valor: int) -> int:
+        """Multiplica a matriz pelo estado empacotado `valor`."""
+        dados = (valor << self._deslocamento).to_bytes(self._num_bytes, "big")
+        saida = 0
+        for tabela, byte in zip(self._tabelas, dados):
+            saida ^= tabela[byte]
+        return saida
+
+
+def _etapas_enc(valor: int, tamanho: int) -> int:
+    """Difusão de ida → difusão de volta → transposição (parte linear de uma rodada de ENC)."""
+    valor = packed.difusao_ida_int(valor, tamanho)
+    valor = packed.difusao_volta_int(valor, tamanho)
+    return packed.transposicao_int(valor, tamanho)
+
+
+def _etapas_dec(valor: int, tamanho: int) -> int:
+    """Inverso de _etapas_enc, na ordem usada por DEC."""
+    valor = packed.reverter_transposicao_int(valor, tamanho)
+    valor = packed.reverter_difusao_volta_int(valor, tamanho)
+    return packed.reverter_difusao_ida_int(valor)
+
+
+def _compilar(etapas, tamanho: int) -> PlanoLinear:
+    """Monta o plano avaliando as etapas em cada vetor unitário (uma coluna por bit)."""
+    colunas = [etapas(1 << (tamanho - 1 - i), tamanho) for i in range(tamanho)]
+    return PlanoLinear(tamanho, colunas)
+
+
+# (direção, tamanho) -> PlanoLinear, do menos para o mais recente
+_planos = OrderedDict()
+_trava = threading.Lock()
+
+
+def _plano(direcao: str, etapas, tamanho: int) -> PlanoLinear:
+    """Plano do cache LRU compartilhado por ENC e DEC, limitado por ORCAMENTO_CACHE bytes."""
+    chave = (direcao, tamanho)
+    with _trava:
+        plano = _planos.get(chave)
+        if plano is not None:
+            _planos.move_to_end(chave)
+            return plano
+
+    # Compila fora da trava para não serializar tamanhos diferentes
+    plano = _compilar(etapas, tamanho)
+
+    with _trava:
+        _planos[chave] = plano
+        _planos.move_to_end(chave)
+        # O plano recém-compilado fica mesmo que sozinho passe do orçamento
+        ocupado = sum(p.memoria for p in _planos.values())
+        while ocupado > ORCAMENTO_CACHE and len(_planos) > 1:
+            ocupado -= _planos.popitem(last=False)[1].memoria
+    return plano
+
+
+def plano_enc(tamanho: int) -> PlanoLinear:
+    """Plano linear de uma rodada de ENC para chaves de `tamanho` bits."""
+    return _plano("enc", _etapas_enc, tamanho)
+
+
+def plano_dec(tamanho: int) -> PlanoLinear:
+    """Plano linear inverso (uma rodada de DEC) para chaves de `tamanho` bits."""
+    return _plano("dec", _etapas_dec, tamanho)
+
+
+def memoria_cache() -> int:
+    """Bytes ocupados pelos planos em cache."""
+    with _trava:
+        return sum(plano.memoria for plano in _planos.values())
+
+
+def limpar_cache() -> None:
+    """Descarta todos os planos compilados."""
+    with _trava:
+        _planos.clear()
@@ -6,19 +6,36 @@ Testbench de qualidade para GEN/ENC/DEC quando GEN espera seed como lista de bit
 Uso rÃ¡pido:
   python testbench_crypto_bits.py --impl ./minha_impl.py --seed-bits 0101
   python testbench_crypto_bits.py --impl pacote.alg --seed-len 8 --runs 6000
+  python testbench_crypto_bits.py --impl ./minha_impl.py --jobs 8
+
+Com --jobs N, as tentativas de difusão/confusão e as seeds do teste de chaves
+equivalentes são divididas em shards de tamanho fixo (TRIALS_PER_SHARD),
+executados por N processos. Cada shard tem seu próprio random.Random
+(substream(base, shard)), então os resultados são idênticos para qualquer N,
+inclusive N = 1. O teste de tempo roda antes de o pool existir, sozinho.
 """
 
 from __future__ import annotations
 import argparse
 import importlib
 import importlib.util
+import multiprocessing
 import os
 import random
+import sys
 import time
-from collections import Counter
 from dataclasses import dataclass
 from typing import Callable, List
 
+if not __package__:
+    # Executado como script: torna o pacote src importável
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.indice import ORCAMENTO_PADRAO, IndiceColisoes, impressao_digital
+
+# Tentativas (ou seeds) por shard; não depende de --jobs
+TRIALS_PER_SHARD = 250
+
 
 # ---------------------------------------------------------------------
 # Carregamento dinÃ¢mico de GEN, ENC, DEC
@@ -51,6 +68,11 @@ def get_funcs(mod):
 Bits = List[int]  # lista de 0/1
 
 
+def substream(base: int, shard: int) -> random.Random:
+    """Gerador próprio do shard: depende só da semente base e do número do shard."""
+    return random.Random(f"{base}:{shard}")
+
+
 def rand_bits(n: int, rng: random.Random) -> Bits:
     return [rng.getrandbits(1) for _ in range(n)]
 
@@ -65,6 +87,12 @@ def hamming(a: Bits, b: Bits) -> int:
     return sum(x ^ y for x, y in zip(a, b))
 
 
+def pack_bits(bits: Bits) -> bytes:
+    """Empacota a lista de bits em bytes (com o tamanho, para distinguir cifras)."""
+    valor = int("".join(map(str, bits)), 2) if bits else 0
+    return len(bits).to_bytes(4, "big") + valor.to_bytes((len(bits) + 7) // 8, "big")
+
+
 # ---------------------------------------------------------------------
 # Resultados
 # ---------------------------------------------------------------------
@@ -82,6 +110,19 @@ class StatRes:
     min_: int
     max_: int
     trials: int
+    total: int = 0  # soma das mudanças: shards combinados sem erro de arredondamento
+
+    @classmethod
+    def from_changes(cls, changes: List[int]) -> "StatRes":
+        total = sum(changes)
+        return cls(total / len(changes), min(changes), max(changes), len(changes), total)
+
+    @classmethod
+    def merge(cls, parts: List["StatRes"]) -> "StatRes":
+        """Combina shards: o mesmo resultado de from_changes sobre todas as mudanças."""
+        total = sum(p.total for p in parts)
+        trials = sum(p.trials for p in parts)
+        return cls(total / trials, min(p.min_ for p in parts), max(p.max_ for p in parts), trials, total)
 
 
 @dataclass
@@ -119,30 +160,91 @@ def time_test(GEN, ENC, DEC, seed: Bits, runs=4000) -> TimeRes:
     )
 
 
-def equiv_keys_test(GEN, ENC, template_seed: Bits, n_keys=300) -> EquivRes:
-    n = len(GEN(template_seed))               # tamanho de K â‡’ tamanho de M
-    rng = random.Random(999)
-    M = rand_bits(n, rng)
+def shards(total: int):
+    """(shard, tentativas) de cada shard para `total` tentativas."""
+    return [(i, min(TRIALS_PER_SHARD, total - inicio))
+            for i, inicio in enumerate(range(0, total, TRIALS_PER_SHARD))]
+
+
+# Processos do pool: GEN, ENC, DEC carregados uma vez por _init_worker
+_worker_funcs = None
+
+
+def _init_worker(impl: str):
+    global _worker_funcs
+    _worker_funcs = get_funcs(load_module(impl))
+
+
+def _run_shard(task):
+    func, args = task
+    GEN, ENC, _ = _worker_funcs
+    return func(GEN, ENC, *args)
 
-    ciphertexts = []
-    for _ in range(n_keys):
-        seed_i = rand_bits(len(template_seed), rng)
-        K_i = GEN(seed_i)
-        ciphertexts.append(tuple(ENC(K_i, M)))
 
-    counts = Counter(ciphertexts)
-    collisions = sum(c - 1 for c in counts.values() if c > 1)
+def worker_pool(impl: str, jobs: int):
+    """Pool de `jobs` processos, cada um com sua cópia da implementação `impl`."""
+    return multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(impl,))
+
+
+def run_shards(GEN, ENC, func, tasks, pool=None) -> list:
+    """func(GEN, ENC, *args) para cada args de `tasks`, em ordem (no pool, se houver)."""
+    if pool is None:
+        return [func(GEN, ENC, *args) for args in tasks]
+    return pool.map(_run_shard, [(func, args) for args in tasks], chunksize=1)
+
+
+def _equiv_seeds(seed_len: int, shard: int, count: int):
+    rng = substream(999, shard)
+    for _ in range(count):
+        yield rand_bits(seed_len, rng)
+
+
+def equiv_shard(GEN, ENC, seed_len: int, M: Bits, shard: int, count: int, fp_bits: int) -> List[int]:
+    """Impressões digitais das cifras de M sob as chaves do shard."""
+    return [impressao_digital(pack_bits(ENC(GEN(seed_i), M)), fp_bits)
+            for seed_i in _equiv_seeds(seed_len, shard, count)]
+
+
+def equiv_keys_test(GEN, ENC, template_seed: Bits, n_keys=300,
+                    mem_budget=ORCAMENTO_PADRAO, index=None, pool=None) -> EquivRes:
+    n = len(GEN(template_seed))               # tamanho de K â‡’ tamanho de M
+    M = rand_bits(n, random.Random(999))
+    seed_len = len(template_seed)
+
+    # Só impressões das cifras ficam em memória (src/indice.py); os shards
+    # devolvem impressões e o índice encontra as colisões entre todos eles
+    index = index or IndiceColisoes(mem_budget, capacidade_estimada=n_keys)
+    with index:
+        tasks = [(seed_len, M, shard, count, index.bits_impressao) for shard, count in shards(n_keys)]
+        for (shard, _), fps in zip(shards(n_keys), run_shards(GEN, ENC, equiv_shard, tasks, pool)):
+            for j, fp in enumerate(fps):
+                index.adicionar_impressao(shard * TRIALS_PER_SHARD + j, fp)
+
+        def recompute(wanted):
+            # Refaz as seeds dos shards pedidos para recalcular as cifras
+            out = []
+            for shard, count in shards(n_keys):
+                inicio = shard * TRIALS_PER_SHARD
+                pedidos = [i - inicio for i in wanted if inicio <= i < inicio + count]
+                if not pedidos:
+                    continue
+                seeds = list(_equiv_seeds(seed_len, shard, pedidos[-1] + 1))
+                out.extend(pack_bits(ENC(GEN(seeds[j]), M)) for j in pedidos)
+            return out
+
+        collisions = len(index.colisoes(recuperar=recompute).pares)
+
     return EquivRes(
         keys=n_keys,
         collisions=collisions,
-        unique_ciphertexts=len(counts),
+        unique_ciphertexts=n_keys - collisions,
     )
 
 
-def diffusion_test(GEN, ENC, seed: Bits, trials=300) -> StatRes:
+def diffusion_shard(GEN, ENC, seed: Bits, shard: int, trials: int) -> StatRes:
     K = GEN(seed)
     n = len(K)
-    rng = random.Random(321)
+    rng = substream(321, shard)
     changes = []
 
     for _ in range(trials):
@@ -152,15 +254,20 @@ def diffusion_test(GEN, ENC, seed: Bits, trials=300) -> StatRes:
         C1 = ENC(K, flip_bit(M0, idx))
         changes.append(hamming(C0, C1))
 
-    return StatRes(sum(changes)/trials, min(changes), max(changes), trials)
+    return StatRes.from_changes(changes)
+
+
+def diffusion_test(GEN, ENC, seed: Bits, trials=300, pool=None) -> StatRes:
+    tasks = [(seed, shard, count) for shard, count in shards(trials)]
+    return StatRes.merge(run_shards(GEN, ENC, diffusion_shard, tasks, pool))
 
 
-def confusion_test(GEN, ENC, seed: Bits, trials=300) -> StatRes:
+def confusion_shard(GEN, ENC, seed: Bits, shard: int, trials: int) -> StatRes:
     K0 = GEN(seed)
     n = len(K0)
-    rng = random.Random(777)
-    M = rand_bits(n, rng)
+    M = rand_bits(n, random.Random(777))
     C0 = ENC(K0, M)
+    rng = substream(777, shard)
 
     changes = []
     for _ in range(trials):
@@ -169,7 +276,12 @@ def confusion_test(GEN, ENC, seed: Bits, trials=300) -> StatRes:
         C1 = ENC(GEN(seed2), M)
         changes.append(hamming(C0, C1))
 
-    return StatRes(sum(changes)/trials, min(changes), max(changes), trials)
+    return StatRes.from_changes(changes)
+
+
+def confusion_test(GEN, ENC, seed: Bits, trials=300, pool=None) -> StatRes:
+    tasks = [(seed, shard, count) for shard, count in shards(trials)]
+    return StatRes.merge(run_shards(GEN, ENC, confusion_shard, tasks, pool))
 
 
 # ---------------------------------------------------------------------
@@ -188,6 +300,10 @@ def parse_args():
     ap.add_argument("--runs", type=int, default=4000, help="Runs para tempo (default 4000)")
     ap.add_argument("--trials", type=int, default=3000, help="Trials difusÃ£o/confusÃ£o (default 300)")
     ap.add_argument("--equiv-keys", type=int, default=3000, help="Seeds para teste de chaves equivalentes")
+    ap.add_argument("--equiv-mem", type=int, default=ORCAMENTO_PADRAO >> 20,
+                    help="Orçamento de memória (MB) do índice de colisões (default 64)")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Processos para os testes 2-4 (mesmos resultados para qualquer N)")
     return ap.parse_args()
 
 
@@ -216,17 +332,26 @@ def main():
     print("1) Tempo (Âµs por chamada)  runs=", t.runs)
     print(f"   ENC: {t.enc_us:.3f}   DEC: {t.dec_us:.3f}\n")
 
-    eq = equiv_keys_test(GEN, ENC, seed, n_keys=args.equiv_keys)
+    # O teste de tempo já terminou: só agora os processos do pool são criados
+    pool = worker_pool(args.impl, args.jobs) if args.jobs > 1 else None
+    try:
+        eq = equiv_keys_test(GEN, ENC, seed, n_keys=args.equiv_keys,
+                             mem_budget=args.equiv_mem << 20, pool=pool)
+        d = diffusion_test(GEN, ENC, seed, trials=args.trials, pool=pool)
+        c = confusion_test(GEN, ENC, seed, trials=args.trials, pool=pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
     print("2) Chaves equivalentes (M fixa)")
     print(f"   Keys testadas.........: {eq.keys}")
     print(f"   Ciphertexts Ãºnicos....: {eq.unique_ciphertexts}")
     print(f"   ColisÃµes observadas...: {eq.collisions}\n")
 
-    d = diffusion_test(GEN, ENC, seed, trials=args.trials)
     print("3) DifusÃ£o (flip 1 bit em M)")
     print(f"   MÃ©dia/min/mÃ¡x bits em C: {d.mean:.2f}/{d.min_}/{d.max_}  trials={d.trials}\n")
 
-    c = confusion_test(GEN, ENC, seed, trials=args.trials)
     print("4) ConfusÃ£o (flip 1 bit na seed)")
     print(f"   MÃ©dia/min/mÃ¡x bits em C: {c.mean:.2f}/{c.min_}/{c.max_}  trials={c.trials}\n")
 
@@ -0,0 +1,220 @@
+# src/nucleo.py
+"""
+Núcleo único de GEN/ENC/DEC com backends selecionáveis.
+
+As APIs públicas (src/gen.py + src/enc.py + src/dec.py com seed em texto e
+4 rodadas de GEN, src/main.py com seed em lista de bits e 3 rodadas) só
+convertem a entrada e chamam as funções deste módulo, passando o número de
+rodadas. O trabalho é feito pelo backend selecionado:
+
+- "referencia": listas de bits, uma etapa por vez (src/referencia.py);
+  é a implementação de referência e a única com instrumentação por etapa
+- "packed": estado empacotado em um int do Python (src/packed.py)
+- "numpy": ENC/DEC em bytes com NumPy (src/batch.py; GEN usa o packed)
+- "inplace": listas de bits sem cópias por etapa, em dois buffers
+  pré-alocados e reaproveitados (src/inplace.py)
+
+Todos produzem exatamente os mesmos bits. Em dec_bits com criptograma de
+tamanho diferente da chave, o resultado é o do DEC original (rodadas no
+tamanho de C, XOR final com K truncado no menor dos dois, como o zip de
+xor_listas): a chave é ajustada aqui antes de chegar ao backend, que só vê
+len(K) == len(C). A seleção vem, em ordem, de
+selecionar(nome), da variável de ambiente TFT_BACKEND (lida no primeiro uso)
+ou de BACKEND_PADRAO. Os módulos dos backends só são importados quando usados;
+opcional() faz o mesmo para quem usa src/batch.py só quando ele existe.
+
+Um backend é qualquer objeto (normalmente um módulo) com:
+    gen_bits(seed_bits, champ_index, stars_val, rodadas) -> bits de K
+    enc_bits(K, M, rodadas) -> bits de C   (M ainda sem ajuste ao tamanho de K)
+    dec_bits(K, C, rodadas) -> bits de M   (com o padding de zeros)
+
+Os backends só trabalham com listas: entradas BitState (src/estado.py) são
+convertidas aqui, e a saída volta como BitState. Com o backend "packed" não
+há conversão: o int do BitState vai direto para gen_int/enc_int/dec_int.
+
+Com a instrumentação por etapa ligada (src/instrumentacao.py), as chamadas
+vão para BACKEND_INSTRUMENTADO qualquer que seja o backend selecionado: só
+ele tem as etapas separadas e registra cada uma. O nome dele fica anotado
+em instrumentacao.snapshot(), junto de cada etapa medida.
+"""
+import importlib
+import os
+from contextlib import contextmanager
+
+from src import instrumentacao
+from src.estado import BitState, como_lista
+
+BACKEND_PADRAO = "packed"
+# Usado enquanto instrumentacao.ativo (o único que chama instrumentacao.marcar)
+BACKEND_INSTRUMENTADO = "referencia"
+VARIAVEL_AMBIENTE = "TFT_BACKEND"
+
+# nome -> módulo (ou nome do módulo, importado no primeiro uso)
+_BACKENDS = {
+    "referencia": "src.referencia",
+    "packed": "src.packed",
+    "numpy": "src.batch",
+    "inplace": "src.inplace",
+}
+
+# Nome escolhido por selecionar() (None = variável de ambiente ou padrão)
+_selecionado = None
+# Backend em uso, resolvido no primeiro uso
+_atual = None
+
+# Módulos opcionais já tentados: nome -> módulo ou None
+_opcionais = {}
+
+
+def registrar(nome: str, backend) -> None:
+    """Registra um backend: módulo/objeto com gen_bits, enc_bits e dec_bits, ou o nome do módulo."""
+    global _atual
+    _BACKENDS[nome] = backend
+    _atual = None
+
+
+def disponiveis() -> list[str]:
+    """Nomes registrados (um backend pode falhar ao carregar, ex.: "numpy" sem NumPy)."""
+    return list(_BACKENDS)
+
+
+def obter(nome: str = None):
+    """Retorna o backend `nome` (ou o selecionado), importando-o se necessário."""
+    if nome is None:
+        if _atual is None:
+            return _resolver()
+        return _atual
+
+    try:
+        backend = _BACKENDS[nome]
+    except KeyError:
+        raise ValueError(
+            f"Backend desconhecido: {nome!r} (disponíveis: {', '.join(_BACKENDS)})"
+        ) from None
+    if isinstance(backend, str):
+        backend = _BACKENDS[nome] = importlib.import_module(backend)
+    return backend
+
+
+def _resolver():
+    global _atual
+    nome = _selecionado or os.environ.get(VARIAVEL_AMBIENTE) or BACKEND_PADRAO
+    _atual = obter(nome)
+    return _atual
+
+
+def selecionar(nome: str = None) -> str:
+    """
+    Seleciona o backend usado por GEN/ENC/DEC e retorna o nome anterior.
+
+    Com nome None volta à variável de ambiente (relida agora) ou ao padrão.
+    """
+    global _selecionado, _atual
+    anterior = backend_atual()
+    if nome is not None:
+        obter(nome)  # valida (e importa) antes de trocar
+    _selecionado = nome
+    _atual = None
+    return anterior
+
+
+def backend_atual() -> str:
+    """Nome do backend que será usado na próxima chamada."""
+    return _selecionado or os.environ.get(VARIAVEL_AMBIENTE) or BACKEND_PADRAO
+
+
+def opcional(modulo: str):
+    """
+    Importa `modulo` no primeiro uso e o guarda; None se faltar uma dependência
+    opcional (ex.: opcional("src.batch") sem NumPy).
+    """
+    try:
+        return _opcionais[modulo]
+    except KeyError:
+        pass
+    try:
+        carregado = importlib.import_module(modulo)
+    except ImportError:
+        carregado = None
+    _opcionais[modulo] = carregado
+    return carregado
+
+
+@contextmanager
+def usando(nome: str):
+    """Usa o backend `nome` dentro do bloco."""
+    global _selecionado, _atual
+    anterior = _selecionado
+    selecionar(nome)
+    try:
+        yield obter()
+    finally:
+        _selecionado = anterior
+        _atual = None
+
+
+# ---------------------------------------------------------------------
+# Núcleo chamado pelas APIs públicas
+# ---------------------------------------------------------------------
+
+def _backend(funcao: str):
+    """Backend desta chamada: o selecionado ou, medindo por etapa, o instrumentado."""
+    if instrumentacao.ativo:
+        instrumentacao.registrar_backend(funcao, BACKEND_INSTRUMENTADO)
+        return obter(BACKEND_INSTRUMENTADO)
+    return _atual or _resolver()
+
+
+def _empacotado(backend) -> bool:
+    """Se `backend` é src/packed.py, que recebe direto o int de um BitState."""
+    return backend is _BACKENDS.get("packed")
+
+
+def gen_bits(seed_bits: list[int], champ_index: int, stars_val: int, rodadas: int) -> list[int]:
+    """Agenda de chave: 4 * len(seed_bits) bits (campeão e estrelas já normalizados)."""
+    backend = _backend("GEN")
+    if isinstance(seed_bits, BitState):
+        tamanho = len(seed_bits)
+        if _empacotado(backend) and tamanho:
+            k = backend.gen_int(seed_bits.valor, tamanho, champ_index, stars_val, rodadas)
+            return BitState.from_int(k, 4 * tamanho)
+        return BitState(backend.gen_bits(seed_bits.tolist(), champ_index, stars_val, rodadas))
+    return backend.gen_bits(seed_bits, champ_index, stars_val, rodadas)
+
+
+def enc_bits(K: list[int], M: list[int], rodadas: int = 2) -> list[int]:
+    """Cifra os bits M (ajustados ao tamanho de K pelo backend)."""
+    backend = _backend("ENC")
+    if isinstance(K, BitState) or isinstance(M, BitState):
+        tamanho = len(K)
+        if _empacotado(backend) and tamanho:
+            # Sem passar por listas: os ints vão direto para o motor empacotado
+            m = backend.ajustar_tamanho_int(backend.bits_para_int(M), len(M), tamanho)
+            c = backend.enc_int(backend.bits_para_int(K), m, tamanho, rodadas)
+            return BitState.from_int(c, tamanho)
+        return BitState(backend.enc_bits(como_lista(K), como_lista(M), rodadas))
+    return backend.enc_bits(K, M, rodadas)
+
+
+def dec_bits(K: list[int], C: list[int], rodadas: int = 2) -> list[int]:
+    """Decifra C e retorna os bits da mensagem, ainda com o padding (min(len(K), len(C)) bits)."""
+    backend = _backend("DEC")
+    if isinstance(K, BitState) or isinstance(C, BitState):
+        tamanho, n = len(C), min(len(K), len(C))
+        if _empacotado(backend) and tamanho:
+            # Mesmo ajuste de _dec_listas, sobre os ints: K vira len(C) bits
+            # (cortada ou com zeros à direita) e a saída fica com os n primeiros
+            k = backend.ajustar_tamanho_int(backend.bits_para_int(K), len(K), tamanho)
+            m = backend.dec_int(k, backend.bits_para_int(C), tamanho, rodadas)
+            return BitState.from_int(m >> (tamanho - n), n)
+        return BitState(_dec_listas(backend, como_lista(K), como_lista(C), rodadas))
+    return _dec_listas(backend, K, C, rodadas)
+
+
+def _dec_listas(backend, K: list[int], C: list[int], rodadas: int) -> list[int]:
+    if len(K) != len(C):
+        # Os bits de K além de len(C) nunca entram no XOR; os que faltam
+        # viram zeros e a saída é cortada em len(K), como no zip original
+        n = min(len(K), len(C))
+        return backend.dec_bits(list(K[:n]) + [0] * (len(C) - n), C, rodadas)[:n]
+    return backend.dec_bits(K, C, rodadas)
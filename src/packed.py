@@ -0,0 +1,402 @@
+# src/packed.py
+"""
+Motor de bits empacotados para GEN/ENC/DEC.
+
+Em vez de uma lista com um int por bit, o estado da cifra é guardado como
+um único `int` do Python. Convenção: o bit de índice 0 da lista é o bit mais
+significativo do inteiro (mesma ordem de `texto_para_binario`).
+
+Whitening, rotação e difusão viram deslocamentos e XORs sobre a palavra
+inteira, e a saída é idêntica bit a bit à de src/enc.py, src/dec.py e
+src/gen.py, então chaves e criptogramas continuam intercambiáveis.
+
+É o backend padrão de src/nucleo.py (gen_bits, enc_bits e dec_bits).
+encrypt_bytes / decrypt_bytes cifram direto de/para bytes, sem passar por
+listas de bits (bits_para_bytes / bytes_para_bits convertem as cifras).
+"""
+from functools import lru_cache
+
+from src import linear
+from src.estado import BitState
+from src.gen import TFT_CHAMPIONS, gerar_bits_tft, obter_campeao, obter_estrelas
+from src.tabelas import substituir_int
+from src.utils import texto_para_binario
+
+# Conversão entre bits (0/1) e os caracteres ASCII '0'/'1'
+_BITS_PARA_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_ASCII_PARA_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+# ---------------------------------------------------------------------
+# Conversões entre a representação em lista e a empacotada
+# ---------------------------------------------------------------------
+
+def bits_para_int(bits: list[int]) -> int:
+    """Empacota uma lista de bits (ou BitState) em um inteiro (bits[0] = bit mais significativo)."""
+    if isinstance(bits, BitState):
+        return bits.valor
+    if not bits:
+        return 0
+    return int(bytes(bits).translate(_BITS_PARA_ASCII), 2)
+
+
+def int_para_bits(valor: int, tamanho: int) -> list[int]:
+    """Desempacota `tamanho` bits de um inteiro para lista de bits."""
+    if tamanho == 0:
+        return []
+    return list(format(valor, f"0{tamanho}b").encode().translate(_ASCII_PARA_BITS))
+
+
+def texto_para_int(texto: str) -> tuple[int, int]:
+    """
+    Equivalente empacotado de texto_para_binario.
+
+    Retorna (valor, quantidade de bits). Caracteres fora do Latin-1 geram mais
+    de 8 bits em texto_para_binario, então nesse caso caímos no caminho em lista
+    para manter exatamente o mesmo comportamento.
+    """
+    try:
+        dados = texto.encode("latin-1")
+    except UnicodeEncodeError:
+        bits = texto_para_binario(texto)
+        return bits_para_int(bits), len(bits)
+    return int.from_bytes(dados, "big"), 8 * len(dados)
+
+
+def int_para_texto(valor: int, tamanho: int) -> str:
+    """Equivalente empacotado de binario_para_texto (bits quebrados no final são ignorados)."""
+    num_bytes = tamanho // 8
+    return (valor >> (tamanho % 8)).to_bytes(num_bytes, "big").decode("latin-1")
+
+
+def ajustar_tamanho_int(valor: int, tamanho_atual: int, tamanho_alvo: int) -> int:
+    """Equivalente empacotado de ajustar_tamanho_msg (padding com zeros ou truncamento)."""
+    if tamanho_atual < tamanho_alvo:
+        return valor << (tamanho_alvo - tamanho_atual)
+    return valor >> (tamanho_atual - tamanho_alvo)
+
+
+def repetir_padrao_int(padrao: int, largura: int, tamanho: int) -> int:
+    """
+    Repete um padrão de `largura` bits até completar `tamanho` bits (cortando o excesso).
+
+    O padrão é duplicado a cada passo (log2(tamanho / largura) deslocamentos),
+    então o custo é linear em `tamanho`.
+    """
+    valor, bits = padrao, largura
+    while bits < tamanho:
+        valor |= valor << bits
+        bits <<= 1
+    return valor >> (bits - tamanho)
+
+
+@lru_cache(maxsize=32)
+def mascara_constante(constante: int, tamanho: int) -> int:
+    """Constante de rodada de GEN (8 bits) repetida em `tamanho` bits, em cache."""
+    return repetir_padrao_int(constante, 8, tamanho)
+
+
+# ---------------------------------------------------------------------
+# Primitivas sobre o estado empacotado
+# ---------------------------------------------------------------------
+
+def aplicar_sbox_int(valor: int, tamanho: int) -> int:
+    """Aplica a S-Box em todos os nibbles completos (tabela de bytes, ver src/tabelas.py)."""
+    return substituir_int(valor, tamanho)
+
+
+def aplicar_sbox_inversa_int(valor: int, tamanho: int) -> int:
+    """Reverte aplicar_sbox_int."""
+    return substituir_int(valor, tamanho, inversa=True)
+
+
+def difusao_ida_int(valor: int, tamanho: int) -> int:
+    """XOR prefixo (bit i recebe o XOR dos bits 0..i), em log2(n) deslocamentos."""
+    passo = 1
+    while passo < tamanho:
+        valor ^= valor >> passo
+        passo <<= 1
+    return valor
+
+
+def difusao_volta_int(valor: int, tamanho: int) -> int:
+    """XOR sufixo (bit i recebe o XOR dos bits i..n-1), em log2(n) deslocamentos."""
+    passo = 1
+    while passo < tamanho:
+        valor ^= valor << passo
+        passo <<= 1
+    return valor & ((1 << tamanho) - 1)
+
+
+def reverter_difusao_ida_int(valor: int) -> int:
+    """Inverso de difusao_ida_int: cada bit volta a ser XOR com o anterior."""
+    return valor ^ (valor >> 1)
+
+
+def reverter_difusao_volta_int(valor: int, tamanho: int) -> int:
+    """Inverso de difusao_volta_int: cada bit volta a ser XOR com o seguinte."""
+    return (valor ^ (valor << 1)) & ((1 << tamanho) - 1)
+
+
+def transposicao_int(valor: int, tamanho: int, num_colunas: int = 4) -> int:
+    """Transposição colunar: concatena as colunas bits[c::num_colunas]."""
+    bits = format(valor, f"0{tamanho}b")
+    return int("".join(bits[c::num_colunas] for c in range(num_colunas)), 2)
+
+
+def reverter_transposicao_int(valor: int, tamanho: int, num_colunas: int = 4) -> int:
+    """Reverte transposicao_int devolvendo cada coluna para as posições c::num_colunas."""
+    bits = format(valor, f"0{tamanho}b").encode()
+    saida = bytearray(tamanho)
+    inicio = 0
+    for c in range(num_colunas):
+        fim = inicio + len(range(c, tamanho, num_colunas))
+        saida[c::num_colunas] = bits[inicio:fim]
+        inicio = fim
+    return int(saida, 2)
+
+
+def rotacionar_int(valor: int, tamanho: int, n: int) -> int:
+    """Rotaciona n posições para a esquerda (mesmo sentido de rotacionar_bits)."""
+    n %= tamanho
+    return ((valor << n) | (valor >> (tamanho - n))) & ((1 << tamanho) - 1)
+
+
+# ---------------------------------------------------------------------
+# Núcleo empacotado
+# ---------------------------------------------------------------------
+
+def enc_int(k: int, m: int, tamanho: int, rodadas: int = 2) -> int:
+    """
+    ENC sobre estado empacotado (m já ajustado para `tamanho` bits).
+
+    Até linear.TAMANHO_MAXIMO_PLANO bits, as difusões e a transposição de cada
+    rodada são aplicadas juntas pelo plano linear compilado para `tamanho`.
+    """
+    estado = m ^ k
+    if tamanho <= linear.TAMANHO_MAXIMO_PLANO:
+        plano = linear.plano_enc(tamanho)
+        for _ in range(rodadas):
+            estado = plano.aplicar(aplicar_sbox_int(estado, tamanho))
+        return estado
+
+    for _ in range(rodadas):
+        estado = aplicar_sbox_int(estado, tamanho)
+        estado = difusao_ida_int(estado, tamanho)
+        estado = difusao_volta_int(estado, tamanho)
+        estado = transposicao_int(estado, tamanho)
+    return estado
+
+
+def dec_int(k: int, c: int, tamanho: int, rodadas: int = 2) -> int:
+    """DEC sobre estado empacotado; retorna os bits da mensagem (ainda com padding)."""
+    estado = c
+    if tamanho <= linear.TAMANHO_MAXIMO_PLANO:
+        plano = linear.plano_dec(tamanho)
+        for _ in range(rodadas):
+            estado = aplicar_sbox_inversa_int(plano.aplicar(estado), tamanho)
+        return estado ^ k
+
+    for _ in range(rodadas):
+        estado = reverter_transposicao_int(estado, tamanho)
+        estado = reverter_difusao_volta_int(estado, tamanho)
+        estado = reverter_difusao_ida_int(estado)
+        estado = aplicar_sbox_inversa_int(estado, tamanho)
+    return estado ^ k
+
+
+def gen_int(
+    seed: int, tamanho_seed: int, champ_index: int, stars_val: int, rodadas: int = 4
+) -> int:
+    """
+    Agenda de chave empacotada; retorna os 4 * tamanho_seed bits de K.
+
+    Recebe o índice do campeão e as estrelas já normalizados
+    (obter_campeao / obter_estrelas). Cada etapa é linear no tamanho da
+    chave: a constante da rodada vem de uma máscara em cache, a rotação é
+    deslocamento + OR e o feedback é x ^ rotr(x, 1).
+    """
+    bits_tft = gerar_bits_tft(champ_index + 1, stars_val)
+    tft = repetir_padrao_int(bits_para_int(bits_tft), len(bits_tft), tamanho_seed)
+    seed_final = seed ^ tft
+
+    tamanho = 4 * tamanho_seed
+    estado = repetir_padrao_int(seed_final, tamanho_seed, tamanho)
+
+    for round_num in range(rodadas):
+        constante_round = (champ_index * (round_num + 1) + stars_val) % 255
+        estado ^= mascara_constante(constante_round, tamanho)
+
+        estado = aplicar_sbox_int(estado, tamanho)
+        estado = rotacionar_int(estado, tamanho, stars_val * 7 + round_num * 11)
+
+        # Feedback: bit i recebe XOR com o bit i-1 (o bit 0 recebe o último)
+        estado ^= (estado >> 1) | ((estado & 1) << (tamanho - 1))
+
+    return estado
+
+
+# ---------------------------------------------------------------------
+# Backend "packed" de src/nucleo.py (entrada e saída em listas de bits)
+# ---------------------------------------------------------------------
+
+def gen_bits(seed_bits: list[int], champ_index: int, stars_val: int, rodadas: int = 4) -> list[int]:
+    """gen_int para uma seed em lista de bits."""
+    tamanho_seed = len(seed_bits)
+    if tamanho_seed == 0:
+        return []
+    K = gen_int(bits_para_int(seed_bits), tamanho_seed, champ_index, stars_val, rodadas)
+    return int_para_bits(K, 4 * tamanho_seed)
+
+
+def enc_bits(K: list[int], M: list[int], rodadas: int = 2) -> list[int]:
+    """enc_int para chave e mensagem em listas de bits (M é ajustada ao tamanho de K)."""
+    tamanho = len(K)
+    if tamanho == 0:
+        return []
+    m = ajustar_tamanho_int(bits_para_int(M), len(M), tamanho)
+    return int_para_bits(enc_int(bits_para_int(K), m, tamanho, rodadas), tamanho)
+
+
+def dec_bits(K: list[int], C: list[int], rodadas: int = 2) -> list[int]:
+    """dec_int para chave e criptograma em listas de bits."""
+    tamanho = len(C)
+    if tamanho == 0:
+        return []
+    return int_para_bits(dec_int(bits_para_int(K), bits_para_int(C), tamanho, rodadas), tamanho)
+
+
+# ---------------------------------------------------------------------
+# API em bytes (sem listas de bits)
+# ---------------------------------------------------------------------
+
+def bits_para_bytes(bits: list[int]) -> bytes:
+    """Empacota uma cifra em lista de bits em ceil(len / 8) bytes (padding de zeros no fim)."""
+    tamanho = len(bits)
+    return (bits_para_int(bits) << (-tamanho % 8)).to_bytes((tamanho + 7) // 8, "big")
+
+
+def bytes_para_bits(dados, tamanho: int) -> list[int]:
+    """Inverso de bits_para_bytes: os `tamanho` primeiros bits de `dados`."""
+    if len(dados) != (tamanho + 7) // 8:
+        raise ValueError(f"Erro de tamanho: {tamanho} bits ocupam {(tamanho + 7) // 8} bytes.")
+    return int_para_bits(int.from_bytes(dados, "big") >> (-tamanho % 8), tamanho)
+
+
+def como_bytes(visao: memoryview):
+    """
+    Os bytes de uma memoryview de itens de 1 byte, como visão plana ("B").
+
+    Visões não contíguas (ex.: memoryview(buf)[::2]) não podem ser
+    reinterpretadas com cast, então são copiadas com tobytes(). Itens maiores
+    que 1 byte (ex.: array("H")) são rejeitados em vez de terem os bytes
+    crus reinterpretados.
+    """
+    if visao.itemsize != 1:
+        raise TypeError(
+            f"Esperados dados em bytes (itens de 1 byte); recebido formato {visao.format!r} "
+            f"com itens de {visao.itemsize} bytes."
+        )
+    if not visao.c_contiguous:
+        return visao.tobytes()
+    return visao.cast("B")
+
+
+def escrever_saida(resultado: bytes, saida):
+    """Retorna `resultado` ou, com `saida`, copia para o buffer e retorna os bytes escritos."""
+    if saida is None:
+        return resultado
+    with memoryview(saida) as visao:
+        if visao.nbytes < len(resultado):
+            raise ValueError(
+                f"Buffer de saída pequeno demais: {visao.nbytes} bytes (necessários {len(resultado)})."
+            )
+        if visao.itemsize != 1 or not visao.c_contiguous:
+            raise TypeError("O buffer de saída deve ser contíguo e de itens de 1 byte.")
+        visao.cast("B")[: len(resultado)] = resultado
+    return len(resultado)
+
+
+def encrypt_bytes(K: list[int], dados, saida=None):
+    """
+    ENC para mensagens em bytes: igual a ENC(K, dados.decode("latin-1")).
+
+    Args:
+        K: chave em lista de bits
+        dados: bytes, bytearray ou memoryview de bytes (contígua ou não); só os
+               primeiros ceil(len(K) / 8) bytes são lidos (o resto seria truncado por ENC)
+        saida: opcional; buffer gravável que recebe a cifra
+
+    Returns:
+        A cifra em ceil(len(K) / 8) bytes (bits_para_bytes(ENC(...))) ou, com
+        `saida`, a quantidade de bytes escritos nela.
+    """
+    tamanho = len(K)
+    num_bytes = (tamanho + 7) // 8
+    with memoryview(dados) as visao:
+        visao = como_bytes(visao)[:num_bytes]
+        m = ajustar_tamanho_int(int.from_bytes(visao, "big"), 8 * len(visao), tamanho)
+
+    c = enc_int(bits_para_int(K), m, tamanho) if tamanho else 0
+    return escrever_saida((c << (-tamanho % 8)).to_bytes(num_bytes, "big"), saida)
+
+
+def decrypt_bytes(K: list[int], dados, saida=None):
+    """
+    DEC para cifras em bytes (no formato de encrypt_bytes / bits_para_bytes).
+
+    Retorna os len(K) // 8 bytes da mensagem sem os bytes nulos do final
+    (o padding de ajustar_tamanho_msg). Ao contrário de DEC, bytes nulos do
+    começo são mantidos; para tamanhos exatos use src/fluxo.py. Com `saida`,
+    escreve nela e retorna a quantidade de bytes escritos.
+    """
+    tamanho = len(K)
+    with memoryview(dados) as visao:
+        if visao.nbytes != (tamanho + 7) // 8:
+            raise ValueError(
+                f"Erro de tamanho: a cifra deve ter {(tamanho + 7) // 8} bytes (recebido {visao.nbytes})."
+            )
+        c = int.from_bytes(como_bytes(visao), "big") >> (-tamanho % 8)
+    m = dec_int(bits_para_int(K), c, tamanho) if tamanho else 0
+    texto = (m >> (tamanho % 8)).to_bytes(tamanho // 8, "big").rstrip(b"\x00")
+    return escrever_saida(texto, saida)
+
+
+# ---------------------------------------------------------------------
+# API compatível com src/gen.py, src/enc.py e src/dec.py
+# ---------------------------------------------------------------------
+
+def GEN(seed_frase, input_champ=0, input_stars=1):
+    """Mesma interface e saída de src.gen.GEN, usando o estado empacotado."""
+    champ_index = obter_campeao(input_champ)
+    stars_val = obter_estrelas(input_stars)
+    nome_champ = TFT_CHAMPIONS[champ_index]
+
+    seed, tamanho_seed = texto_para_int(seed_frase)
+    if tamanho_seed == 0:
+        return [], nome_champ, stars_val
+
+    K = gen_int(seed, tamanho_seed, champ_index, stars_val)
+    return int_para_bits(K, 4 * tamanho_seed), nome_champ, stars_val
+
+
+def ENC(K: list[int], mensagem_texto: str) -> list[int]:
+    """Mesma interface e saída de src.enc.ENC, usando o estado empacotado."""
+    tamanho = len(K)
+    if tamanho == 0:
+        return []
+
+    m, tamanho_m = texto_para_int(mensagem_texto)
+    m = ajustar_tamanho_int(m, tamanho_m, tamanho)
+
+    return int_para_bits(enc_int(bits_para_int(K), m, tamanho), tamanho)
+
+
+def DEC(K: list[int], C: list[int]) -> str:
+    """Mesma interface e saída de src.dec.DEC, usando o estado empacotado."""
+    tamanho = len(C)
+    if tamanho == 0:
+        return ""
+
+    m = dec_int(bits_para_int(K), bits_para_int(C), tamanho)
+    return int_para_texto(m, tamanho).strip("\x00")
@@ -0,0 +1,162 @@
+# src/paralelo.py
+"""
+Cifragem em paralelo de entradas grandes com um pool de processos.
+
+Cada bloco de src/fluxo.py é cifrado de forma independente (mesma chave,
+sem encadeamento), então blocos disjuntos podem ir para processos
+diferentes e o resultado é idêntico, byte a byte, ao do Encryptor serial.
+
+Para não serializar (pickle) os dados de cada tarefa, a entrada e a saída
+ficam em dois segmentos de multiprocessing.shared_memory criados uma vez.
+Cada processo do pool recebe a chave e os nomes dos segmentos no
+inicializador; as tarefas enviadas são só tuplas (operação, bloco inicial,
+bloco final) e cada processo escreve direto na sua faixa da saída.
+
+Uso:
+    from src.paralelo import cifrar_paralelo, decifrar_paralelo
+    cifra = cifrar_paralelo(K, dados, processos=8)
+    dados = decifrar_paralelo(K, cifra, processos=8)
+
+    # Em fluxo, com memória limitada (ex.: src/cli.py --processos):
+    with ExecutorParalelo(K, processos=8) as executor:
+        enc = Encryptor(K, executor=executor)
+        ...
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+from src.fluxo import Decryptor, Encryptor, _Fluxo
+
+# Capacidade dos segmentos compartilhados: bytes de entrada processados por lote
+TAMANHO_LOTE = 16 << 20
+
+# Tarefas por processo em cada lote (divisão mais fina equilibra processos lentos)
+TAREFAS_POR_PROCESSO = 4
+
+# Estado de cada processo do pool, montado por _iniciar_processo
+_estado = {}
+
+
+def _iniciar_processo(K, nome_entrada, nome_saida):
+    """Inicializador do pool: monta o bloco cifrador e abre os segmentos compartilhados."""
+    _estado["fluxo"] = _Fluxo(K)
+    _estado["entrada"] = shared_memory.SharedMemory(name=nome_entrada)
+    _estado["saida"] = shared_memory.SharedMemory(name=nome_saida)
+
+
+def _processar_faixa(tarefa) -> None:
+    """Processa os blocos [inicio, fim) da entrada compartilhada, escrevendo na saída."""
+    operacao, inicio, fim = tarefa
+    fluxo = _estado["fluxo"]
+    entrada = _estado["entrada"].buf
+    saida = _estado["saida"].buf
+
+    if operacao == "cifrar":
+        tam_entrada, tam_saida, funcao = fluxo.bytes_claro, fluxo.bytes_cifra, fluxo.cifrar_bloco
+    else:
+        tam_entrada, tam_saida, funcao = fluxo.bytes_cifra, fluxo.bytes_claro, fluxo.decifrar_bloco
+
+    for i in range(inicio, fim):
+        bloco = entrada[i * tam_entrada : (i + 1) * tam_entrada]
+        saida[i * tam_saida : (i + 1) * tam_saida] = funcao(bloco)
+        bloco.release()
+
+
+class ExecutorParalelo:
+    """
+    Pool de processos que cifra/decifra blocos completos via memória compartilhada.
+
+    Tem a mesma interface de blocos de _Fluxo (cifrar_blocos/decifrar_blocos),
+    então pode ser passado como `executor` para Encryptor/Decryptor.
+    """
+
+    def __init__(self, K: list[int], processos: int = None, tamanho_lote: int = TAMANHO_LOTE):
+        """
+        Args:
+            K: chave em lista de bits (pelo menos 8 bits)
+            processos: tamanho do pool (padrão: os.cpu_count())
+            tamanho_lote: bytes de entrada copiados para a memória compartilhada por lote
+        """
+        self._fluxo = _Fluxo(K)
+        self.bytes_claro = self._fluxo.bytes_claro
+        self.bytes_cifra = self._fluxo.bytes_cifra
+        self.processos = processos or os.cpu_count() or 1
+
+        maior_bloco = max(self.bytes_claro, self.bytes_cifra)
+        self._blocos_por_lote = max(1, tamanho_lote // maior_bloco)
+        capacidade = self._blocos_por_lote * maior_bloco
+
+        self._entrada = shared_memory.SharedMemory(create=True, size=capacidade)
+        self._saida = shared_memory.SharedMemory(create=True, size=capacidade)
+        try:
+            self._pool = multiprocessing.Pool(
+                self.processos,
+                initializer=_iniciar_processo,
+                initargs=(list(K), self._entrada.name, self._saida.name),
+            )
+        except BaseException:
+            self._liberar_memoria()
+            raise
+
+    def _liberar_memoria(self):
+        for segmento in (self._entrada, self._saida):
+            segmento.close()
+            segmento.unlink()
+
+    def _executar(self, operacao: str, dados, tam_entrada: int, tam_saida: int) -> bytes:
+        if len(dados) % tam_entrada:
+            raise ValueError("A entrada deve conter apenas blocos completos.")
+
+        partes = []
+        with memoryview(dados) as visao:
+            for lote in range(0, len(visao), self._blocos_por_lote * tam_entrada):
+                pedaco = visao[lote : lote + self._blocos_por_lote * tam_entrada]
+                self._entrada.buf[: len(pedaco)] = pedaco
+                num_blocos = len(pedaco) // tam_entrada
+
+                passo = -(-num_blocos // (self.processos * TAREFAS_POR_PROCESSO))
+                tarefas = [
+                    (operacao, inicio, min(inicio + passo, num_blocos))
+                    for inicio in range(0, num_blocos, passo)
+                ]
+                self._pool.map(_processar_faixa, tarefas)
+                partes.append(bytes(self._saida.buf[: num_blocos * tam_saida]))
+        return b"".join(partes)
+
+    def cifrar_blocos(self, dados) -> bytes:
+        """Cifra blocos completos (len(dados) múltiplo de bytes_claro) em paralelo."""
+        return self._executar("cifrar", dados, self.bytes_claro, self.bytes_cifra)
+
+    def decifrar_blocos(self, dados) -> bytes:
+        """Decifra blocos completos (len(dados) múltiplo de bytes_cifra) em paralelo."""
+        return self._executar("decifrar", dados, self.bytes_cifra, self.bytes_claro)
+
+    def fechar(self):
+        """Encerra o pool e libera os segmentos de memória compartilhada."""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self._liberar_memoria()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def cifrar_paralelo(K: list[int], dados, processos: int = None) -> bytes:
+    """Equivalente a Encryptor(K).update(dados) + finalize(), com os blocos em paralelo."""
+    with ExecutorParalelo(K, processos) as executor:
+        enc = Encryptor(K, executor=executor)
+        return enc.update(dados) + enc.finalize()
+
+
+def decifrar_paralelo(K: list[int], cifra, processos: int = None) -> bytes:
+    """Equivalente a Decryptor(K).update(cifra) + finalize(), com os blocos em paralelo."""
+    with ExecutorParalelo(K, processos) as executor:
+        dec = Decryptor(K, executor=executor)
+        return dec.update(cifra) + dec.finalize()
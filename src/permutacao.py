@@ -0,0 +1,65 @@
+# src/permutacao.py
+"""
+Tabelas de índices da transposição colunar, calculadas uma vez por tamanho.
+
+A permutação de transposicao_colunar depende apenas de (len(bits), num_colunas),
+então os vetores de índices (e seus inversos) ficam em um cache limitado e
+aplicar a transposição vira uma única coleta com operator.itemgetter.
+
+Convenção: saida[j] = bits[indices[j]].
+"""
+from functools import lru_cache
+from operator import itemgetter
+
+# Quantidade de tamanhos diferentes mantidos em cada cache
+TAMANHO_CACHE = 32
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def indices_transposicao(tamanho: int, num_colunas: int = 4) -> tuple[int, ...]:
+    """Posição de origem de cada bit da saída da transposição (coluna por coluna)."""
+    num_linhas = (tamanho + num_colunas - 1) // num_colunas
+    return tuple(
+        linha * num_colunas + coluna
+        for coluna in range(num_colunas)
+        for linha in range(num_linhas)
+        if linha * num_colunas + coluna < tamanho
+    )
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def indices_reversao(tamanho: int, num_colunas: int = 4) -> tuple[int, ...]:
+    """Permutação inversa: desfaz indices_transposicao."""
+    inversos = [0] * tamanho
+    for destino, origem in enumerate(indices_transposicao(tamanho, num_colunas)):
+        inversos[origem] = destino
+    return tuple(inversos)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def _coletor(tamanho: int, num_colunas: int, inversa: bool):
+    """itemgetter pré-montado para a permutação (ou a inversa)."""
+    if inversa:
+        return itemgetter(*indices_reversao(tamanho, num_colunas))
+    return itemgetter(*indices_transposicao(tamanho, num_colunas))
+
+
+def transpor(bits: list[int], num_colunas: int = 4) -> list[int]:
+    """Aplica a transposição colunar com uma única coleta de índices."""
+    if len(bits) < 2:
+        # itemgetter com um único índice devolve o item em vez de uma tupla
+        return list(bits)
+    return list(_coletor(len(bits), num_colunas, False)(bits))
+
+
+def reverter(bits: list[int], num_colunas: int = 4) -> list[int]:
+    """Reverte a transposição colunar com uma única coleta de índices."""
+    if len(bits) < 2:
+        return list(bits)
+    return list(_coletor(len(bits), num_colunas, True)(bits))
+
+
+def limpar_cache() -> None:
+    """Esvazia todos os caches de índices."""
+    for funcao in (indices_transposicao, indices_reversao, _coletor):
+        funcao.cache_clear()
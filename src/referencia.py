@@ -0,0 +1,161 @@
+# src/referencia.py
+"""
+Backend de referência (src/nucleo.py): GEN/ENC/DEC sobre listas de bits,
+uma etapa por vez, exatamente como descrito em src/gen.py, src/enc.py e
+src/dec.py.
+
+É o backend mais lento e serve de oráculo para os demais. Com
+src/instrumentacao.py ativo, cada etapa registra chamadas e tempo.
+"""
+from src import instrumentacao
+from src.dec import aplicar_sbox_inversa, reverter_transposicao
+from src.enc import transposicao_colunar
+from src.gen import aplicar_sbox, combinar_seed, gerar_bits_tft, rotacionar_bits
+from src.instrumentacao import marcar
+from src.utils import ajustar_tamanho_msg, xor_listas
+
+
+def gen_bits(seed_bits: list[int], champ_index: int, stars_val: int, rodadas: int = 4) -> list[int]:
+    """Agenda de chave (ver src.gen.GEN); retorna os 4 * len(seed_bits) bits de K."""
+    # Lida uma vez: desligada, cada etapa custa só o teste deste booleano
+    medir = instrumentacao.ativo
+    if medir:
+        t = instrumentacao.agora()
+
+    # ETAPA 1: Combina a seed com os dados do campeão
+    tft_bits = gerar_bits_tft(champ_index + 1, stars_val)
+    seed_final = combinar_seed(seed_bits, tft_bits)
+
+    if not seed_final:
+        return []
+
+    # ETAPA 2: Expande a seed
+    # Aumenta 4x o tamanho para ter mais bits na chave final
+    tamanho_chave = 4 * len(seed_bits)
+
+    estado = []
+    while len(estado) < tamanho_chave:
+        estado.extend(seed_final)
+    estado = estado[:tamanho_chave]
+    if medir:
+        t = marcar("GEN", "expansao", t)
+
+    # ETAPA 3: Rodadas de processamento
+    for round_num in range(rodadas):
+        # PASSO A: Mistura com constante que varia a cada rodada
+        # Constante depende do campeão e estrelas → campeão diferente = chave diferente
+        constante_round = (champ_index * (round_num + 1) + stars_val) % 255
+        bits_constante = [int(b) for b in format(constante_round, "08b")]
+
+        for i in range(len(estado)):
+            estado[i] ^= bits_constante[i % 8]
+        if medir:
+            t = marcar("GEN", "constante", t, round_num + 1)
+
+        # PASSO B: CONFUSÃO - S-Box embaralha os bits
+        estado = aplicar_sbox(estado)
+        if medir:
+            t = marcar("GEN", "sbox", t, round_num + 1)
+
+        # PASSO C: DIFUSÃO - Rotação espalha a influência dos bits
+        # Rotação diferente a cada rodada para evitar padrões
+        rotacao = stars_val * 7 + round_num * 11
+        estado = rotacionar_bits(estado, rotacao)
+        if medir:
+            t = marcar("GEN", "rotacao", t, round_num + 1)
+
+        # PASSO D: DIFUSÃO ADICIONAL - Feedback com bits vizinhos
+        # Cada bit é XORado com o anterior, criando dependência entre bits
+        novo_estado = estado[:]
+        for i in range(len(estado)):
+            novo_estado[i] ^= estado[(i - 1) % len(estado)]
+        estado = novo_estado
+        if medir:
+            t = marcar("GEN", "feedback", t, round_num + 1)
+
+    return estado
+
+
+def enc_bits(K: list[int], M: list[int], rodadas: int = 2) -> list[int]:
+    """Encriptação (ver src.enc.ENC) dos bits M com a chave K."""
+    medir = instrumentacao.ativo
+    if medir:
+        t = instrumentacao.agora()
+
+    # Ajusta o tamanho da mensagem para corresponder à chave
+    M = ajustar_tamanho_msg(M, len(K))
+
+    if len(K) != len(M):
+        raise ValueError("Erro de tamanho: A mensagem ajustada deve igualar a chave.")
+
+    # === ETAPA INICIAL: WHITENING ===
+    # XOR entre mensagem e chave para misturar dados antes das rodadas
+    estado = xor_listas(M, K)
+    if medir:
+        t = marcar("ENC", "whitening", t)
+
+    for num_rodada in range(rodadas):
+        # === ETAPA A: CONFUSÃO (S-Box) ===
+        # Substitui grupos de bits para adicionar não-linearidade
+        estado = aplicar_sbox(estado)
+        if medir:
+            t = marcar("ENC", "sbox", t, num_rodada + 1)
+
+        # === ETAPA B: DIFUSÃO LINEAR (Ida / Forward) ===
+        # Cada bit influencia o próximo (propagação para a direita)
+        for i in range(1, len(estado)):
+            estado[i] ^= estado[i - 1]
+        if medir:
+            t = marcar("ENC", "difusao_ida", t, num_rodada + 1)
+
+        # === ETAPA C: DIFUSÃO LINEAR (Volta / Backward) ===
+        # Bits do final influenciam o começo, eliminando pontos cegos
+        for i in range(len(estado) - 2, -1, -1):
+            estado[i] ^= estado[i + 1]
+        if medir:
+            t = marcar("ENC", "difusao_volta", t, num_rodada + 1)
+
+        # === ETAPA D: DIFUSÃO ESPACIAL (Transposição) ===
+        estado = transposicao_colunar(estado, num_colunas=4)
+        if medir:
+            t = marcar("ENC", "transposicao", t, num_rodada + 1)
+
+    return estado
+
+
+def dec_bits(K: list[int], C: list[int], rodadas: int = 2) -> list[int]:
+    """Decriptação (ver src.dec.DEC); retorna os bits da mensagem com o padding."""
+    medir = instrumentacao.ativo
+    if medir:
+        t = instrumentacao.agora()
+
+    estado = C[:]
+
+    for rodada in range(rodadas):
+        # ETAPA 4: Reverter a transposição de bits
+        estado = reverter_transposicao(estado, num_colunas=4)
+        if medir:
+            t = marcar("DEC", "transposicao", t, rodada + 1)
+
+        # ETAPA 3: Reverter a difusão regressiva: M[i] = M[i] XOR M[i+1]
+        for i in range(len(estado) - 1):
+            estado[i] ^= estado[i + 1]
+        if medir:
+            t = marcar("DEC", "difusao_volta", t, rodada + 1)
+
+        # ETAPA 2: Reverter a difusão progressiva: M[i] = M[i] XOR M[i-1]
+        for i in range(len(estado) - 1, 0, -1):
+            estado[i] ^= estado[i - 1]
+        if medir:
+            t = marcar("DEC", "difusao_ida", t, rodada + 1)
+
+        # ETAPA 1: Reverter a substituição de bits com S-Box inversa
+        estado = aplicar_sbox_inversa(estado)
+        if medir:
+            t = marcar("DEC", "sbox", t, rodada + 1)
+
+    # ETAPA FINAL: Remover o whitening aplicando XOR novamente com a chave original
+    texto_bits = xor_listas(estado, K)
+    if medir:
+        marcar("DEC", "whitening", t)
+    return texto_bits
@@ -0,0 +1,488 @@
+# src/servico.py
+"""
+Serviço local de cifragem (asyncio) com micro-lotes por chave.
+
+Cada chamada isolada a ENC/DEC paga conversões e despacho de Python; sob
+carga, o custo por requisição domina. Este servidor junta as requisições
+concorrentes com a mesma chave e a mesma operação em micro-lotes, limitados
+por tamanho (max_lote) e por latência (max_latencia: o lote é despachado no
+máximo esse tempo depois da primeira requisição), e processa cada lote fora
+do event loop (executor) com o backend mais rápido disponível: NumPy
+(src/batch.py) para lotes grandes, motor empacotado (src/packed.py) nos demais.
+
+Protocolo (TCP ou socket Unix), cada quadro = tamanho (uint32 big-endian) + corpo:
+- Requisição: operação (b"E" cifrar / b"D" decifrar) | id (uint32) |
+  bits da chave (uint32) | chave empacotada (ceil(n/8) bytes) | dados
+  - cifrar: dados = texto em Latin-1; resposta = cifra empacotada (ceil(n/8) bytes)
+  - decifrar: dados = cifra empacotada (exatamente ceil(n/8) bytes; outro
+    tamanho é respondido com erro); resposta = texto em Latin-1 (como DEC,
+    sem os "\\x00" das pontas)
+- Resposta: id (uint32) | status (0 = ok, 1 = erro) | dados (ou mensagem de erro)
+
+As respostas podem sair fora de ordem (o id identifica cada uma), então um
+cliente pode manter várias requisições em voo na mesma conexão.
+
+Contrapressão: no máximo max_pendentes requisições em voo no servidor; ao
+atingir o limite, as conexões param de ser lidas até que respostas saiam.
+A fila de entrada do despachante também é limitada (max_fila).
+
+Uso:
+    python -m src.servico servir --unix /tmp/tft.sock
+    python -m src.servico carga --unix /tmp/tft.sock --conexoes 8 --requisicoes 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src import nucleo
+from src.packed import ajustar_tamanho_int, dec_int, enc_int, int_para_texto
+
+CABECALHO = struct.Struct(">I")
+REQUISICAO = struct.Struct(">cII")
+RESPOSTA = struct.Struct(">IB")
+
+CIFRAR = b"E"
+DECIFRAR = b"D"
+STATUS_OK = 0
+STATUS_ERRO = 1
+
+MAX_LATENCIA = 0.002
+MAX_LOTE = 256
+MAX_PENDENTES = 4096
+MAX_FILA = 1024
+MAX_QUADRO = 16 << 20
+
+# Abaixo deste tamanho de lote o motor empacotado é mais rápido que o NumPy
+LOTE_MINIMO_NUMPY = 16
+
+
+# ---------------------------------------------------------------------
+# Processamento de um lote (roda no executor, fora do event loop)
+# ---------------------------------------------------------------------
+
+def _bits_da_chave(tamanho: int, chave: bytes) -> list[int]:
+    k = int.from_bytes(chave, "big") >> (-tamanho % 8)
+    return [(k >> (tamanho - 1 - i)) & 1 for i in range(tamanho)]
+
+
+def _lote_numpy(batch, operacao: bytes, tamanho: int, chave: bytes, dados: list[bytes]) -> list[bytes]:
+    import numpy as np
+
+    num_bytes = (tamanho + 7) // 8
+    linhas = np.zeros((len(dados), num_bytes), dtype=np.uint8)
+    for i, d in enumerate(dados):
+        d = d[:num_bytes]
+        linhas[i, : len(d)] = np.frombuffer(d, dtype=np.uint8)
+    # Zera os bits que passam do tamanho da chave (ajuste de ENC / padding da cifra)
+    linhas[:, -1] &= (0xFF << (-tamanho % 8)) & 0xFF
+
+    K = _bits_da_chave(tamanho, chave)
+    if operacao == CIFRAR:
+        return [linha.tobytes() for linha in batch.encrypt_packed(K, linhas)]
+
+    saida = batch.decrypt_packed(K, linhas)[:, : tamanho // 8]
+    return [linha.tobytes().strip(b"\x00") for linha in saida]
+
+
+def _lote_empacotado(operacao: bytes, tamanho: int, chave: bytes, dados: list[bytes]) -> list[bytes]:
+    num_bytes = (tamanho + 7) // 8
+    padding = -tamanho % 8
+    k = int.from_bytes(chave, "big") >> padding
+
+    saida = []
+    if operacao == CIFRAR:
+        for d in dados:
+            m = ajustar_tamanho_int(int.from_bytes(d, "big"), 8 * len(d), tamanho)
+            c = enc_int(k, m, tamanho)
+            saida.append((c << padding).to_bytes(num_bytes, "big"))
+    else:
+        for d in dados:
+            c = int.from_bytes(d, "big") >> padding
+            m = dec_int(k, c, tamanho)
+            saida.append(int_para_texto(m, tamanho).strip("\x00").encode("latin-1"))
+    return saida
+
+
+def processar_lote(operacao: bytes, tamanho: int, chave: bytes, dados: list[bytes]) -> list[bytes]:
+    """Cifra/decifra todos os `dados` com a mesma chave, escolhendo o backend pelo tamanho do lote."""
+    if len(dados) >= LOTE_MINIMO_NUMPY:
+        # NumPy (opcional) só é importado no primeiro lote grande
+        batch = nucleo.opcional("src.batch")
+        if batch is not None:
+            return _lote_numpy(batch, operacao, tamanho, chave, dados)
+    return _lote_empacotado(operacao, tamanho, chave, dados)
+
+
+# ---------------------------------------------------------------------
+# Quadros
+# ---------------------------------------------------------------------
+
+async def ler_quadro(reader: asyncio.StreamReader):
+    """Lê um quadro; retorna None no fim da conexão."""
+    try:
+        cabecalho = await reader.readexactly(CABECALHO.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (tamanho,) = CABECALHO.unpack(cabecalho)
+    if tamanho > MAX_QUADRO:
+        raise ValueError(f"Quadro de {tamanho} bytes excede o limite de {MAX_QUADRO}.")
+    return await reader.readexactly(tamanho)
+
+
+def montar_quadro(corpo: bytes) -> bytes:
+    return CABECALHO.pack(len(corpo)) + corpo
+
+
+def montar_requisicao(operacao: bytes, id_req: int, tamanho: int, chave: bytes, dados: bytes) -> bytes:
+    return montar_quadro(REQUISICAO.pack(operacao, id_req, tamanho) + chave + dados)
+
+
+# ---------------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------------
+
+class ServicoCifra:
+    """Servidor com micro-lotes por (operação, chave), fila limitada e contrapressão."""
+
+    def __init__(
+        self,
+        max_latencia: float = MAX_LATENCIA,
+        max_lote: int = MAX_LOTE,
+        max_pendentes: int = MAX_PENDENTES,
+        max_fila: int = MAX_FILA,
+        executor=None,
+    ):
+        """
+        Args:
+            max_latencia: segundos que a primeira requisição de um lote pode esperar por outras
+            max_lote: requisições por lote (o lote é despachado ao atingir este tamanho)
+            max_pendentes: requisições em voo no servidor antes de parar de ler as conexões
+            max_fila: tamanho da fila entre as conexões e o despachante
+            executor: onde os lotes rodam (padrão: uma thread dedicada)
+        """
+        self.max_latencia = max_latencia
+        self.max_lote = max_lote
+        self._executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._vagas = asyncio.Semaphore(max_pendentes)
+        self._fila = asyncio.Queue(maxsize=max_fila)
+        self._despachante = None
+        self._tarefas = set()
+        self._conexoes = {}
+        self.lotes = 0
+        self.requisicoes = 0
+
+    async def _despachar(self):
+        """Agrupa os itens da fila por (operação, chave) e despacha por tamanho ou prazo."""
+        loop = asyncio.get_running_loop()
+        abertos = {}  # (operação, tamanho, chave) -> (prazo, itens)
+        while True:
+            if abertos:
+                espera = max(0.0, min(prazo for prazo, _ in abertos.values()) - loop.time())
+                try:
+                    item = await asyncio.wait_for(self._fila.get(), espera)
+                except asyncio.TimeoutError:
+                    item = None
+            else:
+                item = await self._fila.get()
+
+            if item is not None:
+                operacao, tamanho, chave, dados, futuro = item
+                grupo = (operacao, tamanho, chave)
+                if grupo not in abertos:
+                    abertos[grupo] = (loop.time() + self.max_latencia, [])
+                itens = abertos[grupo][1]
+                itens.append((dados, futuro))
+                if len(itens) >= self.max_lote:
+                    self._executar(grupo, abertos.pop(grupo)[1])
+
+            agora = loop.time()
+            for grupo in [g for g, (prazo, _) in abertos.items() if prazo <= agora]:
+                self._executar(grupo, abertos.pop(grupo)[1])
+
+    def _executar(self, grupo, itens):
+        tarefa = asyncio.ensure_future(self._executar_lote(grupo, itens))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _executar_lote(self, grupo, itens):
+        operacao, tamanho, chave = grupo
+        loop = asyncio.get_running_loop()
+        self.lotes += 1
+        try:
+            resultados = await loop.run_in_executor(
+                self._executor, processar_lote, operacao, tamanho, chave, [d for d, _ in itens]
+            )
+        except Exception as erro:
+            for _, futuro in itens:
+                if not futuro.done():
+                    futuro.set_exception(erro)
+            return
+        for (_, futuro), resultado in zip(itens, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    async def _responder(self, id_req, futuro, writer, trava):
+        try:
+            try:
+                corpo = RESPOSTA.pack(id_req, STATUS_OK) + await futuro
+            except Exception as erro:
+                corpo = RESPOSTA.pack(id_req, STATUS_ERRO) + str(erro).encode()
+            async with trava:
+                writer.write(montar_quadro(corpo))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._vagas.release()
+
+    async def tratar_conexao(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        trava = asyncio.Lock()
+        respostas = set()
+        self._conexoes[asyncio.current_task()] = writer
+        try:
+            while True:
+                # Contrapressão: sem vaga, a conexão não é lida
+                await self._vagas.acquire()
+                try:
+                    corpo = await ler_quadro(reader)
+                except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+                    corpo = None
+                if corpo is None or len(corpo) < REQUISICAO.size:
+                    self._vagas.release()
+                    break
+
+                operacao, id_req, tamanho = REQUISICAO.unpack_from(corpo)
+                inicio = REQUISICAO.size
+                num_bytes = (tamanho + 7) // 8
+                chave = corpo[inicio : inicio + num_bytes]
+                dados = corpo[inicio + num_bytes :]
+
+                futuro = loop.create_future()
+                if operacao not in (CIFRAR, DECIFRAR) or tamanho < 8 or len(chave) != num_bytes:
+                    futuro.set_exception(ValueError("Requisição inválida."))
+                elif operacao == DECIFRAR and len(dados) != num_bytes:
+                    futuro.set_exception(ValueError(
+                        f"Erro de tamanho: a cifra deve ter {num_bytes} bytes (recebido {len(dados)})."
+                    ))
+                else:
+                    self.requisicoes += 1
+                    await self._fila.put((operacao, tamanho, chave, dados, futuro))
+
+                tarefa = asyncio.ensure_future(self._responder(id_req, futuro, writer, trava))
+                respostas.add(tarefa)
+                tarefa.add_done_callback(respostas.discard)
+
+            if respostas:
+                await asyncio.gather(*respostas)
+        finally:
+            self._conexoes.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def iniciar(self, host="127.0.0.1", porta=0, caminho_unix=None):
+        """Começa a escutar (socket Unix se caminho_unix, senão TCP) e retorna o asyncio.Server."""
+        self._despachante = asyncio.ensure_future(self._despachar())
+        if caminho_unix:
+            return await asyncio.start_unix_server(self.tratar_conexao, path=caminho_unix)
+        return await asyncio.start_server(self.tratar_conexao, host, porta)
+
+    async def fechar(self):
+        """Encerra as conexões abertas, o despachante e o executor."""
+        # Fechar o transporte faz a leitura pendente de cada conexão terminar com EOF
+        for writer in list(self._conexoes.values()):
+            writer.transport.abort()
+        if self._conexoes:
+            await asyncio.gather(*self._conexoes, return_exceptions=True)
+        if self._despachante is not None:
+            self._despachante.cancel()
+            self._despachante = None
+        self._executor.shutdown(wait=False)
+
+
+# ---------------------------------------------------------------------
+# Cliente e gerador de carga
+# ---------------------------------------------------------------------
+
+class ClienteCifra:
+    """Cliente com várias requisições em voo na mesma conexão (respostas casadas pelo id)."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pendentes = {}
+        self._proximo_id = 0
+        self._leitor = asyncio.ensure_future(self._ler_respostas())
+
+    @classmethod
+    async def conectar(cls, host="127.0.0.1", porta=None, caminho_unix=None):
+        if caminho_unix:
+            reader, writer = await asyncio.open_unix_connection(caminho_unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, porta)
+        return cls(reader, writer)
+
+    async def _ler_respostas(self):
+        try:
+            while True:
+                corpo = await ler_quadro(self._reader)
+                if corpo is None:
+                    break
+                id_req, status = RESPOSTA.unpack_from(corpo)
+                # Id desconhecido ou repetido (ou requisição já cancelada): ignora
+                futuro = self._pendentes.pop(id_req, None)
+                if futuro is None or futuro.done():
+                    continue
+                dados = corpo[RESPOSTA.size :]
+                if status == STATUS_OK:
+                    futuro.set_result(dados)
+                else:
+                    futuro.set_exception(ValueError(dados.decode(errors="replace")))
+        finally:
+            # Saindo por EOF, quadro inválido ou cancelamento, ninguém fica esperando
+            pendentes, self._pendentes = self._pendentes, {}
+            for futuro in pendentes.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("Conexão encerrada pelo servidor."))
+
+    async def requisitar(self, operacao: bytes, K: list[int], dados: bytes) -> bytes:
+        if self._leitor.done():
+            raise ConnectionError("Conexão encerrada pelo servidor.")
+        id_req = self._proximo_id
+        self._proximo_id = (self._proximo_id + 1) & 0xFFFFFFFF
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[id_req] = futuro
+
+        tamanho = len(K)
+        k = int("".join(map(str, K)), 2) << (-tamanho % 8)
+        chave = k.to_bytes((tamanho + 7) // 8, "big")
+        self._writer.write(montar_requisicao(operacao, id_req, tamanho, chave, dados))
+        await self._writer.drain()
+        return await futuro
+
+    async def cifrar(self, K: list[int], texto: str) -> bytes:
+        """Equivalente a ENC(K, texto), com a cifra empacotada em bytes."""
+        return await self.requisitar(CIFRAR, K, texto.encode("latin-1"))
+
+    async def decifrar(self, K: list[int], cifra: bytes) -> str:
+        """Equivalente a DEC(K, C), com C empacotada em bytes."""
+        return (await self.requisitar(DECIFRAR, K, cifra)).decode("latin-1")
+
+    async def fechar(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._leitor.cancel()
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+async def gerar_carga(
+    conexoes=8, requisicoes=10000, em_voo=32, num_chaves=4, host="127.0.0.1", porta=None,
+    caminho_unix=None,
+) -> dict:
+    """
+    Dispara `requisicoes` ENCs distribuídas entre `conexoes` (cada uma com até
+    `em_voo` requisições pendentes) e mede a latência de cada uma.
+    """
+    rng = random.Random(7)
+    chaves = [[rng.getrandbits(1) for _ in range(64)] for _ in range(num_chaves)]
+    latencias = []
+
+    async def trabalhador(cliente, quantidade):
+        janela = asyncio.Semaphore(em_voo)
+
+        async def uma():
+            async with janela:
+                K = rng.choice(chaves)
+                texto = "".join(chr(rng.randrange(32, 127)) for _ in range(8))
+                inicio = time.perf_counter()
+                await cliente.cifrar(K, texto)
+                latencias.append(time.perf_counter() - inicio)
+
+        await asyncio.gather(*(uma() for _ in range(quantidade)))
+
+    clientes = [
+        await ClienteCifra.conectar(host, porta, caminho_unix) for _ in range(conexoes)
+    ]
+    inicio = time.perf_counter()
+    cotas = [requisicoes // conexoes + (i < requisicoes % conexoes) for i in range(conexoes)]
+    await asyncio.gather(*(trabalhador(c, q) for c, q in zip(clientes, cotas)))
+    duracao = time.perf_counter() - inicio
+    for cliente in clientes:
+        await cliente.fechar()
+
+    return {
+        "requisicoes": requisicoes,
+        "duracao_s": duracao,
+        "req_por_s": requisicoes / duracao,
+        "p50_ms": 1e3 * statistics.median(latencias),
+        "p99_ms": 1e3 * _percentil(latencias, 99),
+    }
+
+
+# ---------------------------------------------------------------------
+# Linha de comando
+# ---------------------------------------------------------------------
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Serviço local de cifragem com micro-lotes")
+    ap.add_argument("modo", choices=["servir", "carga"])
+    ap.add_argument("--unix", help="Caminho do socket Unix (senão usa TCP)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--porta", type=int, default=7878)
+    ap.add_argument("--max-latencia-ms", type=float, default=MAX_LATENCIA * 1e3)
+    ap.add_argument("--max-lote", type=int, default=MAX_LOTE)
+    ap.add_argument("--max-pendentes", type=int, default=MAX_PENDENTES)
+    ap.add_argument("--processos", type=int, default=0,
+                    help="Processos para os lotes (default 0: uma thread)")
+    ap.add_argument("--conexoes", type=int, default=8, help="carga: conexões simultâneas")
+    ap.add_argument("--requisicoes", type=int, default=10000, help="carga: total de requisições")
+    ap.add_argument("--em-voo", type=int, default=32, help="carga: requisições pendentes por conexão")
+    return ap.parse_args(argv)
+
+
+async def _servir(args):
+    executor = ProcessPoolExecutor(args.processos) if args.processos > 0 else None
+    servico = ServicoCifra(
+        args.max_latencia_ms / 1e3, args.max_lote, args.max_pendentes, executor=executor
+    )
+    if args.unix and os.path.exists(args.unix):
+        os.remove(args.unix)
+    servidor = await servico.iniciar(args.host, args.porta, args.unix)
+    endereco = args.unix or f"{args.host}:{args.porta}"
+    print(f"Escutando em {endereco}", file=sys.stderr)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servico.fechar()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.modo == "servir":
+        try:
+            asyncio.run(_servir(args))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    r = asyncio.run(
+        gerar_carga(args.conexoes, args.requisicoes, args.em_voo, host=args.host,
+                    porta=args.porta, caminho_unix=args.unix)
+    )
+    print(f"{r['requisicoes']} requisições em {r['duracao_s']:.3f} s")
+    print(f"   Vazão: {r['req_por_s']:.0f} req/s")
+    print(f"   Latência p50: {r['p50_ms']:.3f} ms   p99: {r['p99_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
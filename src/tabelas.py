@@ -0,0 +1,94 @@
+# src/tabelas.py
+"""
+Tabelas pré-calculadas da S-Box.
+
+Em vez de montar cada nibble a partir de 4 leituras de bits e escrever os
+4 bits de volta, as tabelas abaixo substituem 2 nibbles (1 byte) em uma
+única busca:
+
+- SBOX_BYTE / INV_SBOX_BYTE: 256 bytes, para bytes.translate sobre o estado empacotado
+- tabelas_bits(): byte → tupla com seus 8 bits já substituídos (e o mesmo
+  por nibble), para o estado em lista de bits; construída só no primeiro uso
+
+Só as tabelas de 256 bytes são montadas na importação; tabelas_bits() serve
+só às listas de bits e não pesa no início dos processos. A tabela de 16 bits
+(4 nibbles por busca) fica em src/batch.py, o único que a usa, montada com
+NumPy.
+
+Em todas elas os bits finais que não formam um nibble completo (i + 4 > len)
+ficam intactos, como em aplicar_sbox.
+"""
+from functools import lru_cache
+
+# Tabela de Substituição (S-Box) e sua inversa
+TFT_SBOX = [12, 5, 6, 11, 9, 0, 10, 13, 3, 14, 15, 8, 4, 7, 1, 2]
+INV_SBOX = [5, 14, 15, 8, 12, 1, 2, 13, 11, 4, 6, 3, 0, 7, 9, 10]
+
+
+def _tabela_byte(sbox):
+    """Byte (2 nibbles) → byte com os dois nibbles substituídos."""
+    return bytes((sbox[b >> 4] << 4) | sbox[b & 15] for b in range(256))
+
+
+def _para_bits(valor, largura):
+    """Valor inteiro → tupla com `largura` bits (do mais para o menos significativo)."""
+    return tuple((valor >> s) & 1 for s in range(largura - 1, -1, -1))
+
+
+SBOX_BYTE = _tabela_byte(TFT_SBOX)
+INV_SBOX_BYTE = _tabela_byte(INV_SBOX)
+
+
+@lru_cache(maxsize=None)
+def tabelas_bits(inversa: bool = False) -> tuple[tuple, tuple]:
+    """(byte → 8 bits substituídos, nibble → 4 bits substituídos), em tuplas."""
+    sbox, tabela_byte = (INV_SBOX, INV_SBOX_BYTE) if inversa else (TFT_SBOX, SBOX_BYTE)
+    return (
+        tuple(_para_bits(v, 8) for v in tabela_byte),
+        tuple(_para_bits(v, 4) for v in sbox),
+    )
+
+
+def substituir_bits(bits: list[int], inversa: bool = False) -> list[int]:
+    """
+    Aplica a S-Box (ou a inversa) sobre uma lista de bits, um byte por busca.
+
+    Processo:
+    1. Cada grupo de 8 bits vira um índice (0-255) e é trocado pela tupla da tabela
+    2. Se sobrar um nibble completo, ele é trocado pela tabela de nibbles
+    3. Os últimos len % 4 bits ficam intactos
+    """
+    tabela, tabela_nibble = tabelas_bits(inversa)
+
+    novos_bits = bits[:]
+    tamanho = len(novos_bits)
+    fim_bytes = tamanho - tamanho % 8
+
+    for i in range(0, fim_bytes, 8):
+        b0, b1, b2, b3, b4, b5, b6, b7 = novos_bits[i : i + 8]
+        novos_bits[i : i + 8] = tabela[
+            (b0 << 7) | (b1 << 6) | (b2 << 5) | (b3 << 4) | (b4 << 3) | (b5 << 2) | (b6 << 1) | b7
+        ]
+
+    if fim_bytes + 4 <= tamanho:
+        b0, b1, b2, b3 = novos_bits[fim_bytes : fim_bytes + 4]
+        novos_bits[fim_bytes : fim_bytes + 4] = tabela_nibble[(b0 << 3) | (b1 << 2) | (b2 << 1) | b3]
+
+    return novos_bits
+
+
+def substituir_int(valor: int, tamanho: int, inversa: bool = False) -> int:
+    """
+    Aplica a S-Box (ou a inversa) sobre um estado empacotado de `tamanho` bits.
+
+    Todos os nibbles completos são trocados de uma vez com bytes.translate;
+    os últimos `tamanho % 4` bits ficam intactos.
+    """
+    tabela = INV_SBOX_BYTE if inversa else SBOX_BYTE
+    resto = tamanho % 4
+    num_nibbles = tamanho // 4
+    corpo = valor >> resto
+    # Com número ímpar de nibbles o byte mais alto leva um nibble extra, descartado pela máscara
+    substituido = corpo.to_bytes((num_nibbles + 1) // 2, "big").translate(tabela)
+    corpo = int.from_bytes(substituido, "big") & ((1 << (4 * num_nibbles)) - 1)
+    return (corpo << resto) | (valor & ((1 << resto) - 1))
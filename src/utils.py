@@ -1,30 +1,56 @@
 # src/utils.py
-import os
-import sys
+from src.estado import BitState
+
+# Bits 0/1 -> caracteres ASCII '0'/'1' (para int(..., 2)) e o inverso
+_BITS_PARA_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_ASCII_PARA_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Byte (0-255) -> seus 8 bits como bytes 0/1, do mais significativo para o menos
+_BITS_DO_BYTE = [format(valor, "08b").encode().translate(_ASCII_PARA_BITS) for valor in range(256)]
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 def texto_para_binario(texto: str) -> list[int]:
-    """Converte string para lista de bits (ASCII 8 bits)."""
+    """
+    Converte string para lista de bits (ASCII 8 bits).
+
+    Cada byte vira seus 8 bits por busca em tabela, e o texto inteiro é
+    convertido de uma vez (encode Latin-1 + join das entradas da tabela).
+    Caracteres acima de 255 ocupam mais de 8 bits (bin(ord(c)) sem corte),
+    como na conversão original.
+    """
+    try:
+        dados = texto.encode("latin-1")
+    except UnicodeEncodeError:
+        return _texto_para_binario_unicode(texto)
+    return list(b"".join(map(_BITS_DO_BYTE.__getitem__, dados)))
+
+
+def _texto_para_binario_unicode(texto: str) -> list[int]:
+    """Caminho para textos com caracteres fora do Latin-1."""
     bits = []
     for char in texto:
-        # Converte para binário, remove o '0b' e preenche com zeros à esquerda
-        bin_val = bin(ord(char))[2:].zfill(8)
-        bits.extend([int(b) for b in bin_val])
+        codigo = ord(char)
+        if codigo < 256:
+            bits.extend(_BITS_DO_BYTE[codigo])
+        else:
+            bits.extend(int(b) for b in bin(codigo)[2:])
     return bits
 
 
 def binario_para_texto(bits: list[int]) -> str:
-    """Converte lista de bits para string."""
-    chars = []
-    for i in range(0, len(bits), 8):
-        byte = bits[i : i + 8]
-        # Se sobrar bits quebrados no final (menos de 8), ignora
-        if len(byte) < 8:
-            break
-        str_val = "".join(str(b) for b in byte)
-        chars.append(chr(int(str_val, 2)))
-    return "".join(chars)
+    """
+    Converte lista de bits para string.
+
+    Os bits de bytes completos são lidos como um único inteiro e convertidos
+    com to_bytes; bits quebrados no final (menos de 8) são ignorados.
+    """
+    num_bytes = len(bits) // 8
+    if num_bytes == 0:
+        return ""
+    if isinstance(bits, BitState):
+        return (bits.valor >> (len(bits) % 8)).to_bytes(num_bytes, "big").decode("latin-1")
+    valor = int(bytes(bits[: 8 * num_bytes]).translate(_BITS_PARA_ASCII), 2)
+    return valor.to_bytes(num_bytes, "big").decode("latin-1")
 
 
 def xor_listas(lista_a: list[int], lista_b: list[int]) -> list[int]:
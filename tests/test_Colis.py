@@ -1,17 +1,16 @@
+import argparse
 import os
 import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.gen import GEN
-from src.enc import ENC
+from src.colisoes import varrer_colisoes
 
 
-def run():
+def run(n_chaves=50000, processos=None, memoria_mb=64):
     print("\n>>> [2/4] Executando Teste de Colisões (Chaves Equivalentes)...")
 
-    # Número de chaves aleatórias a testar
-    n_chaves = 50000
+    # n_chaves: número de chaves a testar (seeds 0 .. n_chaves-1)
     tamanho_padrao = 16
 
     # Mensagem fixa que será usada para todos os testes de encriptação
@@ -19,39 +18,27 @@ def run():
 
     print(f"   Testando {n_chaves} chaves aleatórias contra mensagem fixa...")
 
-    # Dicionário para armazenar cifras já encontradas e sua seed de origem
-    mapa_cifras = {}
-    colisoes = 0
-
     # Valores fixos para champ e stars, para isolar apenas o teste da seed
     champ_fixo = 1
     stars_fixo = 2
 
-    # Itera sobre todas as sementes de teste
-    for i in range(n_chaves):
-        # Gera uma seed padronizada com zeros à esquerda
-        current_seed = str(i).zfill(tamanho_padrao)
-
-        # Gera a chave criptográfica usando a seed e os parâmetros fixos
-        K = GEN(current_seed, champ_fixo, stars_fixo)[0]
-
-        # Encripta a mensagem fixa com a chave gerada
-        C = ENC(K, msg_fixa)
-
-        # Converte o resultado para tupla para permitir usar como chave do dicionário
-        C_tuple = tuple(C)
-
-        # Verifica se a cifra já foi encontrada anteriormente
-        if C_tuple in mapa_cifras:
-            colisoes += 1
-            # Exibe apenas as primeiras 5 colisões encontradas
-            if colisoes < 5:
-                print(
-                    f"   [COLISÃO] Seed '{current_seed}' colidiu com '{mapa_cifras[C_tuple]}'"
-                )
-        else:
-            # Armazena a cifra e sua seed original
-            mapa_cifras[C_tuple] = current_seed
+    # As seeds são divididas entre processos (src/colisoes.py); cada um guarda só
+    # impressões de 64 bits das cifras, o índice do processo pai transborda para
+    # disco acima de memoria_mb e as colisões são confirmadas no final
+    resultado = varrer_colisoes(
+        n_chaves,
+        msg_fixa,
+        champ_fixo,
+        stars_fixo,
+        processos=processos,
+        tamanho_padrao=tamanho_padrao,
+        orcamento_memoria=memoria_mb << 20,
+    )
+    colisoes = resultado.colisoes
+
+    # Exibe apenas as primeiras colisões encontradas (na ordem das seeds)
+    for seed, seed_original in resultado.pares[:4]:
+        print(f"   [COLISÃO] Seed '{seed}' colidiu com '{seed_original}'")
 
     # Exibe o resultado final do teste
     print(f"\n   Colisões encontradas: {colisoes}")
@@ -64,4 +51,9 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
+    ap = argparse.ArgumentParser(description="Teste de colisões (chaves equivalentes)")
+    ap.add_argument("--chaves", type=int, default=50000, help="Número de seeds a testar")
+    ap.add_argument("--processos", type=int, default=None, help="Processos (default: todos os núcleos)")
+    ap.add_argument("--memoria", type=int, default=64, help="Orçamento do índice de colisões (MB)")
+    args = ap.parse_args()
+    run(args.chaves, args.processos, args.memoria)
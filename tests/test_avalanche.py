@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import nucleo
+
+try:
+    from src import avalanche
+except ImportError:  # NumPy é opcional
+    avalanche = None
+
+
+def run():
+    print("\n>>> Executando Teste da Matriz de Avalanche (src/avalanche.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Matriz de avalanche (src/avalanche.py) contra um laço escalar ---
+    if avalanche is None:
+        print("   Matriz SAC: NumPy não instalado, teste ignorado")
+    else:
+        falhas_sac = 0
+        for tamanho in [5, 13, 40]:
+            K = [rng.getrandbits(1) for _ in range(tamanho)]
+            mensagens = [[rng.getrandbits(1) for _ in range(tamanho)] for _ in range(6)]
+            contagens = [[0] * tamanho for _ in range(tamanho)]
+            distancias = [0] * (tamanho + 1)
+            for M in mensagens:
+                C0 = nucleo.enc_bits(K, M)
+                for i in range(tamanho):
+                    C1 = nucleo.enc_bits(K, M[:i] + [M[i] ^ 1] + M[i + 1 :])
+                    for j in range(tamanho):
+                        contagens[i][j] += C0[j] ^ C1[j]
+                    distancias[sum(a ^ b for a, b in zip(C0, C1))] += 1
+
+            # Lotes pequenos para passar por mais de um lote
+            resultado = avalanche.matriz_sac(K, mensagens, linhas_por_lote=3 * tamanho)
+            if resultado.contagens.tolist() != contagens or resultado.distancias.tolist() != distancias:
+                falhas_sac += 1
+
+        print(f"   Matriz SAC: {falhas_sac} divergências")
+        falhas += falhas_sac
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
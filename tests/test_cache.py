@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import main
+from src.cache import cache_gen, cache_gen_bits
+from src.estado import BitState
+from src.gen import GEN
+
+
+def run():
+    print("\n>>> Executando Teste do Cache LRU de GEN (src/cache.py)\n")
+
+    falhas = 0
+
+    # --- Cache LRU de GEN (src/cache.py) ---
+    gen_cache = cache_gen(tamanho_maximo=4)
+    falhas_cache = 0
+    for seed in ["a", "b", "c", "d", "e", "a", "e"]:
+        K, nome, estrelas = gen_cache(seed, 41, 6)
+        if (K, nome, estrelas) != GEN(seed, 1, 2):
+            falhas_cache += 1
+        # Alterar a chave devolvida não pode alterar o que está no cache
+        K[0] ^= 1
+
+    esperado = {"hits": 1, "misses": 6, "evictions": 2, "tamanho": 4, "tamanho_maximo": 4}
+    if gen_cache.estatisticas() != esperado:
+        falhas_cache += 1
+
+    # GEN de src/main.py (seed em bits): lista -> lista, BitState -> BitState
+    gen_bits_cache = cache_gen_bits(tamanho_maximo=3)
+    seeds = [[1, 0, 1], [0, 1, 1, 0], [1] * 9, [0] * 5]
+    chamadas = [
+        (seeds[0], list), (seeds[0], list), (seeds[0], BitState),
+        (seeds[1], BitState), (seeds[0], BitState), (seeds[2], list),
+        (seeds[1], list), (seeds[3], list), (seeds[1], BitState), (seeds[0], list),
+    ]
+    for seed, tipo in chamadas:
+        K = gen_bits_cache(tipo(seed), 41, 6)
+        if type(K) is not tipo or K != main.GEN(seed, 1, 2):
+            falhas_cache += 1
+        if tipo is list:
+            K[0] ^= 1
+
+    # Listas e BitState ocupam entradas separadas: 2 acertos, 8 faltas e 5 descartes
+    esperado = {"hits": 2, "misses": 8, "evictions": 5, "tamanho": 3, "tamanho_maximo": 3}
+    if gen_bits_cache.estatisticas() != esperado:
+        falhas_cache += 1
+
+    print(f"   Cache de GEN: {falhas_cache} divergências")
+    falhas += falhas_cache
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
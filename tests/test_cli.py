@@ -0,0 +1,72 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import cli
+
+
+def run():
+    print("\n>>> Executando Teste da Linha de Comando (src/cli.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Ida e volta por arquivo, sem deixar arquivo parcial em caso de erro ---
+    falhas_cli = 0
+    chave = ["--seed", "segredoTFT", "--champ", "5", "--stars", "2"]
+    # Mesmo tamanho de chave, outra senha: a cifra é lida inteira e o erro só aparece no padding
+    chave_errada = ["--seed", "segredoXYZ", "--champ", "5", "--stars", "2"]
+    dados = bytes(rng.getrandbits(8) for _ in range(5000))
+    with tempfile.TemporaryDirectory() as pasta, contextlib.redirect_stderr(io.StringIO()):
+        claro, cifrado, recuperado = (
+            os.path.join(pasta, nome) for nome in ("claro", "cifrado", "recuperado")
+        )
+        with open(claro, "wb") as arquivo:
+            arquivo.write(dados)
+
+        for processos in ("1", "2"):
+            cli.main(["cifrar", *chave, "-i", claro, "-o", cifrado, "--processos", processos])
+            cli.main(["decifrar", *chave, "-i", cifrado, "-o", recuperado, "--processos", processos])
+            with open(recuperado, "rb") as arquivo:
+                if arquivo.read() != dados:
+                    falhas_cli += 1
+
+        # Chave errada: o destino anterior fica intacto e nenhum temporário sobra
+        for processos in ("1", "2"):
+            try:
+                cli.main(["decifrar", *chave_errada, "-i", cifrado, "-o", recuperado, "--processos", processos])
+                falhas_cli += 1
+            except SystemExit:
+                pass
+            with open(recuperado, "rb") as arquivo:
+                if arquivo.read() != dados:
+                    falhas_cli += 1
+
+        # Erro com o destino ainda inexistente: ele não é criado
+        try:
+            cli.main(["decifrar", *chave_errada, "-i", cifrado, "-o", os.path.join(pasta, "novo")])
+            falhas_cli += 1
+        except SystemExit:
+            pass
+        if sorted(os.listdir(pasta)) != ["cifrado", "claro", "recuperado"]:
+            falhas_cli += 1
+
+    print(f"   Linha de comando: {falhas_cli} divergências")
+    falhas += falhas_cli
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.colisoes import varrer_colisoes
+from src.enc import ENC
+from src.gen import GEN
+
+
+def run():
+    print("\n>>> Executando Teste da Varredura de Colisões em Shards (src/colisoes.py)\n")
+
+    falhas = 0
+
+    # --- Varredura de colisões em shards (src/colisoes.py) ---
+    # Seeds curtas (2 e 3 caracteres: chaves de 64 e 96 bits) contra o loop serial original
+    mapa_cifras, esperado = {}, []
+    for i in range(300):
+        seed = str(i).zfill(2)
+        C = tuple(ENC(GEN(seed, 1, 2)[0], "TesteColisaoTFT"))
+        if C in mapa_cifras:
+            esperado.append((seed, mapa_cifras[C]))
+        else:
+            mapa_cifras[C] = seed
+
+    falhas_colisoes = 0
+    for processos, num_shards in [(1, 1), (1, 7), (2, None)]:
+        resultado = varrer_colisoes(
+            300, "TesteColisaoTFT", 1, 2, processos, num_shards, tamanho_padrao=2
+        )
+        if resultado.pares != esperado or resultado.colisoes != len(esperado):
+            falhas_colisoes += 1
+
+    print(f"   Varredura de colisões: {falhas_colisoes} divergências")
+    falhas += falhas_colisoes
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
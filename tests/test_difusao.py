@@ -7,6 +7,11 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.gen import GEN
 from src.enc import ENC
 
+try:
+    from src.avalanche import matriz_sac
+except ImportError:  # NumPy é opcional
+    matriz_sac = None
+
 
 # Função para contar quantos bits são diferentes entre duas listas de bits
 def contar_bits_diferentes(lista1, lista2):
@@ -77,6 +82,21 @@ def run():
     print(f"Média de bits alterados: {media:.2f}")
     print(f"Taxa de Difusão Média: {perc_media:.2f}%")
 
+    # Matriz de avalanche estrita: todos os bits invertidos, um por vez, em mensagens aleatórias
+    print("-" * 60)
+    if matriz_sac is None:
+        print("Matriz SAC: NumPy não instalado, etapa ignorada")
+    else:
+        resumo = matriz_sac(K, mensagens=64).resumo()
+        print(f"Matriz SAC ({resumo['tamanho']}x{resumo['tamanho']}, {resumo['mensagens']} mensagens)")
+        print(f"Probabilidade média de mudança: {resumo['probabilidade_media']:.4f}")
+        print(f"Desvio médio de 0.5: {resumo['desvio_medio']:.4f} (máx {resumo['desvio_max']:.4f})")
+        print(f"Pares dentro da tolerância: {100 * resumo['fracao_dentro']:.2f}%")
+        print(
+            f"Hamming por inversão: média {resumo['hamming_medio']:.2f}, "
+            f"mín {resumo['hamming_min']}, máx {resumo['hamming_max']}"
+        )
+
     print("\n" + "=" * 60 + "\n")
 
 
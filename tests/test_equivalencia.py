@@ -0,0 +1,294 @@
+import os
+import random
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.gen import GEN
+from src.enc import ENC
+from src.dec import DEC
+from src import linear, main, nucleo, packed, referencia
+from src.cifra import Cipher
+from src.utils import binario_para_texto, texto_para_binario
+
+try:
+    from src import batch
+except ImportError:  # NumPy é opcional
+    batch = None
+
+
+def texto_aleatorio(rng, tamanho, max_ord=256):
+    """Cria uma string aleatória (inclui caracteres de controle e Latin-1)."""
+    return "".join(chr(rng.randrange(max_ord)) for _ in range(tamanho))
+
+
+def run():
+    print("\n>>> Executando Teste de Equivalência entre Implementações\n")
+
+    rng = random.Random(2024)
+    n_casos = 200
+    falhas = 0
+
+    # GEN/ENC/DEC de src/gen.py, src/enc.py e src/dec.py servem de oráculo
+    # com o backend de referência (listas de bits, etapa por etapa)
+    backend_anterior = nucleo.selecionar("referencia")
+
+    # --- TESTE 1: Motor empacotado (src/packed.py) ---
+    for _ in range(n_casos):
+        seed = texto_aleatorio(rng, rng.randrange(0, 24), max_ord=128)
+        champ = rng.randrange(-50, 50)
+        stars = rng.randrange(-5, 9)
+
+        resultado_ref = GEN(seed, champ, stars)
+        if resultado_ref != packed.GEN(seed, champ, stars):
+            falhas += 1
+            continue
+
+        K = resultado_ref[0]
+        msg = texto_aleatorio(rng, rng.randrange(0, 32))
+        C = ENC(K, msg)
+        if C != packed.ENC(K, msg) or DEC(K, C) != packed.DEC(K, C):
+            falhas += 1
+
+    # Chaves com tamanhos que não são múltiplos de 4 nem de 8, em volta do
+    # limite dos planos lineares (src/linear.py) e uma bem acima dele
+    limite = linear.TAMANHO_MAXIMO_PLANO
+    for tamanho in list(range(1, 70)) + [limite, limite + 1, 2100]:
+        K = [rng.getrandbits(1) for _ in range(tamanho)]
+        msg = texto_aleatorio(rng, rng.randrange(0, 12))
+        C = ENC(K, msg)
+        if C != packed.ENC(K, msg) or DEC(K, C) != packed.DEC(K, C):
+            falhas += 1
+    # Os planos em cache respeitam o orçamento de memória
+    if linear.memoria_cache() > linear.ORCAMENTO_CACHE:
+        falhas += 1
+
+    print(f"   Motor empacotado: {falhas} divergências")
+
+    # --- TESTE 2: Backend em lote (src/batch.py) ---
+    if batch is None:
+        print("   Backend em lote: NumPy não instalado, teste ignorado")
+    else:
+        falhas_lote = 0
+        for tamanho in list(range(1, 70)) + [416, 1000]:
+            K = [rng.getrandbits(1) for _ in range(tamanho)]
+            msgs = [texto_aleatorio(rng, rng.randrange(0, 12)) for _ in range(8)]
+            cifras = batch.encrypt_batch(K, batch.textos_para_matriz(msgs, tamanho))
+            esperado = [ENC(K, msg) for msg in msgs]
+            if cifras.tolist() != esperado:
+                falhas_lote += 1
+                continue
+            textos = batch.matriz_para_textos(batch.decrypt_batch(K, cifras))
+            if textos != [DEC(K, C) for C in esperado]:
+                falhas_lote += 1
+
+        print(f"   Backend em lote: {falhas_lote} divergências")
+        falhas += falhas_lote
+
+    # --- TESTE 3: Backends do núcleo (src/nucleo.py) ---
+    # As duas APIs (seed em texto com 4 rodadas, seed em bits com 3) em cada backend
+    casos = []
+    for _ in range(40):
+        seed = texto_aleatorio(rng, rng.randrange(0, 12), max_ord=300)
+        seed_bits = [rng.getrandbits(1) for _ in range(rng.randrange(0, 40))]
+        champ, stars = rng.randrange(-50, 50), rng.randrange(-5, 9)
+        K = GEN(seed, champ, stars)[0]
+        K_bits = main.GEN(seed_bits, champ, stars)
+        msg = texto_aleatorio(rng, rng.randrange(0, 20), max_ord=300)
+        M = [rng.getrandbits(1) for _ in range(rng.randrange(0, 50))]
+        C, C_bits = ENC(K, msg), main.ENC(K_bits, M)
+        casos.append((seed, seed_bits, champ, stars, msg, M, (K, K_bits, C, C_bits, DEC(K, C), main.DEC(K_bits, C_bits))))
+
+    falhas_backends = 0
+    for nome in nucleo.disponiveis():
+        try:
+            nucleo.selecionar(nome)
+        except ImportError:
+            print(f"   Backend {nome!r} indisponível, ignorado")
+            continue
+        for seed, seed_bits, champ, stars, msg, M, esperado in casos:
+            K = GEN(seed, champ, stars)[0]
+            K_bits = main.GEN(seed_bits, champ, stars)
+            C, C_bits = ENC(K, msg), main.ENC(K_bits, M)
+            if (K, K_bits, C, C_bits, DEC(K, C), main.DEC(K_bits, C_bits)) != esperado:
+                falhas_backends += 1
+
+        # Chave e criptograma de tamanhos diferentes: em todos, o mesmo resultado
+        # do DEC original (rodadas no tamanho de C, XOR com K truncado pelo zip)
+        K = GEN("tamanhoErrado", 3, 2)[0]
+        C = ENC(K, "hello")
+        for outra in (K[:-8], K + [1] * 8, K[:-3]):
+            if nucleo.dec_bits(outra, C) != referencia.dec_bits(outra, C):
+                falhas_backends += 1
+
+    # Seleção pela variável de ambiente e nomes desconhecidos
+    os.environ[nucleo.VARIAVEL_AMBIENTE] = "referencia"
+    nucleo.selecionar(None)
+    falhas_backends += nucleo.obter() is not nucleo.obter("referencia")
+    del os.environ[nucleo.VARIAVEL_AMBIENTE]
+    try:
+        nucleo.selecionar("inexistente")
+        falhas_backends += 1
+    except ValueError:
+        pass
+
+    print(f"   Backends do núcleo: {falhas_backends} divergências")
+    falhas += falhas_backends
+
+    # --- TESTE 4: API em bytes (src/packed.py) ---
+    falhas_bytes = 0
+    for tamanho in list(range(0, 70)) + [416, 1000]:
+        K = [rng.getrandbits(1) for _ in range(tamanho)]
+        dados = texto_aleatorio(rng, rng.randrange(0, tamanho // 8 + 4)).encode("latin-1")
+        C = ENC(K, dados.decode("latin-1"))
+
+        cifra = packed.encrypt_bytes(K, memoryview(bytearray(dados)))
+        saida = bytearray(len(cifra) + 2)
+        escritos = packed.encrypt_bytes(K, dados, saida)
+        if cifra != packed.bits_para_bytes(C) or packed.bytes_para_bits(cifra, tamanho) != C:
+            falhas_bytes += 1
+        if escritos != len(cifra) or saida[:escritos] != cifra:
+            falhas_bytes += 1
+        if packed.decrypt_bytes(K, cifra).decode("latin-1").strip("\x00") != DEC(K, C):
+            falhas_bytes += 1
+
+        # memoryview não contígua (fatia com passo): mesmos bytes que a cópia
+        intercalados = bytearray(2 * len(dados))
+        intercalados[::2] = dados
+        cifra_intercalada = bytearray(2 * len(cifra))
+        cifra_intercalada[::2] = cifra
+        cifrador = Cipher(K) if tamanho else None
+        if packed.encrypt_bytes(K, memoryview(intercalados)[::2]) != cifra:
+            falhas_bytes += 1
+        if packed.decrypt_bytes(K, memoryview(cifra_intercalada)[::2]) != packed.decrypt_bytes(K, cifra):
+            falhas_bytes += 1
+        if cifrador and (
+            cifrador.encrypt(memoryview(intercalados)[::2]) != cifra
+            or cifrador.decrypt(memoryview(cifra_intercalada)[::2]) != cifrador.decrypt(cifra)
+        ):
+            falhas_bytes += 1
+
+    # Itens de mais de 1 byte (array("H")) são rejeitados, não reinterpretados
+    K = [rng.getrandbits(1) for _ in range(64)]
+    palavras, cifrador = array("H", [1, 2, 3, 4]), Cipher(K)
+    for chamada in (
+        lambda: packed.encrypt_bytes(K, palavras),
+        lambda: packed.decrypt_bytes(K, palavras),
+        lambda: cifrador.encrypt(palavras),
+        lambda: cifrador.decrypt(palavras),
+    ):
+        try:
+            chamada()
+            falhas_bytes += 1
+        except TypeError:
+            pass
+
+    print(f"   API em bytes: {falhas_bytes} divergências")
+    falhas += falhas_bytes
+
+    # --- TESTE 5: Conversão texto <-> bits por tabela (src/utils.py) ---
+    # Comparada com a conversão caractere a caractere original, inclusive
+    # caracteres acima de 255 (mais de 8 bits) e bits quebrados no final
+    falhas_codec = 0
+    for _ in range(n_casos):
+        texto = texto_aleatorio(rng, rng.randrange(0, 40), max_ord=rng.choice([128, 256, 70000]))
+        bits = [int(b) for c in texto for b in bin(ord(c))[2:].zfill(8)]
+        if texto_para_binario(texto) != bits:
+            falhas_codec += 1
+
+        bits += [rng.getrandbits(1) for _ in range(rng.randrange(8))]
+        esperado = "".join(
+            chr(int("".join(str(b) for b in bits[i : i + 8]), 2))
+            for i in range(0, len(bits) - 7, 8)
+        )
+        if binario_para_texto(bits) != esperado:
+            falhas_codec += 1
+
+    print(f"   Conversão texto <-> bits: {falhas_codec} divergências")
+    falhas += falhas_codec
+
+    # --- TESTE 6: Contexto de cifra pré-compilado (src/cifra.py) ---
+    # Mensagens curtas, exatas e truncadas; chaves acima do limite dos planos
+    falhas_cipher = 0
+    for tamanho in list(range(1, 70)) + [416, 1000, 2100]:
+        K = [rng.getrandbits(1) for _ in range(tamanho)]
+        cifra = Cipher(K)
+        for num_bytes in {0, tamanho // 16, tamanho // 8, tamanho // 8 + 3}:
+            dados = texto_aleatorio(rng, num_bytes).encode("latin-1")
+            C = cifra.encrypt(dados)
+            if C != packed.encrypt_bytes(K, dados) or cifra.decrypt(C) != packed.decrypt_bytes(K, C):
+                falhas_cipher += 1
+
+    # A mesma instância compartilhada por várias threads
+    K = [rng.getrandbits(1) for _ in range(512)]
+    cifra = Cipher(K)
+    mensagens = [texto_aleatorio(rng, rng.randrange(64)).encode("latin-1") for _ in range(400)]
+    with ThreadPoolExecutor(8) as pool:
+        cifras = list(pool.map(cifra.encrypt, mensagens))
+        textos = list(pool.map(cifra.decrypt, cifras))
+    for dados, C, texto in zip(mensagens, cifras, textos):
+        if C != packed.encrypt_bytes(K, dados) or texto != dados.rstrip(b"\x00"):
+            falhas_cipher += 1
+
+    print(f"   Contexto de cifra: {falhas_cipher} divergências")
+    falhas += falhas_cipher
+
+    # --- TESTE 7: GEN empacotado com seeds longas (src/packed.py) ---
+    falhas_gen_longo = 0
+    for tamanho_seed in [257, 600, 1001]:
+        seed = texto_aleatorio(rng, tamanho_seed)
+        seed_bits = [rng.getrandbits(1) for _ in range(8 * tamanho_seed + 3)]
+        champ, stars = rng.randrange(1, 41), rng.randrange(1, 5)
+        esperado = (GEN(seed, champ, stars), main.GEN(seed_bits, champ, stars))
+        with nucleo.usando("packed"):
+            if (GEN(seed, champ, stars), main.GEN(seed_bits, champ, stars)) != esperado:
+                falhas_gen_longo += 1
+
+    print(f"   GEN com seeds longas: {falhas_gen_longo} divergências")
+    falhas += falhas_gen_longo
+
+    # --- TESTE 8: GEN em lote e cifragem com uma chave por linha (src/batch.py) ---
+    if batch is None:
+        print("   GEN em lote: NumPy não instalado, teste ignorado")
+    else:
+        falhas_gen_lote = 0
+        for tamanho_seed in [1, 3, 16]:
+            seeds = [texto_aleatorio(rng, tamanho_seed) for _ in range(30)]
+            seeds_bits = [[rng.getrandbits(1) for _ in range(2 * tamanho_seed + 1)] for _ in range(30)]
+            champ, stars = rng.randrange(-50, 50), rng.randrange(-5, 9)
+
+            chaves = batch.gen_batch(batch.seeds_para_matriz(seeds), champ, stars, linhas_por_bloco=7)
+            chaves_bits = batch.gen_batch(seeds_bits, champ, stars, rodadas=3)
+            if chaves.tolist() != [GEN(seed, champ, stars)[0] for seed in seeds]:
+                falhas_gen_lote += 1
+            if chaves_bits.tolist() != [main.GEN(seed, champ, stars) for seed in seeds_bits]:
+                falhas_gen_lote += 1
+
+            # A mesma mensagem cifrada com todas as chaves de uma vez
+            msg = texto_aleatorio(rng, rng.randrange(0, 40))
+            cifras = batch.encrypt_batch(chaves, batch.textos_para_matriz([msg], chaves.shape[1]))
+            if cifras.tolist() != [ENC(K, msg) for K in chaves.tolist()]:
+                falhas_gen_lote += 1
+            if batch.decrypt_batch(chaves, cifras).tolist() != [
+                packed.dec_bits(K, C) for K, C in zip(chaves.tolist(), cifras.tolist())
+            ]:
+                falhas_gen_lote += 1
+
+        print(f"   GEN em lote: {falhas_gen_lote} divergências")
+        falhas += falhas_gen_lote
+
+    nucleo.selecionar(backend_anterior)
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
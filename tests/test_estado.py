@@ -0,0 +1,125 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import main, nucleo, packed
+from src.cifra import Cipher
+from src.dec import DEC
+from src.enc import ENC
+from src.estado import BitState
+from src.gen import GEN
+from test_equivalencia import texto_aleatorio
+
+try:
+    from src import batch
+except ImportError:  # NumPy é opcional
+    batch = None
+
+
+def run():
+    print("\n>>> Executando Teste do BitState (src/estado.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- BitState (src/estado.py) contra listas de bits ---
+    falhas_estado = 0
+    for tamanho in [0, 1, 7, 8, 13, 100]:
+        bits = [rng.getrandbits(1) for _ in range(tamanho)]
+        outros = [rng.getrandbits(1) for _ in range(tamanho)]
+        estado = BitState(bits)
+        fatias = [slice(None), slice(2, 5), slice(-3, None), slice(None, None, 3), slice(None, None, -1)]
+        if (
+            estado.tolist() != bits
+            or estado != bits
+            or BitState.from_bytes(estado.to_bytes(), tamanho) != estado
+            or [estado[i] for i in range(-tamanho, tamanho)] != bits + bits
+            or any(estado[f].tolist() != bits[f] for f in fatias)
+            or (estado ^ outros).tolist() != [a ^ b for a, b in zip(bits, outros)]
+            or (estado ^ BitState(outros)).popcount() != sum(a ^ b for a, b in zip(bits, outros))
+            or (estado + outros).tolist() != bits + outros
+            or len({estado, BitState(bits), BitState(outros)}) != 1 + (bits != outros)
+        ):
+            falhas_estado += 1
+
+    # APIs públicas: BitState na entrada -> BitState na saída, mesmos bits das listas
+    for backend in nucleo.disponiveis():
+        if backend == "numpy" and batch is None:
+            continue
+        with nucleo.usando(backend):
+            for _ in range(10):
+                K = GEN(texto_aleatorio(rng, rng.randrange(1, 20)), rng.randrange(1, 41), rng.randrange(1, 5))[0]
+                msg = texto_aleatorio(rng, rng.randrange(0, len(K) // 8 + 1))
+                C = ENC(BitState(K), msg)
+                if not isinstance(C, BitState) or C != ENC(K, msg) or DEC(BitState(K), C) != DEC(K, C.tolist()):
+                    falhas_estado += 1
+
+                seed_bits = [rng.getrandbits(1) for _ in range(rng.randrange(1, 30))]
+                K_bits = main.GEN(BitState(seed_bits), 3, 2)
+                M = [rng.getrandbits(1) for _ in range(len(K_bits))]
+                C_bits = main.ENC(K_bits, BitState(M))
+                if K_bits != main.GEN(seed_bits, 3, 2) or C_bits != main.ENC(K_bits.tolist(), M):
+                    falhas_estado += 1
+                if main.DEC(K_bits, C_bits) != main.DEC(K_bits.tolist(), C_bits.tolist()):
+                    falhas_estado += 1
+
+    # No núcleo, com chave, mensagem e cifra de tamanhos variados (inclusive
+    # diferentes entre si), o BitState dá os mesmos bits que as listas em todos
+    # os backends; com "packed" ele nem passa pelas funções em lista
+    casos = []
+    for _ in range(30):
+        K = [rng.getrandbits(1) for _ in range(rng.randrange(0, 80))]
+        M = [rng.getrandbits(1) for _ in range(rng.randrange(0, 80))]
+        C = [rng.getrandbits(1) for _ in range(rng.randrange(0, 80))]
+        seed = [rng.getrandbits(1) for _ in range(rng.randrange(0, 20))]
+        casos.append((seed, K, M, C))
+    for backend in nucleo.disponiveis():
+        if backend == "numpy" and batch is None:
+            continue
+        with nucleo.usando(backend):
+            for seed, K, M, C in casos:
+                if (
+                    nucleo.gen_bits(BitState(seed), 3, 2, 3) != nucleo.gen_bits(seed, 3, 2, 3)
+                    or nucleo.enc_bits(BitState(K), BitState(M)) != nucleo.enc_bits(K, M)
+                    or nucleo.enc_bits(K, BitState(M)) != nucleo.enc_bits(K, M)
+                    or nucleo.dec_bits(BitState(K), BitState(C)) != nucleo.dec_bits(K, C)
+                    or nucleo.dec_bits(BitState(K), C) != nucleo.dec_bits(K, C)
+                ):
+                    falhas_estado += 1
+
+    def so_inteiros(*args):
+        raise AssertionError("BitState convertido para lista com o backend packed")
+
+    em_lista = packed.gen_bits, packed.enc_bits, packed.dec_bits
+    packed.gen_bits = packed.enc_bits = packed.dec_bits = so_inteiros
+    try:
+        with nucleo.usando("packed"):
+            K = main.GEN(BitState([1, 0, 1, 1, 0, 0, 1, 0, 1]), 3, 2)
+            C = main.ENC(K, BitState([0, 1] * 20))
+            main.DEC(K, C)
+            main.DEC(K[:-5], C)
+    except AssertionError:
+        falhas_estado += 1
+    finally:
+        packed.gen_bits, packed.enc_bits, packed.dec_bits = em_lista
+
+    K = GEN("chaveBitState", 7, 3)[0]
+    if Cipher(BitState(K)).encrypt(b"dados") != packed.encrypt_bytes(K, b"dados"):
+        falhas_estado += 1
+
+    print(f"   BitState: {falhas_estado} divergências")
+    falhas += falhas_estado
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
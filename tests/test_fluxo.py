@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import packed
+from src.enc import ENC
+from src.fluxo import Decryptor, Encryptor
+from test_equivalencia import texto_aleatorio
+
+
+def run():
+    print("\n>>> Executando Teste de Cifragem em Fluxo (src/fluxo.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Cifragem em fluxo (src/fluxo.py) ---
+    falhas_fluxo = 0
+    for tamanho in [8, 13, 64, 416]:
+        K = [rng.getrandbits(1) for _ in range(tamanho)]
+        bytes_bloco = tamanho // 8
+
+        # Cada bloco cifrado é exatamente o ENC do bloco de texto
+        bloco = texto_aleatorio(rng, bytes_bloco)
+        cifra_bloco = Encryptor(K).cifrar_bloco(bloco.encode("latin-1"))
+        bits = packed.int_para_bits(int.from_bytes(cifra_bloco, "big") >> (-tamanho % 8), tamanho)
+        if bits != ENC(K, bloco):
+            falhas_fluxo += 1
+
+        # Ida e volta em pedaços de tamanhos variados, inclusive com bytes nulos no final
+        for tamanho_msg in [0, bytes_bloco, 5 * bytes_bloco + 3]:
+            dados = texto_aleatorio(rng, tamanho_msg).encode("latin-1") + b"\x00\x00"
+            enc = Encryptor(K)
+            cifra = b"".join(enc.update(dados[i : i + 7]) for i in range(0, len(dados), 7))
+            cifra += enc.finalize()
+
+            dec = Decryptor(K)
+            recuperado = b"".join(dec.update(cifra[i : i + 5]) for i in range(0, len(cifra), 5))
+            if recuperado + dec.finalize() != dados:
+                falhas_fluxo += 1
+
+    print(f"   Cifragem em fluxo: {falhas_fluxo} divergências")
+    falhas += falhas_fluxo
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Orçamento (ms) para o tempo de importação dos próprios módulos do pacote
+# (soma do tempo "self" das linhas src.* de -X importtime; a biblioteca padrão
+# fica de fora porque não depende de nós)
+ORCAMENTO_PROPRIO_MS = 10.0
+# Orçamento (ms) para a importação completa, biblioteca padrão incluída
+ORCAMENTO_TOTAL_MS = 40.0
+# Execuções por caso; vale a mais rápida (as demais são ruído da máquina)
+EXECUCOES = 3
+
+# Importação -> módulos que não podem ser carregados por ela
+CASOS = {
+    "src": ["src.gen", "src.nucleo"],
+    "src.gen, src.enc, src.dec": ["numpy", "src.batch", "src.referencia", "src.linear"],
+    "src.main": ["numpy", "src.batch", "src.referencia"],
+    "src.cifra": ["numpy", "src.batch"],
+    "src.cli": ["numpy", "src.batch", "src.paralelo", "multiprocessing"],
+}
+
+
+# Como num pacote instalado, os .pyc ficam em cache: sem isso cada execução
+# mediria a compilação dos fontes, não a importação
+AMBIENTE = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+
+def medir(importacao: str) -> tuple[float, float, set]:
+    """
+    Roda `import <importacao>` em um interpretador novo com -X importtime.
+
+    Retorna (ms dos módulos src.*, ms total, nomes dos módulos importados).
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {importacao}"],
+        cwd=RAIZ,
+        env=AMBIENTE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    proprio = total = 0
+    modulos = set()
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        proprio_us, cumulativo_us, nome = linha[len("import time:") :].split("|")
+        if not proprio_us.strip().isdigit():
+            continue  # cabeçalho
+        # Linhas sem indentação são importações de primeiro nível
+        if not nome.startswith("  "):
+            total += int(cumulativo_us)
+        nome = nome.strip()
+        modulos.add(nome)
+        if nome == "src" or nome.startswith("src."):
+            proprio += int(proprio_us)
+    return proprio / 1000, total / 1000, modulos
+
+
+def run():
+    print("\n>>> Executando Teste de Tempo de Importação (-X importtime)\n")
+
+    # Aquecimento: grava os .pyc de todos os casos antes de medir
+    for importacao in CASOS:
+        medir(importacao)
+    # A linha de base é o próprio interpretador, sem nenhum import nosso
+    base = min(medir("sys")[1] for _ in range(EXECUCOES))
+
+    falhas = 0
+    print(f"{'Importação':<28} | {'src.* (ms)':>10} | {'Total (ms)':>10}")
+    print("-" * 56)
+    for importacao, proibidos in CASOS.items():
+        medicoes = [medir(importacao) for _ in range(EXECUCOES)]
+        proprio = min(m[0] for m in medicoes)
+        total = min(m[1] for m in medicoes) - base
+        carregados = sorted(set(proibidos) & medicoes[0][2])
+
+        print(f"{importacao:<28} | {proprio:>10.2f} | {total:>10.2f}")
+        if proprio > ORCAMENTO_PROPRIO_MS or total > ORCAMENTO_TOTAL_MS:
+            print(f"   Acima do orçamento ({ORCAMENTO_PROPRIO_MS} / {ORCAMENTO_TOTAL_MS} ms)")
+            falhas += 1
+        if carregados:
+            print(f"   Carregados antes do primeiro uso: {', '.join(carregados)}")
+            falhas += 1
+
+    print("-" * 56)
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} casos)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import mask
+from src.indice import IndiceColisoes
+
+
+def run():
+    print("\n>>> Executando Teste do Índice de Colisões (src/indice.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Índice de colisões com transbordo para disco (src/indice.py) ---
+    # Poucos valores distintos: muitas colisões reais; orçamentos minúsculos forçam runs
+    valores = [bytes([rng.randrange(40), 7]) for _ in range(2000)]
+    primeiro, esperado = {}, []
+    for i, valor in enumerate(valores):
+        if valor in primeiro:
+            esperado.append((i, primeiro[valor]))
+        else:
+            primeiro[valor] = i
+
+    falhas_indice = 0
+    for orcamento, bits in [(1 << 20, 64), (4096, 128), (0, 64)]:
+        with IndiceColisoes(orcamento, bits) as indice:
+            for i, valor in enumerate(valores):
+                indice.adicionar(i, valor)
+            resultado = indice.colisoes(recuperar=lambda rotulos: [valores[i] for i in rotulos])
+            if resultado.pares != esperado or resultado.nao_verificados:
+                falhas_indice += 1
+
+    # Só impressões (como colisoes.py e mask.py): sem filtro de Bloom, o
+    # orçamento inteiro vai para os registros em memória
+    with IndiceColisoes(1 << 16) as so_impressoes, IndiceColisoes(1 << 16) as com_valores:
+        for i, valor in enumerate(valores):
+            so_impressoes.adicionar_impressao(i, so_impressoes.impressao(valor))
+            com_valores.adicionar(i, valor)
+        if so_impressoes._bloom is not None or so_impressoes._max_registros < 2 * com_valores._max_registros - 1:
+            falhas_indice += 1
+        if so_impressoes.colisoes(recuperar=lambda rotulos: [valores[i] for i in rotulos]).pares != esperado:
+            falhas_indice += 1
+
+    print(f"   Índice de colisões: {falhas_indice} divergências")
+    falhas += falhas_indice
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import main, nucleo
+from src.inplace import PipelineInPlace
+
+
+def run():
+    print("\n>>> Executando Teste do Pipeline In-place (src/inplace.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Pipeline in-place (src/inplace.py) sem alocações por chamada ---
+    falhas_inplace = 0
+    for tamanho in [4, 12, 20, 64, 132]:
+        pipeline = PipelineInPlace(tamanho)
+        saida = bytearray(tamanho)
+        for _ in range(5):
+            seed_bits = [rng.getrandbits(1) for _ in range(tamanho // 4)]
+            champ, stars = rng.randrange(0, 40), rng.randrange(1, 5)
+            K = pipeline.gen(seed_bits, champ, stars, saida=saida)
+            if list(K) != nucleo.obter("referencia").gen_bits(seed_bits, champ, stars, 4):
+                falhas_inplace += 1
+            K = list(K)
+            M = [rng.getrandbits(1) for _ in range(rng.randrange(0, tamanho + 1))]
+            C = pipeline.enc(K, bytes(M))
+            if C != main.ENC(K, M) or pipeline.dec(K, C, saida=saida) is not saida:
+                falhas_inplace += 1
+            if list(saida) != M + [0] * (tamanho - len(M)):
+                falhas_inplace += 1
+
+    # Depois do aquecimento, nem a memória retida nem o pico crescem com o
+    # número de chamadas (o backend de referência aloca várias listas de
+    # 8 bytes por bit a cada etapa)
+    tamanho = 512
+    pipeline = PipelineInPlace(tamanho)
+    seed_bits = bytes(rng.getrandbits(1) for _ in range(tamanho // 4))
+    M = bytes(rng.getrandbits(1) for _ in range(tamanho - 40))
+    K, C, D = bytearray(tamanho), bytearray(tamanho), bytearray(tamanho)
+
+    def ciclo(vezes):
+        for _ in range(vezes):
+            pipeline.gen(seed_bits, 5, 2, saida=K)
+            pipeline.enc(K, M, saida=C)
+            pipeline.dec(K, C, saida=D)
+
+    ciclo(1)
+    tracemalloc.start()
+    ciclo(1)
+    medicoes = []
+    for vezes in (10, 100):
+        tracemalloc.reset_peak()
+        inicio = tracemalloc.get_traced_memory()[0]
+        ciclo(vezes)
+        atual, pico = tracemalloc.get_traced_memory()
+        medicoes.append((atual - inicio, pico - inicio))
+    tracemalloc.stop()
+
+    # Folga para objetos pequenos do interpretador (chaves do lru_cache etc.)
+    folga = 256
+    (retido_10, pico_10), (retido_100, pico_100) = medicoes
+    if retido_100 > folga or pico_100 > pico_10 + folga or pico_100 >= tamanho:
+        falhas_inplace += 1
+    if bytes(D[: len(M)]) != M:
+        falhas_inplace += 1
+
+    print(f"   Pipeline in-place: {falhas_inplace} divergências (pico por 100 ciclos: {pico_100} B)")
+    falhas += falhas_inplace
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
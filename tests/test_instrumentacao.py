@@ -0,0 +1,72 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import instrumentacao, nucleo
+from src.dec import DEC
+from src.enc import ENC
+from src.gen import GEN
+from test_equivalencia import texto_aleatorio
+
+try:
+    from src import batch
+except ImportError:  # NumPy é opcional
+    batch = None
+
+
+def run():
+    print("\n>>> Executando Teste de Instrumentação por Etapa (src/instrumentacao.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Instrumentação por etapa (src/instrumentacao.py) ---
+    # Ligada, as saídas não mudam e cada etapa conta uma chamada por rodada,
+    # com o backend padrão (None) e com cada backend selecionado
+    seed, texto = texto_aleatorio(rng, 8), texto_aleatorio(rng, 30)
+    K = GEN(seed, 3, 2)[0]
+    C = ENC(K, texto)
+    esperado = {
+        "GEN": {"codec": 1, "expansao": 1}
+        | {f"r{r}/{e}": 1 for r in range(1, 5) for e in ("constante", "sbox", "rotacao", "feedback")},
+        "ENC": {"codec": 2, "whitening": 2}
+        | {f"r{r}/{e}": 2 for r in (1, 2) for e in ("sbox", "difusao_ida", "difusao_volta", "transposicao")},
+        "DEC": {"codec": 2, "whitening": 2}
+        | {f"r{r}/{e}": 2 for r in (1, 2) for e in ("sbox", "difusao_ida", "difusao_volta", "transposicao")},
+    }
+    falhas_instrumentacao = 0
+    for backend in [None] + nucleo.disponiveis():
+        if backend == "numpy" and batch is None:
+            continue
+        with nucleo.usando(backend), instrumentacao.medindo():
+            falhas_instrumentacao += GEN(seed, 3, 2)[0] != K
+            falhas_instrumentacao += ENC(K, texto) != C
+            falhas_instrumentacao += DEC(K, C) != DEC(K, ENC(K, texto))
+            contagens = instrumentacao.snapshot()
+        obtido = {
+            funcao: {etapa: dados["chamadas"] for etapa, dados in etapas.items()}
+            for funcao, etapas in contagens.items()
+        }
+        falhas_instrumentacao += obtido != esperado
+        # O snapshot diz qual backend foi medido (só o de referência tem etapas)
+        medidos = {dados["backend"] for etapas in contagens.values() for dados in etapas.values()}
+        falhas_instrumentacao += medidos != {nucleo.BACKEND_INSTRUMENTADO}
+    ENC(K, texto)
+    falhas_instrumentacao += instrumentacao.snapshot() != contagens or instrumentacao.ativo
+
+    print(f"   Instrumentação por etapa: {falhas_instrumentacao} divergências")
+    falhas += falhas_instrumentacao
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,50 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import main, mask
+
+
+def run():
+    print("\n>>> Executando Teste do mask.py com --jobs (src/mask.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- mask.py com --jobs (shards em processos, mesmos resultados) ---
+    falhas_mask = 0
+    seed_mask = [rng.getrandbits(1) for _ in range(6)]
+    # 2.5 shards: o último incompleto
+    trials = 5 * mask.TRIALS_PER_SHARD // 2
+    testes_mask = [
+        lambda pool: mask.equiv_keys_test(main.GEN, main.ENC, seed_mask, n_keys=trials, pool=pool),
+        lambda pool: mask.diffusion_test(main.GEN, main.ENC, seed_mask, trials=trials, pool=pool),
+        lambda pool: mask.confusion_test(main.GEN, main.ENC, seed_mask, trials=trials, pool=pool),
+    ]
+    seriais = [teste(None) for teste in testes_mask]
+    impl = os.path.join(os.path.dirname(__file__), "..", "src", "main.py")
+    with mask.worker_pool(impl, 2) as pool:
+        if [teste(pool) for teste in testes_mask] != seriais:
+            falhas_mask += 1
+
+    mudancas = [rng.randrange(100) for _ in range(trials)]
+    partes = [mask.StatRes.from_changes(mudancas[i : i + 7]) for i in range(0, trials, 7)]
+    if mask.StatRes.merge(partes) != mask.StatRes.from_changes(mudancas):
+        falhas_mask += 1
+
+    print(f"   mask.py com --jobs: {falhas_mask} divergências")
+    falhas += falhas_mask
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,48 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.fluxo import Encryptor
+from src.paralelo import ExecutorParalelo, cifrar_paralelo, decifrar_paralelo
+
+
+def run():
+    print("\n>>> Executando Teste de Cifragem Paralela (src/paralelo.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Cifragem paralela (src/paralelo.py) ---
+    falhas_paralelo = 0
+    K = [rng.getrandbits(1) for _ in range(100)]
+    dados = bytes(rng.getrandbits(8) for _ in range(3000))
+    enc = Encryptor(K)
+    esperado = enc.update(dados) + enc.finalize()
+
+    cifra = cifrar_paralelo(K, dados, processos=2)
+    if cifra != esperado or decifrar_paralelo(K, cifra, processos=2) != dados:
+        falhas_paralelo += 1
+
+    # Lotes pequenos forçam várias rodadas pelos segmentos compartilhados
+    with ExecutorParalelo(K, processos=2, tamanho_lote=64) as executor:
+        enc = Encryptor(K, executor=executor)
+        cifra = b"".join(enc.update(dados[i : i + 999]) for i in range(0, len(dados), 999))
+        if cifra + enc.finalize() != esperado:
+            falhas_paralelo += 1
+
+    print(f"   Cifragem paralela: {falhas_paralelo} divergências")
+    falhas += falhas_paralelo
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
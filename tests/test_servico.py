@@ -0,0 +1,106 @@
+import asyncio
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import packed, servico
+from src.dec import DEC
+from src.enc import ENC
+from src.servico import ClienteCifra, ServicoCifra
+from test_equivalencia import texto_aleatorio
+
+
+def run():
+    print("\n>>> Executando Teste do Serviço com Micro-lotes (src/servico.py)\n")
+
+    rng = random.Random(2024)
+    falhas = 0
+
+    # --- Serviço com micro-lotes (src/servico.py) ---
+    chaves = [[rng.getrandbits(1) for _ in range(tamanho)] for tamanho in (13, 64, 100)]
+    pedidos = [(rng.choice(chaves), texto_aleatorio(rng, rng.randrange(20))) for _ in range(200)]
+
+    async def consultar_servico():
+        servico = ServicoCifra(max_latencia=0.005, max_lote=32)
+        servidor = await servico.iniciar()
+        cliente = await ClienteCifra.conectar(porta=servidor.sockets[0].getsockname()[1])
+        cifras = await asyncio.gather(*(cliente.cifrar(K, texto) for K, texto in pedidos))
+        textos = await asyncio.gather(
+            *(cliente.decifrar(K, c) for (K, _), c in zip(pedidos, cifras))
+        )
+        await cliente.fechar()
+        servidor.close()
+        await servico.fechar()
+        return cifras, textos
+
+    falhas_servico = 0
+    cifras, textos = asyncio.run(consultar_servico())
+    for (K, texto), cifra, recuperado in zip(pedidos, cifras, textos):
+        bits = packed.int_para_bits(int.from_bytes(cifra, "big") >> (-len(K) % 8), len(K))
+        if bits != ENC(K, texto) or recuperado != DEC(K, bits):
+            falhas_servico += 1
+
+    # Resposta com id desconhecido ou repetido não derruba o leitor do cliente,
+    # e o fim da conexão falha as requisições em voo em vez de deixá-las penduradas
+    def resposta(id_req, dados=b""):
+        return servico.montar_quadro(servico.RESPOSTA.pack(id_req, servico.STATUS_OK) + dados)
+
+    async def servidor_com_ids_errados(reader, writer):
+        id_req = servico.REQUISICAO.unpack_from(await servico.ler_quadro(reader))[1]
+        writer.write(resposta(id_req + 1000) + resposta(id_req, b"ok") + resposta(id_req, b"repetida"))
+        await servico.ler_quadro(reader)
+        writer.close()
+
+    async def consultar_servidor_com_ids_errados():
+        servidor = await asyncio.start_server(servidor_com_ids_errados, "127.0.0.1", 0)
+        cliente = await ClienteCifra.conectar(porta=servidor.sockets[0].getsockname()[1])
+        K = chaves[0]
+        resultados = [await asyncio.wait_for(cliente.requisitar(servico.CIFRAR, K, b"a"), 5)]
+        try:
+            await asyncio.wait_for(cliente.requisitar(servico.CIFRAR, K, b"b"), 5)
+        except Exception as erro:
+            resultados.append(type(erro))
+        await cliente.fechar()
+        servidor.close()
+        return resultados
+
+    if asyncio.run(consultar_servidor_com_ids_errados()) != [b"ok", ConnectionError]:
+        falhas_servico += 1
+
+    # Cifra com tamanho diferente de ceil(n/8) bytes volta como erro, não como texto
+    async def decifrar_tamanhos_errados():
+        servico_cifra = ServicoCifra()
+        servidor = await servico_cifra.iniciar()
+        cliente = await ClienteCifra.conectar(porta=servidor.sockets[0].getsockname()[1])
+        aceitas = 0
+        for K in chaves:
+            num_bytes = (len(K) + 7) // 8
+            for cifra in (b"", bytes(num_bytes - 1), bytes(num_bytes + 1)):
+                try:
+                    await cliente.decifrar(K, cifra)
+                    aceitas += 1
+                except ValueError:
+                    pass
+        await cliente.fechar()
+        servidor.close()
+        await servico_cifra.fechar()
+        return aceitas
+
+    falhas_servico += asyncio.run(decifrar_tamanhos_errados())
+
+    print(f"   Serviço com micro-lotes: {falhas_servico} divergências")
+    falhas += falhas_servico
+
+    if falhas == 0:
+        print("   → Resultado: APROVADO ")
+    else:
+        print(f"   → Resultado: REPROVADO ({falhas} divergências)")
+    print("\n" + "=" * 60 + "\n")
+
+    assert falhas == 0
+
+
+if __name__ == "__main__":
+    run()
@@ -1,75 +1,54 @@
-import time
 import os
 import sys
-import string
-import random
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.gen import GEN  # Gera a chave criptográfica
-from src.enc import ENC  # Criptografa uma mensagem
-from src.dec import DEC  # Descriptografa uma mensagem
+from src import benchmark
 
 
-def gerar_string_aleatoria(tamanho=16):
-    """Cria uma string aleatória com letras e números"""
-    letras = string.ascii_letters + string.digits
-    return "".join(random.choice(letras) for _ in range(tamanho))
-
-
-def run():
+def run(tamanhos=(128, 512), amostras=15):
     print("\n>>> [1/4] Executando Teste de Velocidade de Execução...")
 
-    # Configuração do benchmark
-    n_repeticoes = 10000
-    seed = "BenchmarkSeed"
-
-    # Parâmetros para geração da chave
-    input_champ = 1
-    input_stars = 2
-
-    print("\n   [Passo 1] Preparação dos dados")
-    print(f"   - Seed: {seed}")
-    print(f"   - Iterações: {n_repeticoes}")
-
-    # Gera a chave a partir da seed (retorna tupla: K, campeão, estrelas)
-    resultado_gen = GEN(seed, input_champ, input_stars)
-    K = resultado_gen[0]
-
-    print(
-        f"   - Chave gerada (Campeão: {resultado_gen[1]}, Estrelas: {resultado_gen[2]})"
+    # Configuração do benchmark (src/benchmark.py): cada caso é calibrado,
+    # aquecido e medido em várias amostras com o coletor de lixo desligado
+    print("\n   [Passo 1] Configuração")
+    print(f"   - Tamanhos de chave: {', '.join(map(str, tamanhos))} bits")
+    print(f"   - Amostras por caso: {amostras} (+{benchmark.AQUECIMENTO} de aquecimento)")
+
+    print("\n   [Passo 2] Medindo GEN, ENC, DEC e primitivas (tempo por chamada)...")
+    resultado = benchmark.executar(
+        tamanhos=tamanhos,
+        amostras=amostras,
+        ao_medir=lambda nome, r: print(benchmark.formatar_linha(nome, r)),
     )
-    print(f"   - Tamanho da chave: {len(K)} bits")
-
-    # Cria a mensagem a ser criptografada
-    M_str = gerar_string_aleatoria(16)
-    print(f"   - Mensagem: '{M_str}'")
-
-    # Mede o tempo de criptografia em múltiplas iterações
-    print("\n   [Passo 2] Medindo tempo de criptografia (ENC)...")
-    inicio_enc = time.perf_counter()
-    for _ in range(n_repeticoes):
-        C = ENC(K, M_str)
-    fim_enc = time.perf_counter()
-
-    # Mede o tempo de descriptografia em múltiplas iterações
-    print("   [Passo 3] Medindo tempo de descriptografia (DEC)...")
-    inicio_dec = time.perf_counter()
-    for _ in range(n_repeticoes):
-        _ = DEC(K, C)
-    fim_dec = time.perf_counter()
-
-    # Calcula a média de tempo por operação
-    media_enc = (fim_enc - inicio_enc) / n_repeticoes
-    media_dec = (fim_dec - inicio_dec) / n_repeticoes
 
-    print("\n   [Passo 4] Resultados do Benchmark")
+    # Resumo no formato do teste original (maior tamanho da varredura)
+    r = resultado["resultados"]
+    maior = max(tamanhos)
+    media_enc = r[f"ENC/{maior}"]["mediana_s"]
+    media_dec = r[f"DEC/{maior}"]["mediana_s"]
+    print(f"\n   [Passo 3] Resultados do Benchmark (chave de {maior} bits, mediana)")
     print(f"   Tempo Médio ENC: {media_enc * 1000:.6f} ms")
     print(f"   Tempo Médio DEC: {media_dec * 1000:.6f} ms")
     print(f"   Tempo Total: {(media_enc + media_dec) * 1000:.6f} ms")
 
+    # GEN com chaves longas: o tempo por bit deve ficar estável até 1 Mbit
+    print("\n   [Passo 4] Escala de GEN (chaves de 16 kbit a 1 Mbit)")
+    escala = benchmark.escala_gen()
+    for r in escala:
+        print(f"   {r['bits']:>9} bits: {r['mediana_s'] * 1000:>9.3f} ms  ({r['ns_por_bit']:.2f} ns/bit)")
+    if benchmark.crescimento_linear(escala):
+        print("   → Resultado: APROVADO (crescimento linear)")
+    else:
+        print(f"   → Resultado: REPROVADO (tempo por bit variou mais de {benchmark.LIMITE_ESCALA:.0f}x)")
+
+    print("\n   Para JSON e comparação com baseline: python -m src.benchmark --help")
     print("\n" + "=" * 60 + "\n")
+    return resultado
 
 
 if __name__ == "__main__":
+    # Com argumentos, repassa para a suíte completa (--json, --baseline, --limite, ...)
+    if len(sys.argv) > 1:
+        sys.exit(benchmark.main(sys.argv[1:]))
     run()
@@ -2,6 +2,20 @@ import test_velocExec
 import test_Colis
 import test_confusao
 import test_difusao
+import test_equivalencia
+import test_cache
+import test_fluxo
+import test_paralelo
+import test_colisoes
+import test_indice
+import test_servico
+import test_instrumentacao
+import test_avalanche
+import test_mask
+import test_importacao
+import test_estado
+import test_inplace
+import test_cli
 
 
 def main():
@@ -21,6 +35,48 @@ def main():
     # 4. Teste de Confusão
     test_confusao.run()
 
+    # 5. Equivalência entre Implementações
+    test_equivalencia.run()
+
+    # 6. Cache LRU de GEN
+    test_cache.run()
+
+    # 7. Cifragem em Fluxo
+    test_fluxo.run()
+
+    # 8. Cifragem Paralela
+    test_paralelo.run()
+
+    # 9. Varredura de Colisões em Shards
+    test_colisoes.run()
+
+    # 10. Índice de Colisões com Transbordo para Disco
+    test_indice.run()
+
+    # 11. Serviço com Micro-lotes
+    test_servico.run()
+
+    # 12. Instrumentação por Etapa
+    test_instrumentacao.run()
+
+    # 13. Matriz de Avalanche (SAC)
+    test_avalanche.run()
+
+    # 14. mask.py com --jobs
+    test_mask.run()
+
+    # 15. Tempo de Importação dos Pontos de Entrada
+    test_importacao.run()
+
+    # 16. BitState
+    test_estado.run()
+
+    # 17. Pipeline In-place
+    test_inplace.run()
+
+    # 18. Linha de Comando
+    test_cli.run()
+
     print("\n" + "=" * 60 + "\n")
     print("   TODOS OS TESTES FINALIZADOS")
     print("\n" + "=" * 60 + "\n")